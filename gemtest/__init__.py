@@ -1,5 +1,8 @@
+from typing import TYPE_CHECKING
+
 from .conftest import pytest_configure, pytest_addoption, pytest_sessionstart, \
-    pytest_sessionfinish, pytest_runtest_makereport, config
+    pytest_sessionfinish, pytest_runtest_makereport, pytest_report_teststatus, \
+    pytest_runtest_logreport, pytest_terminal_summary, config
 from .decorator import (
     transformation,
     general_transformation,
@@ -11,18 +14,37 @@ from .decorator import (
     randomized,
     valid_input
 )
+from . import data
+from .data import lazy
 from .generators import RandFloat, RandInt
 from .logger import logger
-from .metamorphic_error import skip
-from .metamorphic_test_case import MetamorphicTestCase
+from .metamorphic_error import skip, ErrorMode
+from .metamorphic_test_case import MetamorphicTestCase, MTCIdentity
 from .register import create_metamorphic_relation
 from .relations import approximately, or_, equality, is_less_than, is_greater_than
-from .report import Visualizer, GeneralMTCExecutionReport
+from .report import GeneralMTCExecutionReport
+from .runner import execute, run, MTCResult, RunSummary
 from .testing_strategy import TestingStrategy
-from .utils import load_image_resource
+from .utils.lazy_import import lazy_attributes
+from .utils.sut_loader import warmup_sut
+
+if TYPE_CHECKING:
+    from .columnar import ColumnarStore
+    from .report.visualizer import Visualizer
+    from .utils.data_loaders import load_image_resource, load_image_resources
+
+# NumPy, matplotlib and OpenCV are only imported when these attributes are used
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'ColumnarStore': '.columnar',
+    'Visualizer': '.report.visualizer',
+    'load_image_resource': '.utils.data_loaders',
+    'load_image_resources': '.utils.data_loaders',
+})
 
 __all__ = [
     'create_metamorphic_relation',
+    'data',
+    'lazy',
     'transformation',
     'general_transformation',
     'relation',
@@ -34,7 +56,10 @@ __all__ = [
     'valid_input',
     'logger',
     'MetamorphicTestCase',
+    'MTCIdentity',
+    'ColumnarStore',
     'TestingStrategy',
+    'ErrorMode',
     'RandFloat',
     'RandInt',
     'approximately',
@@ -45,12 +70,21 @@ __all__ = [
     'logger',
     'Visualizer',
     'GeneralMTCExecutionReport',
+    'execute',
+    'run',
+    'MTCResult',
+    'RunSummary',
     'load_image_resource',
+    'load_image_resources',
+    'warmup_sut',
     'pytest_configure',
     'pytest_addoption',
     'pytest_sessionstart',
     'pytest_sessionfinish',
     'pytest_runtest_makereport',
+    'pytest_report_teststatus',
+    'pytest_runtest_logreport',
+    'pytest_terminal_summary',
     'config',
     'skip'
 
@@ -0,0 +1,357 @@
+import pickle  # nosec
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, TYPE_CHECKING
+
+from . import metamorphic_error
+from .logger import logger
+from .metamorphic_test_case import MetamorphicTestCase
+from .testcase_queue import InputQueueItem
+from .utils.digest import canonical_digest
+
+if TYPE_CHECKING:
+    from .metamorphic_relation import MetamorphicRelation
+
+# bump when the tables of the checkpoint change
+CHECKPOINT_FORMAT_VERSION = 2
+CHECKPOINT_FILE = "checkpoint.db"
+FLUSH_INTERVAL = 10.0
+""" The default number of seconds between two writes of the checkpoint """
+LOCK_TIMEOUT = 60.0
+""" The number of seconds a process waits for another one writing a shared checkpoint """
+
+# (mr_id, sut_id, mtc_index)
+TestCaseKey = Tuple[str, str, int]
+
+
+def _input_digest(item: InputQueueItem) -> Optional[str]:
+    """
+    Returns the digest of an input, or of its file path if it is loaded by a data_loader.
+    """
+    if item.is_source:
+        paths = item.test_case.source_input_paths
+        if paths is not None:
+            return canonical_digest(paths[item.index])
+    return canonical_digest(item.get_input())
+
+
+def _template_digest(metamorphic_relation: "MetamorphicRelation", index: int) \
+        -> Optional[str]:
+    """
+    Returns the digest of the source inputs, or their file paths, and the parameters of
+    the template of a test case, which are not changed by its execution.
+    """
+    template = metamorphic_relation.mtc_templates[index]
+    return canonical_digest((template._source_inputs, template.parameters))  # noqa
+
+
+class Checkpoint:
+    """
+    Persists the progress of a run in a SQLite database, so that a run which died, e.g.
+    of an OOM kill, a preemption or a segfault of the SUT, can be resumed and only repeats
+    unfinished work. The checkpoint holds the seed of the random module, the results of
+    the finished metamorphic test cases and the SUT outputs of unfinished test cases, e.g.
+    outputs of inputs that were executed ahead in a batch. It is written at most every
+    flush_interval seconds, work done after the last write is repeated.
+
+    Test cases are identified by the id of their metamorphic relation, the system under
+    test and their index. Resuming reproduces the same test cases as the run that wrote
+    the checkpoint because each metamorphic relation samples its test cases from a
+    generator seeded per relation, and randomized transformations draw from a generator
+    seeded per test case. The random module is never seeded. Results and cached outputs
+    are only reused if the digest of a canonical encoding of their inputs matches, test
+    cases with inputs without a canonical encoding or outputs that can not be pickled
+    are executed again.
+
+    Parameters
+    ----------
+    directory : PathLike
+        The directory holding the checkpoint.
+    resume : bool
+        Continues from the checkpoint in the directory, if there is one, instead of
+        starting a new one.
+    flush_interval : float
+        The minimum number of seconds between two writes of the checkpoint.
+    shared : bool
+        Opens a checkpoint that another process created, e.g. the controller of the
+        pytest-xdist workers, which share it. The checkpoint is never replaced and its seed
+        is used.
+    """
+
+    def __init__(self, directory, resume: bool = False,
+                 flush_interval: float = FLUSH_INTERVAL, shared: bool = False):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / CHECKPOINT_FILE
+        self.flush_interval = flush_interval
+        self.restored = 0
+        self.reused_outputs = 0
+        self._lock = threading.Lock()
+        self._results: List[Tuple] = []
+        self._outputs: Dict[TestCaseKey, List[Tuple[InputQueueItem, Any]]] = {}
+        self._written_outputs: Set[TestCaseKey] = set()
+        self._finished_outputs: List[TestCaseKey] = []
+        self._restored_keys: Set[TestCaseKey] = set()
+        self._stored_outputs: Dict[Tuple[str, str], Set[Tuple[int, int, int]]] = {}
+        self._last_flush = time.monotonic()
+
+        if not (resume or shared):
+            self.path.unlink(missing_ok=True)
+        self._connection = self._connect()
+        seed = self._read_meta("seed")
+        if shared:
+            if seed is None:
+                raise RuntimeError(f"The checkpoint in {self.directory} was not created")
+            self.resumed = resume
+            self.seed = int(seed)
+            return
+        if seed is not None and self._read_meta("version") != str(CHECKPOINT_FORMAT_VERSION):
+            logger.warning("The checkpoint in %s was written by another version of gemtest, "
+                           "the run starts from the beginning.", self.directory)
+            self._connection.close()
+            self.path.unlink()
+            self._connection = self._connect()
+            seed = None
+        self._create_tables()
+        self.resumed = seed is not None
+        self.seed = int(seed) if seed is not None else random.getrandbits(64)  # nosec
+        if not self.resumed:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("version", str(CHECKPOINT_FORMAT_VERSION)), ("seed", str(self.seed))])
+            self._connection.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=LOCK_TIMEOUT, check_same_thread=False)
+
+    def _read_meta(self, key: str) -> Optional[str]:
+        try:
+            row = self._connection.execute("SELECT value FROM meta WHERE key = ?",
+                                           (key,)).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return row[0] if row is not None else None
+
+    def _create_tables(self):
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                mr_id TEXT NOT NULL,
+                sut_id TEXT NOT NULL,
+                mtc_index INTEGER NOT NULL,
+                input_digest TEXT NOT NULL,
+                relation_result INTEGER NOT NULL,
+                error_type TEXT,
+                error_message TEXT,
+                PRIMARY KEY (mr_id, sut_id, mtc_index)
+            );
+            CREATE TABLE IF NOT EXISTS outputs (
+                mr_id TEXT NOT NULL,
+                sut_id TEXT NOT NULL,
+                mtc_index INTEGER NOT NULL,
+                is_source INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                input_digest TEXT NOT NULL,
+                output BLOB NOT NULL,
+                PRIMARY KEY (mr_id, sut_id, mtc_index, is_source, position)
+            );
+        """)
+
+    def relation_rng(self, mr_id: str) -> random.Random:
+        """
+        Returns the random number generator the test cases of a metamorphic relation are
+        sampled with, which does not depend on the relations generated before it.
+        """
+        return random.Random(f"{self.seed}:{mr_id}")
+
+    def rng(self, mr_id: str, sut_id: str, test_case: MetamorphicTestCase) -> random.Random:
+        """
+        Returns the random number generator of a test case, which does not depend on the
+        test cases executed before it.
+        """
+        return random.Random(f"{self.seed}:{mr_id}:{sut_id}:{test_case.identity.mtc_index}")
+
+    def restore(self, metamorphic_relation: "MetamorphicRelation", sut_id: str) -> Set[int]:
+        """
+        Restores the results of the finished test cases of a metamorphic relation and
+        system under test and returns their indices. The test cases get the relation
+        result and the error they finished with, but no outputs and no report. Results of
+        test cases whose inputs or parameters changed are not restored.
+        """
+        if not self.resumed:
+            return set()
+        mr_id = metamorphic_relation.mr_id
+        test_cases = metamorphic_relation.test_cases[sut_id]
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT mtc_index, input_digest, relation_result, error_type, error_message "
+                "FROM results WHERE mr_id = ? AND sut_id = ?", (mr_id, sut_id)).fetchall()
+        restored = set()
+        for index, input_digest, relation_result, error_type, error_message in rows:
+            if index >= len(test_cases) \
+                    or _template_digest(metamorphic_relation, index) != input_digest:
+                continue
+            mtc = test_cases[index]
+            mtc.relation_result = bool(relation_result)
+            if error_type is not None:
+                error_class = getattr(metamorphic_error, error_type, None)
+                base_class = metamorphic_error.MetamorphicRelationError
+                if not (isinstance(error_class, type) and issubclass(error_class, base_class)):
+                    error_class = base_class
+                mtc.error = error_class(error_message)
+            restored.add(index)
+        with self._lock:
+            self._restored_keys.update((mr_id, sut_id, index) for index in restored)
+            self.restored += len(restored)
+        return restored
+
+    def is_restored(self, mr_id: str, sut_id: str, test_case: MetamorphicTestCase) -> bool:
+        return (mr_id, sut_id, test_case.identity.mtc_index) in self._restored_keys
+
+    def _load_stored_outputs(self, mr_id: str, sut_id: str) -> Set[Tuple[int, int, int]]:
+        stored = self._stored_outputs.get((mr_id, sut_id))
+        if stored is None:
+            rows = self._connection.execute(
+                "SELECT mtc_index, is_source, position FROM outputs "
+                "WHERE mr_id = ? AND sut_id = ?", (mr_id, sut_id)).fetchall()
+            stored = self._stored_outputs[(mr_id, sut_id)] = set(rows)
+        return stored
+
+    def cached_output(self, mr_id: str, sut_id: str, item: InputQueueItem) \
+            -> Tuple[bool, Any]:
+        """
+        Returns whether the checkpoint holds the output of an input and the output.
+        """
+        if not self.resumed:
+            return False, None
+        key = (item.test_case.identity.mtc_index, int(item.is_source), item.index)
+        with self._lock:
+            if key not in self._load_stored_outputs(mr_id, sut_id):
+                return False, None
+            row = self._connection.execute(
+                "SELECT input_digest, output FROM outputs WHERE mr_id = ? AND sut_id = ? "
+                "AND mtc_index = ? AND is_source = ? AND position = ?",
+                (mr_id, sut_id, *key)).fetchone()
+        if row is None or row[0] != _input_digest(item):
+            return False, None
+        self.reused_outputs += 1
+        return True, pickle.loads(row[1])  # nosec - written by this checkpoint
+
+    def add_outputs(self, mr_id: str, sut_id: str, items: Sequence[InputQueueItem],
+                    outputs: Sequence[Any]):
+        """
+        Keeps the outputs of executed inputs until their test cases finish. Outputs of
+        test cases that are unfinished when the checkpoint is written are persisted.
+        """
+        with self._lock:
+            for item, output in zip(items, outputs):
+                key = (mr_id, sut_id, item.test_case.identity.mtc_index)
+                self._outputs.setdefault(key, []).append((item, output))
+        self._flush_if_due()
+
+    def add_result(self, metamorphic_relation: "MetamorphicRelation", sut_id: str,
+                   test_case: MetamorphicTestCase):
+        """
+        Records a finished test case, its outputs are no longer needed.
+        """
+        error = test_case.error
+        key = (metamorphic_relation.mr_id, sut_id, test_case.identity.mtc_index)
+        input_digest = _template_digest(metamorphic_relation, key[2])
+        with self._lock:
+            if input_digest is not None:
+                self._results.append((*key, input_digest, int(bool(test_case.relation_result)),
+                                      type(error).__name__ if error is not None else None,
+                                      getattr(error, "message", None)))
+            self._outputs.pop(key, None)
+            # outputs of a resumed run might have been written by the previous run
+            if key in self._written_outputs or self.resumed:
+                self._written_outputs.discard(key)
+                self._finished_outputs.append(key)
+        self._flush_if_due()
+
+    def _flush_if_due(self):
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _output_rows(self) -> List[Tuple]:
+        rows = []
+        for key, outputs in self._outputs.items():
+            for item, output in outputs:
+                input_digest = _input_digest(item)
+                try:
+                    payload = pickle.dumps(output, protocol=4)
+                except Exception:  # noqa
+                    continue
+                if input_digest is not None:
+                    rows.append((*key, int(item.is_source), item.index, input_digest,
+                                 payload))
+            self._written_outputs.add(key)
+        return rows
+
+    def flush(self):
+        """
+        Writes the results and the outputs of unfinished test cases recorded since the last
+        write.
+        """
+        with self._lock:
+            self._last_flush = time.monotonic()
+            output_rows = self._output_rows()
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", self._results)
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO outputs VALUES (?, ?, ?, ?, ?, ?, ?)", output_rows)
+            self._connection.executemany(
+                "DELETE FROM outputs WHERE mr_id = ? AND sut_id = ? AND mtc_index = ?",
+                self._finished_outputs)
+            self._connection.commit()
+            self._results.clear()
+            self._outputs.clear()
+            self._finished_outputs.clear()
+
+    def close(self):
+        """
+        Writes the checkpoint and closes its database.
+        """
+        self.flush()
+        self._connection.close()
+
+
+_checkpoint: Optional[Checkpoint] = None
+
+
+def get_checkpoint() -> Optional[Checkpoint]:
+    """
+    Returns the checkpoint of the current run, None if the run is not checkpointed.
+    """
+    return _checkpoint
+
+
+def open_checkpoint(directory, resume: bool = False, flush_interval: float = FLUSH_INTERVAL,
+                    shared: bool = False) -> Checkpoint:
+    """
+    Opens the checkpoint of the current run. Must be called before the metamorphic
+    relations are created, which sample their test cases from its seed as in the run that
+    started the checkpoint.
+    """
+    global _checkpoint
+    close_checkpoint()
+    _checkpoint = Checkpoint(directory, resume, flush_interval, shared)
+    if _checkpoint.resumed:
+        logger.info("Resuming from the checkpoint in %s", directory)
+    return _checkpoint
+
+
+def close_checkpoint():
+    """
+    Writes and closes the checkpoint of the current run, if there is one.
+    """
+    global _checkpoint
+    if _checkpoint is not None:
+        _checkpoint.close()
+        _checkpoint = None
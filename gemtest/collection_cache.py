@@ -0,0 +1,100 @@
+import os
+import tempfile
+from itertools import chain, combinations
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .logger import logger
+from .utils.digest import canonical_digest
+
+# bump when the layout of the cached index changes
+CACHE_FORMAT_VERSION = 2
+
+
+def create_template_index(number_of_elements: int, number_of_sources: int,
+                          number_of_permutations: int) -> np.ndarray:
+    """
+    Creates the compact index of exhaustive metamorphic test case templates. Each row
+    holds the indices of the source inputs in the data followed by the index of the
+    parameter permutation, in the order the templates are created.
+    """
+    source_indices = np.fromiter(
+        chain.from_iterable(combinations(range(number_of_elements), number_of_sources)),
+        dtype=np.int64,
+    ).reshape(-1, number_of_sources)
+    return expand_template_index(source_indices, number_of_permutations)
+
+
+def expand_template_index(source_indices: np.ndarray,
+                          number_of_permutations: int) -> np.ndarray:
+    """
+    Creates the template index of the given rows of source indices, with one row per
+    source indices and parameter permutation.
+    """
+    index = np.empty((len(source_indices) * number_of_permutations,
+                      source_indices.shape[1] + 1), dtype=np.int64)
+    index[:, :-1] = np.repeat(source_indices, number_of_permutations, axis=0)
+    index[:, -1] = np.tile(np.arange(number_of_permutations), len(source_indices))
+    return index
+
+
+class CollectionCache:
+    """
+    Persists the template index of exhaustive metamorphic relations across runs. Each row
+    of the index holds the indices of the source inputs of a template in the data and the
+    index of its parameter permutation. The index is keyed by a digest of the content of
+    the data, the number of sources and the parameters, relations whose data or
+    parameters have no canonical encoding (see canonical_digest) are not cached. Cached
+    indices are loaded as read-only memory maps.
+
+    Parameters
+    ----------
+    directory : PathLike
+        The directory holding the cached indices.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(data: Sequence, number_of_sources: int, parameters: Dict) -> Optional[str]:
+        """
+        Returns the cache key of the template index of a metamorphic relation, or None if
+        the data or the parameters can not be digested.
+        """
+        digest = canonical_digest((data, number_of_sources, parameters))
+        if digest is None:
+            return None
+        return f"v{CACHE_FORMAT_VERSION}-{digest}"
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npy"
+
+    def load(self, key: str) -> Optional[np.ndarray]:
+        try:
+            index = np.load(self._path(key), mmap_mode="r")
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return index
+
+    def save(self, key: str, index: np.ndarray):
+        """
+        Writes the index atomically, so concurrent runs (e.g. xdist workers) never read a
+        partially written file.
+        """
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory,
+                                                               suffix=".tmp")
+            with os.fdopen(file_descriptor, "wb") as file:
+                np.save(file, index)
+            os.replace(temporary_path, self._path(key))
+        except OSError as e:
+            logger.warning("Could not write the collection cache to %s: %s",
+                           self.directory, e)
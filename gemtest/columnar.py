@@ -0,0 +1,380 @@
+import copy
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .metamorphic_test_case import BaseMetamorphicTestCase, MTCIdentity, UninitializedValue
+
+_PYTHON_SCALARS = (bool, int, float, complex)
+
+# (dtype, shape, is_python_scalar) of values that are stored natively in a column
+_Kind = Tuple[np.dtype, Tuple[int, ...], bool]
+
+
+def _kind_of(value: Any) -> Optional[_Kind]:
+    """
+    Returns the kind of a numeric scalar or fixed-shape array, or None for values that
+    are stored as objects.
+    """
+    if isinstance(value, np.generic):
+        if value.dtype.kind in "biufc":
+            return value.dtype, (), False
+        return None
+    if isinstance(value, _PYTHON_SCALARS):
+        dtype = np.asarray(value).dtype
+        # integers exceeding int64 are stored as objects
+        return (dtype, (), True) if dtype.kind in "biufc" else None
+    if type(value) is np.ndarray and value.dtype.kind in "biufc":  # noqa - no subclasses
+        return value.dtype, value.shape, False
+    return None
+
+
+class _Column:
+    """
+    A list of values per row, e.g. the follow-up outputs of all MTCs. Numeric scalars and
+    numeric arrays of a fixed shape and dtype are stored in a single contiguous array of
+    shape (rows, width, *shape). Once a value of a different kind is written, the column
+    falls back to an object array.
+    """
+    __slots__ = ("values", "lengths", "missing", "is_set", "kind")
+
+    def __init__(self, size: int):
+        self.values: Optional[np.ndarray] = None
+        self.lengths = np.zeros(size, dtype=np.int32)
+        # the number of uninitialized values per row
+        self.missing = np.zeros(size, dtype=np.int32)
+        self.is_set = np.zeros((size, 0), dtype=bool)
+        self.kind: Optional[_Kind] = None
+
+    @property
+    def width(self) -> int:
+        return self.is_set.shape[1]
+
+    def reserve(self, width: int):
+        if width <= self.width:
+            return
+        padding = width - self.width
+        self.is_set = np.pad(self.is_set, ((0, 0), (0, padding)))
+        if self.values is not None:
+            pad_width = [(0, 0), (0, padding)] + [(0, 0)] * (self.values.ndim - 2)
+            self.values = np.pad(self.values, pad_width)
+
+    def _to_object(self):
+        values = np.empty(self.is_set.shape, dtype=object)
+        for row, index in zip(*np.nonzero(self.is_set)):
+            values[row, index] = self._read(row, index)
+        self.values = values
+        self.kind = None
+
+    def _prepare(self, value: Any):
+        kind = _kind_of(value)
+        if self.values is None:
+            self.kind = kind
+            if kind is None:
+                self.values = np.empty(self.is_set.shape, dtype=object)
+            else:
+                self.values = np.zeros(self.is_set.shape + kind[1], dtype=kind[0])
+        elif self.kind is not None and kind != self.kind:
+            self._to_object()
+
+    def _read(self, row: int, index: int) -> Any:
+        value = self.values[row, index]
+        if self.kind is None:
+            return value
+        if self.kind[2]:
+            return value.item()
+        return value.copy() if isinstance(value, np.ndarray) else value
+
+    def get(self, row: int) -> List:
+        length = self.lengths[row]
+        if self.values is None:
+            return [UninitializedValue] * length
+        is_set = self.is_set[row]
+        return [self._read(row, index) if is_set[index] else UninitializedValue
+                for index in range(length)]
+
+    def set(self, row: int, values: Sequence):
+        self.reserve(len(values))
+        self.lengths[row] = len(values)
+        self.missing[row] = len(values)
+        self.is_set[row] = False
+        for index, value in enumerate(values):
+            self.set_at(row, index, value)
+
+    def extend(self, row: int, values: Sequence):
+        start = self.lengths[row]
+        self.reserve(start + len(values))
+        self.lengths[row] = start + len(values)
+        self.missing[row] += len(values)
+        for index, value in enumerate(values, start=start):
+            self.set_at(row, index, value)
+
+    def set_at(self, row: int, index: int, value: Any) -> bool:
+        """
+        Sets a value of a row. Returns True if this sets the last missing value of the row.
+        """
+        if not -self.lengths[row] <= index < self.lengths[row]:
+            raise IndexError("list assignment index out of range")
+        index %= self.lengths[row]
+        was_set = self.is_set[row, index]
+        if value is UninitializedValue:
+            self.is_set[row, index] = False
+            self.missing[row] += was_set
+            return False
+        self._prepare(value)
+        self.values[row, index] = value
+        self.is_set[row, index] = True
+        if was_set:
+            return False
+        self.missing[row] -= 1
+        return self.missing[row] == 0
+
+    def copy(self) -> "_Column":
+        column = _Column.__new__(_Column)
+        column.values = self.values.copy() if self.values is not None else None
+        column.lengths = self.lengths.copy()
+        column.missing = self.missing.copy()
+        column.is_set = self.is_set.copy()
+        column.kind = self.kind
+        return column
+
+
+class ColumnarStore:
+    """
+    Stores the metamorphic test cases of a metamorphic relation in columns indexed by the
+    MTC id instead of one object per MTC. Source inputs are stored as indices into the
+    data and parameters as indices into the parameter permutations. Follow-up inputs and
+    outputs of numeric scalars or numeric arrays of a fixed shape are stored in
+    contiguous NumPy arrays, other values in object arrays. Relation results and status
+    flags are boolean arrays, errors, reports and data loaders are only stored for the
+    MTCs that have them.
+
+    The MTCs are accessed through lightweight row views that behave like
+    MetamorphicTestCase instances, bulk operations can use the arrays directly, e.g.
+    `store.relation_results[store.failed]`. Writing a column may reallocate its array, so
+    the row views hold the lock of the store while they access columns, and rows can be
+    executed by different threads.
+
+    Parameters
+    ----------
+    data : Sequence
+        The data the source inputs are taken from.
+    source_index : np.ndarray
+        The indices of the source inputs of each MTC in the data, of shape
+        (number of MTCs, number of sources).
+    parameter_index : np.ndarray
+        The index of the parameter permutation of each MTC.
+    parameter_permutations : List[Dict]
+        The parameter permutations of the metamorphic relation.
+    """
+
+    def __init__(self, data: Sequence, source_index: np.ndarray, parameter_index: np.ndarray,
+                 parameter_permutations: List[Dict]):
+        self.data = data
+        self.source_index = source_index
+        self.parameter_index = parameter_index
+        self.parameter_permutations = parameter_permutations
+        size = len(source_index)
+        self.followup_inputs = _Column(size)
+        self.source_outputs = _Column(size)
+        self.followup_outputs = _Column(size)
+        # each MTC starts with one uninitialized source output per source input
+        self.source_outputs.lengths[:] = source_index.shape[1]
+        self.source_outputs.missing[:] = source_index.shape[1]
+        self.source_outputs.reserve(source_index.shape[1])
+        self.relation_results = np.zeros(size, dtype=bool)
+        self.validated = np.zeros(size, dtype=bool)
+        self.source_inputs_checked = np.zeros(size, dtype=bool)
+        self.source_input_overrides: Dict[int, List] = {}
+        self.parameter_overrides: Dict[int, Optional[Dict]] = {}
+        self.errors: Dict[int, Any] = {}
+        self.reports: Dict[int, Any] = {}
+        self.data_loaders: Dict[int, Any] = {}
+        # (mr_index, sut_index) of the test cases of a system under test, the row is the
+        # index of a test case
+        self.identity_prefix: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+        self._test_cases: Optional[List["ColumnarMetamorphicTestCase"]] = None
+
+    @classmethod
+    def from_template_index(cls, data: Sequence, index: np.ndarray,
+                            parameter_permutations: List[Dict]) -> "ColumnarStore":
+        """
+        Creates a store from a template index as created by create_template_index, whose
+        rows hold the source indices followed by the parameter permutation index.
+        """
+        return cls(data, index[:, :-1], index[:, -1], parameter_permutations)
+
+    def __len__(self):
+        return len(self.source_index)
+
+    @property
+    def test_cases(self) -> List["ColumnarMetamorphicTestCase"]:
+        """
+        The row views of all MTCs, in the order of their ids.
+        """
+        if self._test_cases is None:
+            self._test_cases = [ColumnarMetamorphicTestCase(self, row)
+                                for row in range(len(self))]
+        return self._test_cases
+
+    @property
+    def failed(self) -> np.ndarray:
+        """
+        A boolean mask of the MTCs that have an error.
+        """
+        mask = np.zeros(len(self), dtype=bool)
+        mask[list(self.errors)] = True
+        return mask
+
+    def get_source_inputs(self, row: int) -> List:
+        if row in self.source_input_overrides:
+            return self.source_input_overrides[row]
+        return [self.data[i] for i in self.source_index[row].tolist()]
+
+    def get_parameters(self, row: int) -> Optional[Dict]:
+        if row in self.parameter_overrides:
+            return self.parameter_overrides[row]
+        return self.parameter_permutations[self.parameter_index[row]] or None
+
+    def copy(self) -> "ColumnarStore":
+        """
+        Returns a copy of the store that shares the data, the source index and the
+        parameter permutations, which are never modified in place.
+        """
+        store = ColumnarStore.__new__(ColumnarStore)
+        store.data = self.data
+        store.source_index = self.source_index
+        store.parameter_index = self.parameter_index
+        store.parameter_permutations = self.parameter_permutations
+        store.followup_inputs = self.followup_inputs.copy()
+        store.source_outputs = self.source_outputs.copy()
+        store.followup_outputs = self.followup_outputs.copy()
+        store.relation_results = self.relation_results.copy()
+        store.validated = self.validated.copy()
+        store.source_inputs_checked = self.source_inputs_checked.copy()
+        store.source_input_overrides = copy.deepcopy(self.source_input_overrides)
+        store.parameter_overrides = copy.deepcopy(self.parameter_overrides)
+        store.errors = dict(self.errors)
+        store.reports = dict(self.reports)
+        store.data_loaders = dict(self.data_loaders)
+        store.identity_prefix = self.identity_prefix
+        store._lock = threading.Lock()
+        store._test_cases = None
+        return store
+
+
+def _optional_entry(store_attribute: str):
+    """
+    Creates a property of a row view stored in a dict of the store that only holds the
+    rows with a value other than None.
+    """
+
+    def getter(self):
+        return getattr(self._store, store_attribute).get(self._row)
+
+    def setter(self, value):
+        entries = getattr(self._store, store_attribute)
+        if value is None:
+            entries.pop(self._row, None)
+        else:
+            entries[self._row] = value
+
+    return property(getter, setter)
+
+
+def _flag(store_attribute: str):
+    """
+    Creates a property of a row view stored in a boolean array of the store.
+    """
+
+    def getter(self):
+        return bool(getattr(self._store, store_attribute)[self._row])
+
+    def setter(self, value):
+        getattr(self._store, store_attribute)[self._row] = value
+
+    return property(getter, setter)
+
+
+def _column(store_attribute: str):
+    """
+    Creates a property of a row view stored in a column of the store.
+    """
+
+    def getter(self):
+        with self._store._lock:  # noqa - the row views are part of the store
+            return getattr(self._store, store_attribute).get(self._row)
+
+    def setter(self, value):
+        with self._store._lock:  # noqa
+            getattr(self._store, store_attribute).set(self._row, value)
+
+    return property(getter, setter)
+
+
+class ColumnarMetamorphicTestCase(BaseMetamorphicTestCase):
+    """
+    A metamorphic test case stored in a row of a ColumnarStore. It only holds the store and
+    its row, all reads and writes go to the columns of the store.
+    """
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: ColumnarStore, row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def store(self) -> ColumnarStore:
+        return self._store
+
+    @property
+    def row(self) -> int:
+        return self._row
+
+    @property
+    def identity(self) -> Optional[MTCIdentity]:
+        prefix = self._store.identity_prefix
+        return MTCIdentity(*prefix, self._row) if prefix is not None else None
+
+    @property
+    def _source_inputs(self):
+        return self._store.get_source_inputs(self._row)
+
+    @_source_inputs.setter
+    def _source_inputs(self, value):
+        self._store.source_input_overrides[self._row] = list(value)
+
+    @property
+    def _parameters(self):
+        return self._store.get_parameters(self._row)
+
+    @_parameters.setter
+    def _parameters(self, value):
+        self._store.parameter_overrides[self._row] = value
+
+    _followup_inputs = _column("followup_inputs")
+    _source_outputs = _column("source_outputs")
+    _followup_outputs = _column("followup_outputs")
+    _relation_result = _flag("relation_results")
+    validated = _flag("validated")
+    _source_inputs_checked = _flag("source_inputs_checked")
+    _report = _optional_entry("reports")
+    _error = _optional_entry("errors")
+    data_loader = _optional_entry("data_loaders")
+
+    def _extend(self, name: str, values) -> None:
+        if name == "_source_inputs":
+            self._source_inputs = self._source_inputs + list(values)
+            return
+        with self._store._lock:  # noqa
+            getattr(self._store, name[1:]).extend(self._row, list(values))
+
+    def _set_at(self, name: str, index: int, value: Any) -> bool:
+        with self._store._lock:  # noqa
+            return bool(getattr(self._store, name[1:]).set_at(self._row, index, value))
+
+    def _missing(self, name: str) -> int:
+        with self._store._lock:  # noqa
+            return int(getattr(self._store, name[1:]).missing[self._row])
@@ -1,20 +1,80 @@
 import atexit
-from typing import Dict
+import threading
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, \
+    Tuple
 
 import pytest
 
+from .checkpoint import FLUSH_INTERVAL, close_checkpoint, open_checkpoint
 from .logger import logger
+from .metamorphic_error import ErrorMode, InvalidInputError, SkippedMTC
 from .report.data_exporter import GeneralDataExporter
 from .report.report_handler import ReportHandler
 from .report.string_generator import StringReportGenerator
+from .testcase_chunk import MetamorphicTestCaseChunk, parse_granularity
+from .utils.resource_cache import get_resource_cache
 
+# written while the session is configured, tests patch it while they are collected
 CONFIG: Dict = {}
+# the read-only copy of CONFIG taken when the session starts, read by the executors and
+# by every thread other than the main thread
+config_snapshot: Mapping = MappingProxyType({})
+_thread_state = threading.local()
 report_handler: ReportHandler
 printed_hints = set()
+# node id, type and message of the first error and the number of errors of each type
+mtc_errors: List[Tuple[str, str, str, Dict[str, int]]] = []
+# the pytest-html plugin of the session, resolved once in pytest_sessionstart
+html_plugin: Optional[Any] = None
+# the metamorphic_relation mark of each test function, shared by all its parametrized items
+relation_marks: Dict[Callable, Optional[pytest.Mark]] = {}
 
 
-def get_conftest_config():
-    return CONFIG
+def get_conftest_config() -> Mapping:
+    """
+    Returns the configuration. Only the main thread reads the mutable CONFIG, other
+    threads, e.g. of a ThreadedTestCaseExecutor, read the snapshot they were handed or
+    the snapshot of the session.
+    """
+    if threading.current_thread() is threading.main_thread():
+        return CONFIG
+    return get_config_snapshot()
+
+
+def get_config_snapshot() -> Mapping:
+    """
+    Returns the read-only configuration of the current thread, by default the snapshot
+    taken when the session started.
+    """
+    return getattr(_thread_state, "config", None) or config_snapshot
+
+
+def freeze_config(config: Mapping) -> Mapping:
+    """
+    Replaces the snapshot of the session with a read-only copy of config.
+    """
+    global config_snapshot
+    config_snapshot = MappingProxyType(dict(config))
+    return config_snapshot
+
+
+@contextmanager
+def use_config(config: Optional[Mapping]) -> Iterator[None]:
+    """
+    Makes the current thread read config as its configuration within the context, e.g.
+    the snapshot handed to an executor. Does nothing if config is None.
+    """
+    if config is None:
+        yield
+        return
+    previous = getattr(_thread_state, "config", None)
+    _thread_state.config = config
+    try:
+        yield
+    finally:
+        _thread_state.config = previous
 
 
 def pytest_configure(config):
@@ -29,6 +89,19 @@ def find_metamorphic_relation_mark(item):
         return mark
 
 
+def get_metamorphic_relation_mark(item) -> Optional[pytest.Mark]:
+    """
+    Returns the metamorphic_relation mark of an item. The mark is looked up once per test
+    function, since all items of a parametrized test function share it.
+    """
+    function = getattr(item, "function", None)
+    if function is None:
+        return find_metamorphic_relation_mark(item)
+    if function not in relation_marks:
+        relation_marks[function] = find_metamorphic_relation_mark(item)
+    return relation_marks[function]
+
+
 def pytest_addoption(parser):
     parser.addoption(
         "--string-report",
@@ -57,6 +130,106 @@ def pytest_addoption(parser):
         default=None,
         help="Set SUT classname",
     )
+    parser.addoption(
+        "--sut_endpoint",
+        default=None,
+        help="Set unix socket of a running gemtest-sut-server",
+    )
+    parser.addoption(
+        "--gmt-sut-timeout",
+        default=None,
+        type=float,
+        help="Cancel SUT calls (or batches) that take longer than this number of seconds",
+    )
+    parser.addoption(
+        "--gmt-isolate",
+        action="store_true",
+        default=False,
+        help="Run systems under test in supervised worker processes",
+    )
+    parser.addoption(
+        "--gmt-max-batches-per-worker",
+        default=None,
+        type=int,
+        help="Recycle isolated SUT workers after this number of batches",
+    )
+    parser.addoption(
+        "--gmt-max-worker-rss",
+        default=None,
+        type=int,
+        help="Recycle isolated SUT workers above this resident set size in MB",
+    )
+    parser.addoption(
+        "--gmt-on-error",
+        default=ErrorMode.EXIT,
+        choices=[ErrorMode.EXIT, ErrorMode.CONTINUE],
+        help="Stop the session on the first error in user code (exit) or only fail the "
+             "affected metamorphic test cases (continue)",
+    )
+    parser.addoption(
+        "--gmt-resource-cache-size",
+        default=None,
+        type=int,
+        help="Maximum size in MB of the cache of inputs loaded by a data_loader",
+    )
+    parser.addoption(
+        "--gmt-prefetch-depth",
+        default=None,
+        type=int,
+        help="Load the inputs of this number of upcoming batches in the background",
+    )
+    parser.addoption(
+        "--gmt-prefetch-workers",
+        default=None,
+        type=int,
+        help="Number of threads loading inputs in the background",
+    )
+    parser.addoption(
+        "--gmt-collection-cache",
+        default=None,
+        help="Directory in which the test case templates of exhaustive metamorphic "
+             "relations are cached across runs",
+    )
+    parser.addoption(
+        "--gmt-granularity",
+        default="mtc",
+        type=parse_granularity,
+        help="Metamorphic test cases executed by each pytest item: mtc (one), chunk:N "
+             "(N) or mr (all test cases of a metamorphic relation and system under test)",
+    )
+    parser.addoption(
+        "--gmt-threads",
+        default=None,
+        type=int,
+        help="Number of threads executing the metamorphic test cases of a pytest item, "
+             "used with --gmt-granularity=chunk:N or mr",
+    )
+    parser.addoption(
+        "--gmt-ids",
+        default="full",
+        choices=("full", "short"),
+        help="pytest ids of metamorphic test cases: full (names of the system under test, "
+             "metamorphic relation and test case) or short (MR index.SUT index.test case)",
+    )
+    parser.addoption(
+        "--gmt-checkpoint",
+        default=None,
+        help="Directory in which the progress of the run is checkpointed: the seed, the "
+             "results of finished metamorphic test cases and pending SUT outputs",
+    )
+    parser.addoption(
+        "--gmt-resume",
+        action="store_true",
+        default=False,
+        help="Resume the run from the checkpoint in --gmt-checkpoint, finished metamorphic "
+             "test cases are not executed again",
+    )
+    parser.addoption(
+        "--gmt-checkpoint-interval",
+        default=FLUSH_INTERVAL,
+        type=float,
+        help="Minimum number of seconds between two writes of the checkpoint",
+    )
     parser.addoption(
         "--export-data",
         action="store_true",
@@ -82,9 +255,12 @@ def config(request):
 def update_config_sut_dynamic(session):
     sut_filepath = session.config.getoption('--sut_filepath')
     sut_class = session.config.getoption('--sut_class')
-    sut_dynamic = (sut_filepath is not None and sut_class is not None)
+    sut_endpoint = session.config.getoption('--sut_endpoint')
+    sut_dynamic = (sut_filepath is not None and sut_class is not None) \
+        or sut_endpoint is not None
     CONFIG['sut_filepath'] = sut_filepath
     CONFIG['sut_class'] = sut_class
+    CONFIG['sut_endpoint'] = sut_endpoint
     CONFIG['is_sut_dynamic_active'] = sut_dynamic
 
 
@@ -98,24 +274,52 @@ def pytest_sessionstart(session):
         'html_report': session.config.getoption('--html-report'),
         'batch_size': session.config.getoption('--batch_size'),
         'export_data': session.config.getoption('--export-data'),
+        'sut_timeout': session.config.getoption('--gmt-sut-timeout'),
+        'isolate': session.config.getoption('--gmt-isolate'),
+        'max_batches_per_worker': session.config.getoption('--gmt-max-batches-per-worker'),
+        'max_worker_rss': session.config.getoption('--gmt-max-worker-rss'),
+        'on_error': session.config.getoption('--gmt-on-error'),
+        'resource_cache_size': session.config.getoption('--gmt-resource-cache-size'),
+        'prefetch_depth': session.config.getoption('--gmt-prefetch-depth'),
+        'prefetch_workers': session.config.getoption('--gmt-prefetch-workers'),
+        'collection_cache': session.config.getoption('--gmt-collection-cache'),
+        'granularity': session.config.getoption('--gmt-granularity'),
+        'ids': session.config.getoption('--gmt-ids'),
+        'threads': session.config.getoption('--gmt-threads'),
+        'checkpoint': session.config.getoption('--gmt-checkpoint'),
+        'resume': session.config.getoption('--gmt-resume'),
     }
+    global html_plugin
+    html_plugin = session.config.pluginmanager.getplugin("html")
+    relation_marks.clear()
+    mtc_errors.clear()
+    if CONFIG['resource_cache_size'] is not None:
+        get_resource_cache().max_bytes = CONFIG['resource_cache_size'] * 1024 * 1024
     if CONFIG['html_report']:
         global report_handler
         report_handler = ReportHandler(max_size=100)
     update_config_sut_dynamic(session)
+    freeze_config(CONFIG)
+    if CONFIG['resume'] and not CONFIG['checkpoint']:
+        raise pytest.UsageError("--gmt-resume requires --gmt-checkpoint")
+    if CONFIG['checkpoint']:
+        # before the test modules are collected, which generates the test cases. The
+        # controller of pytest-xdist runs first and creates the checkpoint its workers share
+        open_checkpoint(CONFIG['checkpoint'], CONFIG['resume'],
+                        session.config.getoption('--gmt-checkpoint-interval'),
+                        shared=hasattr(session.config, "workerinput"))
 
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item: pytest.TestReport, call: pytest.CallInfo):
     """
     The wrapper that gets called during the test execution for each test case. If a test is
-    marked as metamorphic_relation, then the wrapper will generate the reports (string /
-    html) and export the data depending on which options are set.
+    marked as metamorphic_relation, then the wrapper marks errors in user code on the
+    report and, if pytest-html is installed, generates the reports (string / html) and
+    exports the data depending on which options are set.
     """
-    pytest_html = item.config.pluginmanager.getplugin("html")
-    mr_mark: pytest.Mark = find_metamorphic_relation_mark(item)
-
-    if not (pytest_html and mr_mark):
+    mr_mark = get_metamorphic_relation_mark(item)
+    if mr_mark is None:
         yield
         return
 
@@ -125,13 +329,28 @@ def pytest_runtest_makereport(item: pytest.TestReport, call: pytest.CallInfo):
     if call.excinfo is not None and isinstance(call.excinfo.value, SystemExit):
         raise call.excinfo.value
 
-    if report.when == "call":
+    if report.when != "call":
+        return
 
-        mtc = item.callspec.params['mtc']
-        if mtc.report:
-            mtc.report.populate(report)
+    param = item.callspec.params['mtc']
+    if isinstance(param, MetamorphicTestCaseChunk):
+        # the chunk is empty if materializing a lazy metamorphic relation failed
+        mtcs = param.test_cases[:len(param.outcomes)]
+    else:
+        mtcs = [param]
+    mark_error_report(report, mtcs)
+    if html_plugin is None:
+        return
 
-        data_exporter = mr_mark.kwargs.get("data_exporter", None)
+    data_exporter = mr_mark.kwargs.get("data_exporter", None)
+    for index, mtc in enumerate(mtcs):
+        if not mtc.report:
+            # restored from a checkpoint, it was reported by the run that executed it
+            continue
+        if isinstance(param, MetamorphicTestCaseChunk):
+            mtc.report.populate(report, test_result=param.outcomes[index])
+        else:
+            mtc.report.populate(report)
 
         if data_exporter:
             if CONFIG["export_data"]:
@@ -144,6 +363,64 @@ def pytest_runtest_makereport(item: pytest.TestReport, call: pytest.CallInfo):
             generate_html_report(mtc, mr_mark)
 
 
+def mark_error_report(report: pytest.TestReport, mtcs: Sequence):
+    """
+    Marks the report of metamorphic test cases that failed because of errors in user
+    code, so it is reported as an error instead of a failure. The report holds the first
+    error and the number of errors of each type, a chunk may contain several errors.
+    """
+    if not report.failed:
+        return
+    errors = [mtc.error for mtc in mtcs if mtc.error is not None
+              and not isinstance(mtc.error, (InvalidInputError, SkippedMTC))]
+    if not errors:
+        return
+    error_counts: Dict[str, int] = {}
+    for error in errors:
+        error_type = type(error).__name__
+        error_counts[error_type] = error_counts.get(error_type, 0) + 1
+    report.gmt_error_type = type(errors[0]).__name__
+    report.gmt_error_message = errors[0].message
+    report.gmt_error_counts = error_counts
+
+
+def pytest_report_teststatus(report, config):  # noqa
+    """
+    Reports metamorphic test cases that failed because of an error in user code as errors.
+    """
+    if report.when == "call" and getattr(report, "gmt_error_type", None):
+        return "error", "E", "ERROR"
+    return None
+
+
+def pytest_runtest_logreport(report):
+    """
+    Collects the errors of metamorphic test cases for the error summary.
+    """
+    if report.when == "call" and getattr(report, "gmt_error_type", None):
+        mtc_errors.append((report.nodeid, report.gmt_error_type, report.gmt_error_message,
+                           report.gmt_error_counts))
+
+
+def pytest_terminal_summary(terminalreporter):
+    """
+    Prints a summary of all metamorphic test cases that failed because of an error.
+    """
+    if not mtc_errors:
+        return
+    terminalreporter.section("gemtest error summary")
+    error_counts: Dict[str, int] = {}
+    for _, _, _, item_error_counts in mtc_errors:
+        for error_type, count in item_error_counts.items():
+            error_counts[error_type] = error_counts.get(error_type, 0) + count
+    for error_type, count in sorted(error_counts.items()):
+        terminalreporter.write_line(f"{error_type}: {count}")
+    for nodeid, error_type, message, item_error_counts in mtc_errors:
+        more = sum(item_error_counts.values()) - 1
+        suffix = f" (and {more} more errors)" if more else ""
+        terminalreporter.write_line(f"{nodeid} - {error_type}: {message}{suffix}")
+
+
 def export_test_data(data_exporter, report):
     exporter = GeneralDataExporter(data_exporter, report)
     exporter.execute()
@@ -187,6 +464,7 @@ def pytest_sessionfinish(session, exitstatus):  # noqa
     """
     The wrapper that gets called after all tests are executed.
     """
+    close_checkpoint()
     if CONFIG['html_report']:
         report_handler.save()  # noqa
         report_handler.close()  # noqa
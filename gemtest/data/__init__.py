@@ -0,0 +1,32 @@
+from typing import TYPE_CHECKING
+
+from .lazy import LazyData, lazy
+from .reference import DataReference
+from .sampling import reservoir_sample, reservoir_samples
+from .stream import FileStream, from_directory, from_glob
+from ..utils.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .memmap import MemmapDataset, RowReference, from_npy, from_npz, from_raw
+
+# NumPy is only imported when a memory-mapped dataset is used
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    name: '.memmap'
+    for name in ('MemmapDataset', 'RowReference', 'from_npy', 'from_npz', 'from_raw')
+})
+
+__all__ = [
+    'DataReference',
+    'FileStream',
+    'LazyData',
+    'MemmapDataset',
+    'RowReference',
+    'from_directory',
+    'from_glob',
+    'from_npy',
+    'from_npz',
+    'from_raw',
+    'lazy',
+    'reservoir_sample',
+    'reservoir_samples',
+]
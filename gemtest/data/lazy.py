@@ -0,0 +1,36 @@
+from typing import Any, Callable
+
+
+class LazyData:
+    """
+    Wraps a zero-argument factory that creates the data of a metamorphic relation. The
+    factory is only called when the first test of the metamorphic relation runs, so
+    metamorphic relations that are deselected, e.g. with -k or -m, never load their data.
+
+    Parameters
+    ----------
+    factory : Callable[[], Iterable]
+        Creates the data of the metamorphic relation.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        if not callable(factory):
+            raise TypeError(f"The data factory must be callable, got {factory!r}")
+        self.factory = factory
+
+    def load(self) -> Any:
+        """
+        Calls the factory and returns the created data.
+        """
+        return self.factory()
+
+    def __repr__(self):
+        return f"LazyData({getattr(self.factory, '__name__', self.factory)!r})"
+
+
+def lazy(factory: Callable[[], Any]) -> LazyData:
+    """
+    Defers the creation of the data of a metamorphic relation until its first test runs,
+    e.g. `gmt.create_metamorphic_relation("mr", data=gmt.lazy(load_dataset))`.
+    """
+    return LazyData(factory)
@@ -0,0 +1,171 @@
+import zipfile
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from .reference import DataReference
+
+PathLike = Union[str, Path]
+
+# size of the fixed part of a zip local file header
+_ZIP_LOCAL_HEADER_SIZE = 30
+
+
+def _read_npy_header(file) -> Tuple[Tuple[int, ...], bool, np.dtype]:
+    version = np.lib.format.read_magic(file)
+    if version == (1, 0):
+        return np.lib.format.read_array_header_1_0(file)
+    return np.lib.format.read_array_header_2_0(file)
+
+
+class RowReference(DataReference):
+    """
+    References a single row of a memory-mapped dataset.
+    """
+    __slots__ = ("dataset", "index")
+
+    def __init__(self, dataset: "MemmapDataset", index: int):
+        self.dataset = dataset
+        self.index = index
+
+    def resolve(self) -> np.ndarray:
+        return self.dataset.array[self.index]
+
+    def __eq__(self, other):
+        return isinstance(other, RowReference) and other.dataset is self.dataset \
+            and other.index == self.index
+
+    def __hash__(self):
+        return hash((id(self.dataset), self.index))
+
+    def __repr__(self):
+        return f"{self.dataset.name}[{self.index}]"
+
+
+class MemmapDataset(Sequence):
+    """
+    A dataset stored in a binary file and opened as a read-only memory map. The elements
+    of the dataset are references to the rows of the array, so metamorphic test cases
+    only hold row indices and receive zero-copy, read-only views of the rows. Processes
+    using the same file share its pages through the OS page cache.
+
+    The file is only opened on first access to a row and is opened again after the
+    dataset is pickled, e.g. when it is sent to another process.
+
+    Parameters
+    ----------
+    path : PathLike
+        The path to the file holding the array.
+    dtype : np.dtype
+        The dtype of the array.
+    shape : Tuple[int, ...]
+        The shape of the array, the first dimension is the number of rows.
+    offset : int
+        The offset of the array data in the file in bytes.
+    fortran_order : bool
+        Whether the array is stored in Fortran order.
+    name : Optional[str]
+        The name of the dataset used in the representation of its rows.
+    """
+
+    def __init__(self, path: PathLike, dtype: Any, shape: Tuple[int, ...], offset: int = 0,
+                 fortran_order: bool = False, name: Optional[str] = None):
+        if not shape:
+            raise ValueError(f"The array in {path} must have at least one dimension")
+        self.path = Path(path)
+        self.dtype = np.dtype(dtype)
+        if self.dtype.hasobject:
+            raise ValueError(f"Arrays of dtype {self.dtype} can not be memory-mapped")
+        self.shape = tuple(shape)
+        self.offset = offset
+        self.fortran_order = fortran_order
+        self.name = name if name is not None else self.path.name
+        self._array: Optional[np.ndarray] = None
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        The read-only memory map of the whole array.
+        """
+        if self._array is None:
+            self._array = np.memmap(self.path, dtype=self.dtype, mode="r",
+                                    offset=self.offset, shape=self.shape,
+                                    order="F" if self.fortran_order else "C")
+        return self._array
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [RowReference(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Index {index} is out of range for {self.name}")
+        return RowReference(self, index)
+
+    def __iter__(self) -> Iterator[RowReference]:
+        return (RowReference(self, i) for i in range(len(self)))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_array"] = None
+        return state
+
+    def __repr__(self):
+        return f"MemmapDataset({str(self.path)!r}, dtype={self.dtype}, shape={self.shape})"
+
+
+def from_npy(path: PathLike) -> MemmapDataset:
+    """
+    Opens a .npy file as a memory-mapped dataset. Only the header of the file is read.
+    """
+    with open(path, "rb") as file:
+        shape, fortran_order, dtype = _read_npy_header(file)
+        offset = file.tell()
+    return MemmapDataset(path, dtype, shape, offset, fortran_order)
+
+
+def from_npz(path: PathLike, key: str) -> MemmapDataset:
+    """
+    Opens the array `key` of a .npz file as a memory-mapped dataset. Only arrays stored
+    without compression (np.savez, not np.savez_compressed) can be memory-mapped.
+    """
+    with zipfile.ZipFile(path) as archive:
+        member = key if key.endswith(".npy") else f"{key}.npy"
+        try:
+            info = archive.getinfo(member)
+        except KeyError as e:
+            raise KeyError(f"{key} is not an array of {path}") from e
+        if info.compress_type != zipfile.ZIP_STORED:
+            raise ValueError(f"The array {key} of {path} is compressed and can not be "
+                             f"memory-mapped, store it with np.savez instead.")
+
+    with open(path, "rb") as file:
+        # the local header repeats the variable length fields of the central directory
+        file.seek(info.header_offset + 26)
+        name_length, extra_length = np.frombuffer(file.read(4), dtype="<u2")
+        file.seek(info.header_offset + _ZIP_LOCAL_HEADER_SIZE + int(name_length)
+                  + int(extra_length))
+        shape, fortran_order, dtype = _read_npy_header(file)
+        offset = file.tell()
+    return MemmapDataset(path, dtype, shape, offset, fortran_order,
+                         name=f"{Path(path).name}:{key}")
+
+
+def from_raw(path: PathLike, dtype: Any, row_shape: Tuple[int, ...] = (),
+             offset: int = 0) -> MemmapDataset:
+    """
+    Opens a raw binary file of rows with the given dtype and shape as a memory-mapped
+    dataset. The number of rows is derived from the size of the file.
+    """
+    dtype = np.dtype(dtype)
+    row_size = dtype.itemsize * int(np.prod(row_shape, dtype=np.int64))
+    data_size = Path(path).stat().st_size - offset
+    if row_size == 0 or data_size % row_size != 0:
+        raise ValueError(f"The size of {path} is not a multiple of the row size "
+                         f"{row_size}")
+    return MemmapDataset(path, dtype, (data_size // row_size, *row_shape), offset)
@@ -0,0 +1,30 @@
+from typing import Any, List
+
+
+class DataReference:
+    """
+    A reference to a source input that is only materialized when a metamorphic test case
+    accesses its source inputs, e.g. a row of a memory-mapped dataset. References are
+    immutable, so copying a metamorphic test case does not copy the referenced data.
+    """
+
+    def resolve(self) -> Any:
+        """
+        Returns the referenced source input.
+        """
+        raise NotImplementedError
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def resolve_references(inputs: List) -> List:
+    """
+    Replaces all data references in the given list of source inputs by the referenced
+    source inputs.
+    """
+    return [source_input.resolve() if isinstance(source_input, DataReference)
+            else source_input for source_input in inputs]
@@ -0,0 +1,102 @@
+import heapq
+import math
+import random
+from itertools import islice
+from typing import Any, Iterable, List, Tuple
+
+
+def _uniform(rng: Any) -> float:
+    # log is undefined for 0, random() returns values in [0, 1)
+    return rng.random() or 5e-324
+
+
+def _next_weight(w: float, k: int, rng: Any) -> float:
+    return w * math.exp(math.log(_uniform(rng)) / k)
+
+
+def _skip(w: float, rng: Any) -> int:
+    """
+    Returns the number of elements Algorithm L skips before the next element it takes.
+    """
+    return 0 if w >= 1 else math.floor(math.log(_uniform(rng)) / math.log1p(-w))
+
+
+def reservoir_sample(iterable: Iterable, k: int, rng: Any = random) -> Tuple[List, int]:
+    """
+    Draws k distinct elements uniformly at random from an iterable of unknown length in a
+    single pass (Algorithm L). Only the sample is held in memory and the skipped elements
+    are not inspected. rng is the random module or a random.Random instance.
+
+    Returns
+    -------
+    Tuple[List, int]
+        The sample and the number of elements of the iterable. If the iterable has fewer
+        than k elements, the sample contains all of them.
+    """
+    if k <= 0:
+        raise ValueError(f"The sample size must be at least 1, got {k}")
+    iterator = iter(iterable)
+    reservoir = list(islice(iterator, k))
+    count = len(reservoir)
+    if count < k:
+        return reservoir, count
+
+    w = _next_weight(1.0, k, rng)
+    while True:
+        skip = _skip(w, rng)
+        skipped = sum(1 for _ in islice(iterator, skip))
+        count += skipped
+        if skipped < skip:
+            return reservoir, count
+        try:
+            element = next(iterator)
+        except StopIteration:
+            return reservoir, count
+        count += 1
+        reservoir[rng.randrange(k)] = element
+        w = _next_weight(w, k, rng)
+
+
+def reservoir_samples(iterable: Iterable, number_of_samples: int, k: int,
+                      rng: Any = random) -> Tuple[List[List], int]:
+    """
+    Draws number_of_samples independent samples of k distinct elements from an iterable
+    of unknown length in a single pass. Every sample runs Algorithm L, a heap holds the
+    position of the next element each sample takes, and all other elements are skipped
+    without drawing random numbers.
+
+    Returns
+    -------
+    Tuple[List[List], int]
+        The samples and the number of elements of the iterable. If the iterable has fewer
+        than k elements, every sample contains all of them.
+    """
+    if k <= 0:
+        raise ValueError(f"The sample size must be at least 1, got {k}")
+    iterator = iter(iterable)
+    first = list(islice(iterator, k))
+    count = len(first)
+    reservoirs = [list(first) for _ in range(number_of_samples)]
+    if count < k or not reservoirs:
+        return reservoirs, count + sum(1 for _ in iterator)
+
+    weights = [_next_weight(1.0, k, rng) for _ in reservoirs]
+    # (position of the next element taken by a sample, index of the sample)
+    upcoming = [(count + _skip(w, rng) + 1, sample) for sample, w in enumerate(weights)]
+    heapq.heapify(upcoming)
+    while True:
+        skip = upcoming[0][0] - count - 1
+        skipped = sum(1 for _ in islice(iterator, skip))
+        count += skipped
+        if skipped < skip:
+            return reservoirs, count
+        try:
+            element = next(iterator)
+        except StopIteration:
+            return reservoirs, count
+        count += 1
+        while upcoming[0][0] == count:
+            sample = upcoming[0][1]
+            reservoirs[sample][rng.randrange(k)] = element
+            weights[sample] = _next_weight(weights[sample], k, rng)
+            heapq.heapreplace(upcoming, (count + _skip(weights[sample], rng) + 1, sample))
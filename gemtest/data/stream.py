@@ -0,0 +1,150 @@
+import os
+import re
+from collections.abc import Iterable
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, Optional, Pattern, Sequence, Tuple, Union
+
+PathLike = Union[str, Path]
+
+_GLOB_MAGIC = re.compile(r"[*?\[]")
+# number of directory entries that are read and sorted at a time
+SORT_CHUNK_SIZE = 4096
+
+
+def _translate_glob(pattern: str) -> Pattern:
+    """
+    Translates a glob pattern relative to a root directory into a regular expression.
+    `**` matches any number of directories, `*` and `?` do not match across directories.
+    """
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+        elif pattern[i] == "*":
+            regex += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            regex += "[^/]"
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            content = pattern[i + 1:end]
+            if content.startswith("!"):
+                content = "^" + content[1:]
+            regex += f"[{content.replace(chr(92), chr(92) * 2)}]"
+            i = end + 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return re.compile(regex + r"\Z")
+
+
+def _split_glob(pattern: str) -> Tuple[str, str]:
+    """
+    Splits a glob pattern into the directory without wildcards it starts in and the
+    remaining pattern relative to that directory.
+    """
+    parts = pattern.replace(os.sep, "/").split("/")
+    static_parts = []
+    for part in parts[:-1]:
+        if _GLOB_MAGIC.search(part):
+            break
+        static_parts.append(part)
+    root = "/".join(static_parts)
+    if pattern.startswith("/") and not root:
+        root = "/"
+    return root or ".", "/".join(parts[len(static_parts):])
+
+
+class FileStream(Iterable):
+    """
+    A data source that lazily enumerates the files of a directory tree with os.scandir.
+    The files are never collected up front, so a metamorphic relation can start creating
+    test cases immediately and memory does not grow with the number of files. The entries
+    of each directory are read in chunks of SORT_CHUNK_SIZE, which are visited in sorted
+    order, so the order of the files is stable. Symbolic links to directories are not
+    followed.
+
+    A FileStream has no length. Metamorphic relations sample their source inputs from it
+    with single-pass reservoir sampling and stream it for exhaustive testing.
+
+    Parameters
+    ----------
+    root : PathLike
+        The directory to enumerate.
+    pattern : Optional[str]
+        A glob pattern relative to root that the files must match, e.g. `**/*.png`.
+    recursive : bool
+        Whether files in subdirectories are enumerated.
+    extensions : Optional[Sequence[str]]
+        The file extensions the files must have, e.g. `(".png", ".jpg")`.
+    """
+
+    def __init__(self, root: PathLike, pattern: Optional[str] = None, recursive: bool = True,
+                 extensions: Optional[Sequence[str]] = None):
+        self.root = str(root)
+        self.pattern = pattern
+        self.recursive = recursive
+        self.extensions = tuple(extension.lower() for extension in extensions) \
+            if extensions is not None else None
+        self._regex = _translate_glob(pattern) if pattern is not None else None
+
+    def _matches(self, relative_path: str) -> bool:
+        if self.extensions is not None \
+                and not relative_path.lower().endswith(self.extensions):
+            return False
+        return self._regex is None or self._regex.match(relative_path) is not None
+
+    def _walk(self, directory: str, prefix: str) -> Iterator[str]:
+        try:
+            scanner = os.scandir(directory)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            return
+        with scanner:
+            while True:
+                entries = sorted(islice(scanner, SORT_CHUNK_SIZE),
+                                 key=lambda entry: entry.name)
+                if not entries:
+                    return
+                for entry in entries:
+                    yield from self._visit(entry, prefix)
+
+    def _visit(self, entry: os.DirEntry, prefix: str) -> Iterator[str]:
+        relative_path = prefix + entry.name
+        # symbolic links to directories are not followed, they could form a cycle
+        if entry.is_dir(follow_symlinks=False):
+            if self.recursive:
+                yield from self._walk(entry.path, relative_path + "/")
+        elif entry.is_file() and self._matches(relative_path):
+            # paths below the working directory are returned without a leading ./
+            yield relative_path if self.root == "." else entry.path
+
+    def __iter__(self) -> Iterator[str]:
+        return self._walk(self.root, "")
+
+    def __repr__(self):
+        return f"FileStream({self.root!r}, pattern={self.pattern!r})"
+
+
+def from_glob(pattern: PathLike) -> FileStream:
+    """
+    Streams the paths of all files matching a glob pattern, e.g. `imgs/**/*.png`.
+    Only the directories below the part of the pattern without wildcards are visited.
+    """
+    root, relative_pattern = _split_glob(str(pattern))
+    recursive = "**" in relative_pattern or "/" in relative_pattern
+    return FileStream(root, relative_pattern, recursive=recursive)
+
+
+def from_directory(directory: PathLike, extensions: Optional[Sequence[str]] = None,
+                   recursive: bool = True) -> FileStream:
+    """
+    Streams the paths of all files in a directory, optionally filtered by extension.
+    """
+    return FileStream(directory, recursive=recursive, extensions=extensions)
@@ -1,17 +1,21 @@
-from typing import TypeVar, Callable, List, Union
+from typing import TypeVar, Callable, List, Optional, Sequence, Union
 
 import pytest
-from pytest import MonkeyPatch
 
-from .conftest import get_conftest_config
+from .conftest import get_config_snapshot, get_conftest_config
 from .generator import MetamorphicGenerator
-from .metamorphic_error import InvalidInputError, SkippedMTC
+from .logger import logger
+from .metamorphic_error import InvalidInputError, SkippedMTC, ErrorMode
+from .metamorphic_relation import MetamorphicRelation
 from .metamorphic_test_case import MetamorphicTestCase
 from .metamorphic_test_suite import MetamorphicTestSuite
-from .testcase_queue import InputQueue, InputQueueItem
+from .sut_executor import IsolatedSUTExecutor, ThreadedSUTExecutor
+from .testcase_chunk import MetamorphicTestCaseChunk, parse_granularity
+from .testcase_executor import ThreadedTestCaseExecutor
 from .types import Input, System, Transform, GeneralTransform, Relation, GeneralRelation, MR_ID
-from .utils.sut_loader import get_sut
-from .utils.wrong_skip_method_used import wrong_skip_method_used
+from .utils.prefetcher import Prefetcher
+from .utils.sut_loader import get_sut, get_sut_pool
+from .utils.wrong_skip_method_used import install_skip_guard
 
 A = TypeVar('A')
 
@@ -22,6 +26,9 @@ GeneralRelationWrapper = Callable[[GeneralRelation], GeneralRelation]
 InputWrapper = Callable[[Input], Input]
 SystemWrapper = Callable[[System], System]
 
+# user code of metamorphic test cases must call gmt.skip instead of pytest.skip
+install_skip_guard()
+
 
 def _get_metamorphic_relation_ids(*mr_ids: MR_ID) -> List[MR_ID]:
     """
@@ -43,8 +50,7 @@ def _get_metamorphic_relation_ids(*mr_ids: MR_ID) -> List[MR_ID]:
         return list(mr_ids)
 
     module_name = MetamorphicTestSuite().get_caller_module()
-    return [mr_id for mr_id in MetamorphicTestSuite().get_metamorphic_relations() if
-            module_name in mr_id]  # type: ignore # noqa
+    return MetamorphicTestSuite().get_module_metamorphic_relation_ids(module_name)
 
 
 def transformation(*mr_ids: MR_ID) -> TransformWrapper:
@@ -294,9 +300,184 @@ def general_relation(*mr_ids: MR_ID) -> GeneralRelationWrapper:
     return wrapper
 
 
+def evaluate_test_case(mtc: MetamorphicTestCase):
+    """
+    Turns the outcome of an executed metamorphic test case into the outcome of its pytest.
+    """
+    if mtc.error and isinstance(mtc.error, (InvalidInputError, SkippedMTC)):
+        pytest.skip(mtc.error.message)
+
+    if mtc.error:
+        pytest.fail(f"{type(mtc.error).__name__}: {mtc.error.message}", pytrace=False)
+
+    try:
+        assert mtc.relation_result
+    except AssertionError:
+        pytest.fail("The Metamorphic Relation does not hold for this "
+                    "Metamorphic Test Case", pytrace=False)
+
+
+# the number of failing test cases listed in the failure message of a chunk
+MAX_LISTED_FAILURES = 20
+
+
+def evaluate_test_case_chunk(chunk: MetamorphicTestCaseChunk):
+    """
+    Turns the outcomes of the executed metamorphic test cases of a chunk into the outcome
+    of its pytest. The pytest fails if any test case failed and is skipped if all test
+    cases were skipped.
+    """
+    failures = []
+    chunk.outcomes = []
+    for index, mtc in enumerate(chunk.test_cases):
+        try:
+            evaluate_test_case(mtc)
+            chunk.outcomes.append("passed")
+        except pytest.skip.Exception:
+            chunk.outcomes.append("skipped")
+        except pytest.fail.Exception as e:
+            chunk.outcomes.append("failed")
+            failures.append(f"{chunk.mtc_name(index)}: {e.msg}")
+
+    if failures:
+        summary = failures[:MAX_LISTED_FAILURES]
+        if len(failures) > MAX_LISTED_FAILURES:
+            summary.append(f"... and {len(failures) - MAX_LISTED_FAILURES} more")
+        pytest.fail(f"{len(failures)} of {len(chunk.outcomes)} metamorphic test cases "
+                    f"failed:\n" + "\n".join(summary), pytrace=False)
+    if chunk.outcomes and all(outcome == "skipped" for outcome in chunk.outcomes):
+        pytest.skip("All metamorphic test cases were skipped")
+
+
+def execute_test_cases(mr: MetamorphicRelation, sut_id: str,
+                       test_cases: Sequence[MetamorphicTestCase]):
+    """
+    Executes metamorphic test cases of a materialized metamorphic relation, on the threads
+    of its test case executor if the system under test has one.
+    """
+    executor = mr.test_case_executors.get(sut_id)
+    if executor is not None:
+        executor.execute(mr, sut_id, test_cases)
+    else:
+        for test_case in test_cases:
+            mr.execute_test_case(test_case, sut_id)
+
+
+def run_test_case(mr: MetamorphicRelation, sut_id: str,
+                  mtc: Union[MetamorphicTestCase, MetamorphicTestCaseChunk]):
+    """
+    Executes and evaluates a metamorphic test case or a chunk of metamorphic test cases.
+    Lazy metamorphic relations are materialized before their first chunk is executed.
+    """
+    mr.materialize()
+    test_cases = mtc.test_cases if isinstance(mtc, MetamorphicTestCaseChunk) else [mtc]
+    execute_test_cases(mr, sut_id, test_cases)
+
+    if isinstance(mtc, MetamorphicTestCaseChunk):
+        evaluate_test_case_chunk(mtc)
+    else:
+        evaluate_test_case(mtc)
+
+
+def _create_sut_executor(sut_function: System, **kwargs):
+    """
+    Creates the executor for a system under test, if the system under test should not be
+    called in the test process itself.
+    """
+    config = get_config_snapshot()
+    timeout = kwargs.get("timeout", config.get("sut_timeout"))
+    if kwargs.get("isolated", config.get("isolate")):
+        return IsolatedSUTExecutor(
+            sut_function,
+            initializer=kwargs.get("worker_initializer"),
+            max_batches=kwargs.get("max_batches_per_worker",
+                                   config.get("max_batches_per_worker")),
+            max_rss=kwargs.get("max_worker_rss", config.get("max_worker_rss")),
+            timeout=timeout,
+        )
+    if timeout is not None:
+        return ThreadedSUTExecutor(sut_function, timeout, config=config)
+    return None
+
+
+def _create_prefetcher(**kwargs) -> Optional[Prefetcher]:
+    """
+    Creates the prefetcher loading upcoming inputs of a system under test with a
+    data_loader in the background, if a prefetch depth is set.
+    """
+    config = get_config_snapshot()
+    depth = kwargs.get("prefetch_depth", config.get("prefetch_depth"))
+    if not kwargs.get("data_loader") or not depth:
+        return None
+    return Prefetcher(depth, kwargs.get("prefetch_workers", config.get("prefetch_workers")))
+
+
+def _create_test_case_executor(**kwargs) -> Optional[ThreadedTestCaseExecutor]:
+    """
+    Creates the executor running the test cases of a pytest item on threads, if more than
+    one thread is configured.
+    """
+    config = get_config_snapshot()
+    threads = kwargs.get("threads", config.get("threads"))
+    if not threads or threads == 1:
+        return None
+    return ThreadedTestCaseExecutor(threads, config=config)
+
+
+def _chunk_size(**kwargs) -> int:
+    """
+    Returns the number of metamorphic test cases executed by each pytest item.
+    """
+    granularity = kwargs.get("granularity")
+    if granularity is not None:
+        return parse_granularity(granularity)
+    chunk_size = get_conftest_config().get("granularity")
+    return chunk_size if chunk_size is not None else 1
+
+
+def _param_id(mr: MetamorphicRelation, sut_id: str, mtc_name: str, short: bool) -> str:
+    """
+    Returns the pytest id of the metamorphic test cases named mtc_name. Short ids consist
+    of the index of the metamorphic relation and of the system under test, i.e. the MTC
+    identity, instead of their names.
+    """
+    if short:
+        sut_index = list(mr.system_under_test).index(sut_id)
+        return f"{mr.index}.{sut_index}.{mtc_name}"
+    return f"sut_id={sut_id}, mr_id={mr.mr_id}, mtc={mtc_name}"
+
+
+def register_system_under_test(sut_function: System, metamorphic_relation_ids: List[MR_ID],
+                               **kwargs):
+    """
+    Registers a system under test on metamorphic relations and prepares its test cases,
+    with the keyword arguments of system_under_test.
+    """
+    sut_id = sut_function.__name__
+    sut_executor = _create_sut_executor(sut_function, **kwargs)
+    prefetcher = _create_prefetcher(**kwargs)
+    test_case_executor = _create_test_case_executor(**kwargs)
+
+    for mr_id in metamorphic_relation_ids:
+        mr = MetamorphicTestSuite().get_metamorphic_relation(mr_id)
+        mr.system_under_test = sut_function
+        batch_size = kwargs.get("batch_size") if kwargs.get("batch_size") \
+            else get_conftest_config().get("batch_size")
+        mr.sut_batch_size[sut_id] = int(batch_size) if batch_size is not None else None
+        if sut_executor is not None:
+            mr.sut_executors[sut_id] = sut_executor
+        if prefetcher is not None:
+            mr.prefetchers[sut_id] = prefetcher
+        if test_case_executor is not None:
+            mr.test_case_executors[sut_id] = test_case_executor
+        mr.on_error = get_conftest_config().get("on_error") or ErrorMode.EXIT
+        mr.prepare_sut(sut_id, kwargs.get("data_loader", None))
+
+
 def sut_wrapper(sut_function: System, test_mtc, *mr_ids, **kwargs) -> System:
     metamorphic_relation_ids = _get_metamorphic_relation_ids(*mr_ids)
     sut_id = sut_function.__name__
+    chunk_size = _chunk_size(**kwargs)
 
     def get_mtcs_for_mr_sut(
             mr_id_inner: MR_ID,
@@ -305,30 +486,32 @@ def sut_wrapper(sut_function: System, test_mtc, *mr_ids, **kwargs) -> System:
         metamorphic_relation = MetamorphicTestSuite().get_metamorphic_relation(mr_id_inner)
         return metamorphic_relation.test_cases[sut_id_inner]
 
+    register_system_under_test(sut_function, metamorphic_relation_ids, **kwargs)
+
+    # Prepare the parameterized markers for pytest, the test cases of lazy metamorphic
+    # relations are not known yet and are executed by a single test
+    short_ids = get_conftest_config().get("ids") == "short"
+    markers = []
     for mr_id in metamorphic_relation_ids:
         mr = MetamorphicTestSuite().get_metamorphic_relation(mr_id)
-        mr.system_under_test = sut_function
-        mr.q_ready[sut_id] = InputQueue(
-            InputQueueItem(tc, i, is_source=True)
-            for tc in get_mtcs_for_mr_sut(mr_id, sut_id)
-            for i, _ in enumerate(tc.source_inputs)
+        if mr.is_lazy:
+            markers.append(pytest.param(sut_id, mr_id, MetamorphicTestCaseChunk(mr, sut_id),
+                                        id=_param_id(mr, sut_id, "lazy", short_ids)))
+            continue
+        if chunk_size != 1:
+            markers.extend(
+                pytest.param(sut_id, mr_id, chunk,
+                             id=_param_id(mr, sut_id, chunk.name, short_ids))
+                for chunk in MetamorphicTestCaseChunk.split(mr, sut_id, chunk_size)
+            )
+            continue
+        markers.extend(
+            pytest.param(sut_id, mr_id, mtc,
+                         id=_param_id(mr, sut_id, mtc.identity.mtc_name, short_ids))
+            for mtc in get_mtcs_for_mr_sut(mr_id, sut_id)
         )
-        batch_size = kwargs.get("batch_size") if kwargs.get("batch_size") \
-            else get_conftest_config().get("batch_size")
-        mr.sut_batch_size[sut_id] = int(batch_size) if batch_size is not None else None
-
-        for mtc in get_mtcs_for_mr_sut(mr_id, sut_id):
-            mtc.data_loader = kwargs.get("data_loader", None)
 
-    # Prepare the parameterized markers for pytest
-    markers = [
-        pytest.param(sut_id, mr_id, mtc,
-                     id=f"sut_id={sut_id}, mr_id={mr_id}, mtc=mtc_{index}")
-        for mr_id in metamorphic_relation_ids
-        for index, mtc in enumerate(get_mtcs_for_mr_sut(mr_id, sut_id), start=1)
-    ]
-
-    return pytest.mark.metamorphic_relation(
+    test_function = pytest.mark.metamorphic_relation(
         visualize_input=kwargs.get('visualize_input', None),
         visualize_output=kwargs.get('visualize_output', None),
         data_exporter=kwargs.get('data_exporter', None),
@@ -336,6 +519,9 @@ def sut_wrapper(sut_function: System, test_mtc, *mr_ids, **kwargs) -> System:
     )(
         pytest.mark.parametrize(("sut_id", "mr_id", "mtc"), markers)(test_mtc)
     )
+    # the test function replaces the SUT in its module, isolated workers find it here
+    test_function.gemtest_sut = sut_function  # type: ignore
+    return test_function
 
 
 def system_under_test(*mr_ids: MR_ID, **kwargs) -> SystemWrapper:
@@ -379,6 +565,50 @@ def system_under_test(*mr_ids: MR_ID, **kwargs) -> SystemWrapper:
     data_exporter:
         A function that exports data. The data should be stored under assets/data.
 
+    timeout:
+        The maximum number of seconds a single call (or batch) of the system under test
+        may take. The metamorphic test cases of a call over budget fail with a
+        SUTTimeoutError, which stops the session unless --gmt-on-error=continue is set.
+        Cooperative SUTs are interrupted, isolated workers are killed.
+        Defaults to --gmt-sut-timeout.
+
+    isolated:
+        Runs the system under test in a supervised worker process. A crash of the worker,
+        e.g. a segfault in native code, fails the metamorphic test cases of the current
+        batch with a SUTCrashError and the worker is restarted. Like a timeout, the crash
+        stops the session unless --gmt-on-error=continue is set. Defaults to --gmt-isolate.
+
+    worker_initializer:
+        A function called in every (re)started isolated worker, e.g. to load a model.
+
+    max_batches_per_worker:
+        Recycles the isolated worker after this number of batches.
+        Defaults to --gmt-max-batches-per-worker.
+
+    max_worker_rss:
+        Recycles the isolated worker once its resident set size exceeds this number of
+        megabytes. Defaults to --gmt-max-worker-rss.
+
+    prefetch_depth:
+        Loads the inputs of the next prefetch_depth batches with the data_loader in the
+        background while the system under test runs. Defaults to --gmt-prefetch-depth.
+
+    prefetch_workers:
+        The number of threads loading inputs in the background.
+        Defaults to --gmt-prefetch-workers.
+
+    threads:
+        The number of threads executing the metamorphic test cases of a pytest item with
+        a granularity of "chunk:N" or "mr". Each thread executes a contiguous part of the
+        test cases, so the system under test must be thread-safe.
+        Defaults to --gmt-threads.
+
+    granularity:
+        The metamorphic test cases executed by each pytest item: "mtc" for one, "chunk:N"
+        for N or "mr" for all test cases of a metamorphic relation. Items of multiple
+        test cases fail with a summary of their failing test cases, the reports still
+        contain every test case. Defaults to --gmt-granularity.
+
     Returns
     -------
     SUT Output:
@@ -428,18 +658,7 @@ def system_under_test(*mr_ids: MR_ID, **kwargs) -> SystemWrapper:
         The actual test function that is executed for each Metamorphic Test Case
         """
         mr = MetamorphicTestSuite().get_metamorphic_relation(mr_id)
-        with MonkeyPatch().context() as monkeypatch:
-            monkeypatch.setattr(pytest, "skip", wrong_skip_method_used)
-            mr.execute_test_case(mtc, sut_id)
-
-        if mtc.error and isinstance(mtc.error, (InvalidInputError, SkippedMTC)):
-            pytest.skip(mtc.error.message)
-
-        try:
-            assert mtc.relation_result
-        except AssertionError:
-            pytest.fail("The Metamorphic Relation does not hold for this "
-                        "Metamorphic Test Case", pytrace=False)
+        run_test_case(mr, sut_id, mtc)
 
     def wrapper(sut_function: System) -> System:
         return sut_wrapper(sut_function, test_mtc, *mr_ids, **kwargs)
@@ -462,8 +681,14 @@ def systems_under_test_dynamic(*mr_ids: MR_ID, **kwargs) -> SystemWrapper:
 
     sut_class:
         The class name of the SUT inside the file as defined by sut_filepath.
-        The only limitation is that the SUT class
-        can be instantiated using an empty constructor, e.g., SUT().
+        The SUT class is instantiated once per process and constructor arguments, e.g.,
+        SUT(), and the instance is shared by all decorated test modules.
+
+    sut_args:
+        Optional tuple of positional arguments passed to the SUT constructor.
+
+    sut_kwargs:
+        Optional dict of keyword arguments passed to the SUT constructor.
 
     <mr1_name, mr2_name, …>:
         The names of the metamorphic relations to which this system under test is applied.
@@ -496,12 +721,37 @@ def systems_under_test_dynamic(*mr_ids: MR_ID, **kwargs) -> SystemWrapper:
     data_exporter:
         A function that exports data. The data should be stored under assets/data.
 
+    timeout:
+        The maximum number of seconds a single call (or batch) may take, see
+        system_under_test.
+
+    isolated, worker_initializer, max_batches_per_worker, max_worker_rss:
+        Run the system under test in a supervised worker process, see system_under_test.
+
+    prefetch_depth, prefetch_workers:
+        Load upcoming inputs in the background, see system_under_test.
+
+    granularity:
+        The metamorphic test cases executed by each pytest item, see system_under_test.
+
+    threads:
+        The number of threads executing the test cases of an item, see system_under_test.
+        The SUT class is then instantiated once per thread, and every call takes an instance
+        from this pool that no other thread uses at the time.
+
     Returns
     -------
     SUT Output:
         The Dynamic System Under Test will take a single source or follow-up input
         and return the source or follow-up outputs.
 
+    Notes
+    -----
+    With the --sut_endpoint command line option, calls on the SUT are forwarded to the SUT
+    instance kept resident by a running gemtest-sut-server instead of loading the SUT in
+    the test process. The server constructs the SUT, so sut_args and sut_kwargs are not
+    used.
+
     See Also
     --------
     MetamorphicRelation:
@@ -534,26 +784,34 @@ def systems_under_test_dynamic(*mr_ids: MR_ID, **kwargs) -> SystemWrapper:
     if not get_conftest_config().get("is_sut_dynamic_active"):
         return lambda *_, **__: lambda: pytest.skip("No sut_dynamic is set.")
 
-    sut_dynamic = get_sut()
+    threads = kwargs.get("threads", get_conftest_config().get("threads"))
+    sut_dynamic = None
+    sut_pool = None
+    if get_conftest_config().get("sut_endpoint"):
+        # imported here, unix sockets are not available on every platform
+        from .utils.sut_server import RemoteSUT  # noqa
+        if "sut_args" in kwargs or "sut_kwargs" in kwargs:
+            logger.warning("sut_args and sut_kwargs of %s are ignored, the SUT is "
+                           "constructed by the SUT server at --sut_endpoint.",
+                           ", ".join(map(str, mr_ids)))
+        sut_dynamic = RemoteSUT(get_conftest_config()["sut_endpoint"])
+    elif threads and threads > 1:
+        # the threads executing the test cases each call a SUT instance of their own
+        sut_pool = get_sut_pool(threads, *kwargs.get("sut_args", ()),
+                                **kwargs.get("sut_kwargs", {}))
+    else:
+        sut_dynamic = get_sut(*kwargs.get("sut_args", ()), **kwargs.get("sut_kwargs", {}))
 
     def test_mtc(sut_id: str, mr_id: MR_ID, mtc: MetamorphicTestCase):
         """
         The actual test function that is executed for each Metamorphic Test Case
         """
         mr = MetamorphicTestSuite().get_metamorphic_relation(mr_id)
-        mr.sut_function_kwargs["dynamic_sut"] = sut_dynamic
-        with MonkeyPatch().context() as monkeypatch:
-            monkeypatch.setattr(pytest, "skip", wrong_skip_method_used)
-            mr.execute_test_case(mtc, sut_id)
-
-        if mtc.error and isinstance(mtc.error, (InvalidInputError, SkippedMTC)):
-            pytest.skip(mtc.error.message)
-
-        try:
-            assert mtc.relation_result
-        except AssertionError:
-            pytest.fail("The Metamorphic Relation does not hold for this "
-                        "Metamorphic Test Case", pytrace=False)
+        if sut_pool is not None:
+            mr.sut_pools[sut_id] = sut_pool
+        else:
+            mr.sut_function_kwargs["dynamic_sut"] = sut_dynamic
+        run_test_case(mr, sut_id, mtc)
 
     def wrapper(sut_function: System) -> System:
         return sut_wrapper(sut_function, test_mtc, *mr_ids, **kwargs)
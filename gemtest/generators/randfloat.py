@@ -1,6 +1,5 @@
-import random
-
 from gemtest.generator import MetamorphicGenerator
+from gemtest.utils.rng import get_rng
 
 
 class RandFloat(MetamorphicGenerator[float]):
@@ -25,4 +24,4 @@ class RandFloat(MetamorphicGenerator[float]):
         Returns a random floating point value from the closed interval
         [self.min_value, self.max_value].
         """
-        return random.uniform(self.min_value, self.max_value)  # nosec
+        return get_rng().uniform(self.min_value, self.max_value)  # nosec
@@ -1,6 +1,5 @@
-import random
-
 from gemtest.generator import MetamorphicGenerator
+from gemtest.utils.rng import get_rng
 
 
 class RandInt(MetamorphicGenerator[int]):
@@ -24,4 +23,4 @@ class RandInt(MetamorphicGenerator[int]):
         """
         Returns a random integer from the closed interval [self.min_value, self.max_value].
         """
-        return random.randint(self.min_value, self.max_value)  # nosec
+        return get_rng().randint(self.min_value, self.max_value)  # nosec
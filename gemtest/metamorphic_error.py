@@ -1,6 +1,21 @@
 import abc
 
 
+class ErrorMode:
+    """
+    Behaviour on errors raised by user code, i.e. the system under test, a transformation
+    or a relation.
+
+    EXIT:
+        Stops the whole test session on the first error.
+    CONTINUE:
+        Attaches the error to the affected metamorphic test cases only, which are reported
+        as errors, and continues with the remaining metamorphic test cases.
+    """
+    EXIT = 'exit'
+    CONTINUE = 'continue'
+
+
 class MetamorphicRelationError(Exception, metaclass=abc.ABCMeta):
     def __init__(self, message, original_exception: Exception = None):
         self.message = message
@@ -11,6 +26,14 @@ class SUTExecutionError(MetamorphicRelationError):
     pass
 
 
+class SUTCrashError(SUTExecutionError):
+    pass
+
+
+class SUTTimeoutError(SUTExecutionError):
+    pass
+
+
 class TransformationError(MetamorphicRelationError):
     pass
 
@@ -1,18 +1,36 @@
 import copy
 import math
 import random
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from itertools import product, combinations
-from typing import List, Dict, Optional, Sequence, Any
+from typing import List, Dict, Optional, Iterable, Sequence, Sized, Any, Callable, \
+    Iterator, TYPE_CHECKING
 
+from .data.lazy import LazyData
+from .data.sampling import reservoir_sample, reservoir_samples
 from .logger import logger
 from .metamorphic_error import MetamorphicRelationError, SUTExecutionError, \
-    TransformationError, RelationError, InvalidInputError, SkippedMTC
-from .metamorphic_test_case import MetamorphicTestCase, UninitializedValue
+    TransformationError, RelationError, InvalidInputError, SkippedMTC, SUTCrashError, \
+    SUTTimeoutError, ErrorMode
+from .metamorphic_test_case import MetamorphicTestCase, MTCIdentity, UninitializedValue
 from .report.execution_report import GeneralMTCExecutionReport
 from .testcase_queue import InputQueue, InputQueueItem
 from .testing_strategy import TestingStrategy
 from .types import Input, Transform, GeneralTransform, Relation, GeneralRelation, MR_ID
+from .utils.prefetcher import Prefetcher
+from .utils.rng import use_rng
+from .utils.wrong_skip_method_used import prohibit_pytest_skip
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .checkpoint import Checkpoint
+    from .collection_cache import CollectionCache
+    from .columnar import ColumnarStore
+    from .testcase_executor import ThreadedTestCaseExecutor
+    from .utils.sut_loader import SUTPool
 
 
 @dataclass
@@ -22,7 +40,7 @@ class MetamorphicRelation:
     the functionality to create metamorphic test cases and execute them.
     """
     mr_id: MR_ID
-    data: Sequence
+    data: Iterable
     testing_strategy: str
     number_of_test_cases: int
     number_of_sources: int
@@ -36,11 +54,83 @@ class MetamorphicRelation:
     valid_input: List[Input] = field(default_factory=list)
     sut_parameters: Dict = field(default_factory=dict)
     sut_function_kwargs: Dict = field(default_factory=dict)
+    sut_executors: Dict = field(default_factory=dict)
+    """ Mapping between a sut_id and the executor running it out of process """
+    sut_pools: Dict[str, "SUTPool"] = field(default_factory=dict)
+    """ Mapping between a dynamic sut_id and the pool of SUT instances its threads call """
+    prefetchers: Dict[str, Prefetcher] = field(default_factory=dict)
+    """ Mapping between a sut_id and the prefetcher loading its upcoming inputs """
+    on_error: str = ErrorMode.EXIT
+    """ Whether errors in user code stop the session or only fail the affected MTCs """
 
     sut_batch_size: Dict = field(default_factory=dict)
     """ Mapping between a sut_id and it's batch size """
     q_ready: Dict[str, InputQueue] = field(default_factory=dict)
     """ Queue for each SUT containing testcase inputs that are ready to be processed """
+    sut_data_loaders: Dict = field(default_factory=dict)
+    """ Mapping between a sut_id and the data loader of its source inputs """
+    collection_cache: Optional["CollectionCache"] = None
+    """ Persists the template index of exhaustive relations across runs, if enabled """
+    columnar: bool = False
+    """ Whether the test cases are stored in a ColumnarStore instead of one object each """
+    template_store: Optional["ColumnarStore"] = None
+    """ The columnar store holding the MTC templates of a columnar relation """
+    completion_callbacks: List[Callable[[MetamorphicTestCase, str, bool], None]] = \
+        field(default_factory=list)
+    """ Called with an MTC, the sut_id and is_source when all source outputs (ready for
+    transformation) or all follow-up outputs (ready for the relation) of the MTC are set """
+    name: str = ""
+    """ The name of the metamorphic relation within its module """
+    index: int = -1
+    """ The index of the metamorphic relation in the suite, part of the MTC identities """
+    test_case_executors: Dict[str, "ThreadedTestCaseExecutor"] = field(default_factory=dict)
+    """ Mapping between a sut_id and the executor running its test cases on threads """
+    checkpoint: Optional["Checkpoint"] = None
+    """ Persists finished MTCs and SUT outputs of unfinished MTCs to resume a run """
+    _thread_state: threading.local = field(default_factory=threading.local, repr=False,
+                                           compare=False)
+    """ The ready queues of the worker thread executing test cases, see thread_queue """
+
+    @property
+    def is_lazy(self) -> bool:
+        """
+        Whether the data of the metamorphic relation is created by a factory that has not
+        been called yet. Lazy metamorphic relations have no test cases until materialized.
+        """
+        return isinstance(self.data, LazyData)
+
+    def materialize(self) -> None:
+        """
+        Creates the data of a lazy metamorphic relation, generates its test cases and
+        prepares all registered systems under test. Does nothing for other relations.
+        """
+        if not self.is_lazy:
+            return
+        self.data = self.data.load()
+        self.generate_test_cases()
+        for sut_id in self.system_under_test:
+            self.test_cases[sut_id] = self._copy_mtc_templates(sut_id)
+            self.prepare_sut(sut_id, self.sut_data_loaders.get(sut_id))
+
+    def prepare_sut(self, sut_id: str, data_loader: Optional[Callable] = None) -> None:
+        """
+        Sets the data loader of the test cases of a registered system under test and
+        queues their source inputs. Test cases that are finished in the checkpoint are
+        restored instead. For lazy metamorphic relations, this is deferred until the
+        relation is materialized.
+        """
+        self.sut_data_loaders[sut_id] = data_loader
+        if self.is_lazy:
+            return
+        for mtc in self.test_cases[sut_id]:
+            mtc.data_loader = data_loader
+        # finished test cases of a resumed run are not executed again
+        restored = self.checkpoint.restore(self, sut_id) if self.checkpoint else set()
+        self.q_ready[sut_id] = InputQueue(
+            InputQueueItem(mtc, i, is_source=True)
+            for index, mtc in enumerate(self.test_cases[sut_id]) if index not in restored
+            for i in range(mtc.number_of_source_inputs)
+        )
 
     def create_parameter_permutations(self) -> List[Dict[str, Any]]:
         """
@@ -67,53 +157,220 @@ class MetamorphicRelation:
         in the provided data, if the provided data is empty, if the number of test cases
         requested is less than or equal to 0, or if the number of sources requested is
         less than or equal to 0.
+
+        Data without a length, e.g. a gmt.data.from_glob stream, is only iterated once.
+        Sample test cases are drawn with reservoir sampling and exhaustive test cases with a
+        single source are created while streaming the data.
+
+        The test cases of a checkpointed run are sampled as in the run that started the
+        checkpoint, whichever relations were generated before.
         """
+        rng = self.checkpoint.relation_rng(self.mr_id) if self.checkpoint is not None \
+            else random
+        if not isinstance(self.data, Sized):
+            self._generate_test_cases_from_stream(rng)
+            return
+
         if not self.data:
             raise ValueError(f"The provided data for {self.mr_id} is empty")
         if self.number_of_test_cases > self._calculate_possible_sources():
             raise ValueError(f"You want to run more test cases for {self.mr_id} than there "
                              f"are elements in the provided data")
-        if self.number_of_test_cases <= 0:
-            raise ValueError(f"Number of test cases for {self.mr_id} must be at least 1")
-        if self.number_of_sources <= 0:
-            raise ValueError(f"Number of sources for {self.mr_id} must be at least 1")
+        self._check_test_case_counts()
         if self.number_of_sources > len(self.data):
             raise ValueError(f"Number of sources for {self.mr_id} is larger than the number "
                              f"of elements in the provided dataset")
 
         parameter_permutations = self.create_parameter_permutations()
 
+        if self.columnar:
+            if isinstance(self.data, Sequence):
+                self._create_columnar_templates(parameter_permutations, rng)
+                return
+            logger.warning("Columnar storage of %s requires data that supports indexing, "
+                           "its test cases are stored as objects.", self.mr_id)
+
         if self.testing_strategy is TestingStrategy.SAMPLE:
             # create a specified number of sample MTCs from the provided data.
             for _ in range(self.number_of_test_cases):
-                source_input = random.sample(self.data, self.number_of_sources)
-                for parameter_permutation in parameter_permutations:
-                    mtc = MetamorphicTestCase()
-                    mtc.source_inputs = source_input
-                    mtc.parameters = parameter_permutation
-                    self.mtc_templates.append(mtc)
+                self._add_mtc_templates(rng.sample(self.data, self.number_of_sources),
+                                        parameter_permutations)
 
         elif self.testing_strategy is TestingStrategy.EXHAUSTIVE:
+            index = self._cached_template_index(parameter_permutations)
+            if index is not None:
+                self._add_mtc_templates_from_index(index, parameter_permutations)
+                return
             # create an MTC for all possible n-tuples from the provided data.
             source_inputs = [list(x) for x in combinations(self.data, self.number_of_sources)]
             for source_input in source_inputs:
-                for parameter_permutation in parameter_permutations:
-                    mtc = MetamorphicTestCase()
-                    mtc.source_inputs = source_input
-                    mtc.parameters = parameter_permutation
-                    self.mtc_templates.append(mtc)
+                self._add_mtc_templates(source_input, parameter_permutations)
 
-    def _calculate_possible_sources(self) -> float:
+    def _cached_template_index(self, parameter_permutations: List[Dict]) \
+            -> Optional["np.ndarray"]:
+        """
+        Returns the index of the exhaustive MTC templates, which is loaded from the
+        collection cache or created and stored in it. Returns None without a collection
+        cache and for data that can not be indexed or whose content can not be digested.
+        """
+        if self.collection_cache is None or not isinstance(self.data, Sequence):
+            return None
+        key = self.collection_cache.key(self.data, self.number_of_sources,
+                                        self.sut_parameters)
+        if key is None:
+            return None
+        index = self.collection_cache.load(key)
+        if index is None:
+            from .collection_cache import create_template_index
+
+            index = create_template_index(len(self.data), self.number_of_sources,
+                                          len(parameter_permutations))
+            self.collection_cache.save(key, index)
+        return index
+
+    def _template_index(self, parameter_permutations: List[Dict]) -> "np.ndarray":
+        """
+        Returns the compact index of the exhaustive MTC templates, from the collection
+        cache if it is enabled.
+        """
+        from .collection_cache import create_template_index
+
+        index = self._cached_template_index(parameter_permutations)
+        if index is None:
+            index = create_template_index(len(self.data), self.number_of_sources,
+                                          len(parameter_permutations))
+        return index
+
+    def _add_mtc_templates_from_index(self, index: "np.ndarray",
+                                      parameter_permutations: List[Dict]):
+        """
+        Adds the metamorphic test case templates of a template index, whose rows hold the
+        indices of the source inputs in the data and of the parameter permutation.
+        """
+        data = self.data
+        for row in index.tolist():
+            mtc = MetamorphicTestCase()
+            mtc.source_inputs = [data[i] for i in row[:-1]]
+            mtc.parameters = parameter_permutations[row[-1]]
+            self.mtc_templates.append(mtc)
+
+    def _create_columnar_templates(self, parameter_permutations: List[Dict],
+                                   rng: Any = random):
+        """
+        Creates the MTC templates as rows of a ColumnarStore, which only holds the indices
+        of the source inputs in the data and of the parameter permutations. Sample test
+        cases are drawn with rng, the random module or a random.Random instance.
+        """
+        import numpy as np
+
+        from .collection_cache import expand_template_index
+        from .columnar import ColumnarStore
+
+        if self.testing_strategy is TestingStrategy.EXHAUSTIVE:
+            index = self._template_index(parameter_permutations)
+        else:
+            # sampling indices draws the same source inputs as sampling the data
+            source_index = np.array(
+                [rng.sample(range(len(self.data)), self.number_of_sources)
+                 for _ in range(self.number_of_test_cases)], dtype=np.int64)
+            index = expand_template_index(source_index, len(parameter_permutations))
+        self.template_store = ColumnarStore.from_template_index(self.data, index,
+                                                                parameter_permutations)
+        self.mtc_templates = self.template_store.test_cases
+
+    def _copy_mtc_templates(self, sut_id: str) -> List:
+        """
+        Returns a copy of the MTC templates for a newly added system under test, with the
+        identities of the test cases set.
+        """
+        sut_index = list(self._system_under_test).index(sut_id)
+        if self.template_store is not None:
+            store = self.template_store.copy()
+            store.identity_prefix = (self.index, sut_index)
+            return store.test_cases
+        test_cases = copy.deepcopy(self.mtc_templates)
+        for mtc_index, mtc in enumerate(test_cases):
+            mtc.identity = MTCIdentity(self.index, sut_index, mtc_index)
+        return test_cases
+
+    @property
+    def display_name(self) -> str:
+        """
+        The name of the metamorphic relation, or its id if it was created without a name.
+        """
+        return self.name or self.mr_id
+
+    def _generate_test_cases_from_stream(self, rng: Any = random) -> None:
+        """
+        Generates the metamorphic test cases in a single pass over data without a length.
+        Only exhaustive testing with multiple sources needs all elements in memory. Sample
+        test cases are drawn with rng, the random module or a random.Random instance.
+        """
+        self._check_test_case_counts()
+        parameter_permutations = self.create_parameter_permutations()
+
+        if self.testing_strategy is TestingStrategy.SAMPLE:
+            if self.number_of_sources == 1:
+                sample, count = reservoir_sample(self.data, self.number_of_test_cases, rng)
+                source_inputs = [[element] for element in sample]
+            else:
+                source_inputs, count = reservoir_samples(
+                    self.data, self.number_of_test_cases, self.number_of_sources, rng)
+        elif self.number_of_sources == 1:
+            count = 0
+            for count, element in enumerate(self.data, start=1):
+                self._add_mtc_templates([element], parameter_permutations)
+            source_inputs = []
+        else:
+            data = list(self.data)
+            count = len(data)
+            source_inputs = [list(x) for x in combinations(data, self.number_of_sources)]
+
+        if count == 0:
+            raise ValueError(f"The provided data for {self.mr_id} is empty")
+        if self.number_of_sources > count:
+            raise ValueError(f"Number of sources for {self.mr_id} is larger than the number "
+                             f"of elements in the provided dataset")
+        if self.number_of_test_cases > self._calculate_possible_sources(count):
+            raise ValueError(f"You want to run more test cases for {self.mr_id} than there "
+                             f"are elements in the provided data")
+
+        for source_input in source_inputs:
+            self._add_mtc_templates(source_input, parameter_permutations)
+
+    def _check_test_case_counts(self):
+        if self.number_of_test_cases <= 0:
+            raise ValueError(f"Number of test cases for {self.mr_id} must be at least 1")
+        if self.number_of_sources <= 0:
+            raise ValueError(f"Number of sources for {self.mr_id} must be at least 1")
+
+    def _add_mtc_templates(self, source_input: List, parameter_permutations: List[Dict]):
+        """
+        Adds one metamorphic test case template per parameter permutation for the given
+        source inputs.
+        """
+        for parameter_permutation in parameter_permutations:
+            mtc = MetamorphicTestCase()
+            mtc.source_inputs = source_input
+            mtc.parameters = parameter_permutation
+            self.mtc_templates.append(mtc)
+
+    def _calculate_possible_sources(self, n: Optional[int] = None) -> float:
         """
         Calculate `C(n, r) = n! / (r! * (n - r)!)` with n as the number of elements in the
         data and r as the number of sources.
 
+        Parameters
+        ----------
+        n : Optional[int]
+            The number of elements in the data, defaults to the length of the data.
+
         Returns
         -------
         float
             The number of possible sources.
         """
-        n = len(self.data)
+        n = len(self.data) if n is None else n
         r = self.number_of_sources
         if r == 1:
             return n
@@ -154,31 +411,106 @@ class MetamorphicRelation:
             )
             test_case.error = invalid_input_error
 
+    def _exit_on_error(self, error: MetamorphicRelationError, exception: BaseException):
+        """
+        Stops the test session with the given error, unless the metamorphic relation
+        continues on errors. The error must already be attached to the affected MTCs.
+        """
+        if self.on_error == ErrorMode.CONTINUE:
+            return
+        raise SystemExit(error) from exception
+
+    def call_system_under_test(self, sut_id: str, inputs: Any) -> Any:
+        """
+        Calls the system under test with a single input or a batch of inputs. If an
+        executor is registered for the system under test, the call is delegated to it. A
+        dynamic system under test with a pool of SUT instances is called with an instance
+        acquired from the pool.
+        """
+        sut = self.sut_executors.get(sut_id, self.system_under_test[sut_id])
+        pool = self.sut_pools.get(sut_id)
+        if pool is None:
+            return sut(inputs, **self.sut_function_kwargs)
+        # no other thread calls the dynamic SUT instance while it is acquired
+        with pool.acquire() as dynamic_sut:
+            return sut(inputs, **{**self.sut_function_kwargs, "dynamic_sut": dynamic_sut})
+
+    def ready_queue(self, sut_id: str) -> InputQueue:
+        """
+        Returns the queue of inputs of the system under test that are executed by the
+        current thread, i.e. q_ready[sut_id] unless the thread uses its own queue.
+        """
+        queues = getattr(self._thread_state, "queues", None)
+        if queues is not None and sut_id in queues:
+            return queues[sut_id]
+        return self.q_ready[sut_id]
+
+    @contextmanager
+    def thread_queue(self, sut_id: str, queue: InputQueue) -> Iterator[InputQueue]:
+        """
+        Makes the current thread take the inputs of the system under test from queue and
+        add follow-up inputs to it, instead of the shared q_ready[sut_id]. A thread that
+        only executes the test cases whose inputs are in its own queue never touches the
+        test cases executed by other threads, also when it fills batches.
+        """
+        queues = getattr(self._thread_state, "queues", None)
+        if queues is None:
+            queues = self._thread_state.queues = {}
+        previous = queues.get(sut_id)
+        queues[sut_id] = queue
+        try:
+            yield queue
+        finally:
+            if previous is None:
+                del queues[sut_id]
+            else:
+                queues[sut_id] = previous
+
     def run_sut_batches(self, test_case: MetamorphicTestCase, sut_id: str, is_source: bool):
         batch_size = self.sut_batch_size[sut_id] if self.sut_batch_size[sut_id] else 1
 
-        q = self.q_ready[sut_id]
-        ran_items = []
+        q = self.ready_queue(sut_id)
+        completed_items = []
 
         while batch := q.get_all_with_testcase(test_case, is_source, batch_size):
             while len(q) and len(batch) < batch_size:
                 batch.append(q.popleft())
 
+            if self.checkpoint is not None:
+                batch = self._reuse_checkpoint_outputs(batch, sut_id, completed_items)
+                if not batch:
+                    continue
+
+            if sut_id in self.prefetchers:
+                prefetcher = self.prefetchers[sut_id]
+                prefetcher.prefetch(q.peek(prefetcher.depth * batch_size), batch_size)
+
             try:
                 if self.sut_batch_size[sut_id]:
                     assert not any(pa.test_case.parameters for pa in batch)
                     input_batch = [pa.get_input() for pa in batch]
-                    sut_kwargs = self.sut_function_kwargs
-                    results = self.system_under_test[sut_id](input_batch, **sut_kwargs)
+                    results = self.call_system_under_test(sut_id, input_batch)
                 else:
                     input_batch = batch[0].get_input()
-                    sut_kwargs = self.sut_function_kwargs
-                    results = [self.system_under_test[sut_id](input_batch, **sut_kwargs)]
+                    results = [self.call_system_under_test(sut_id, input_batch)]
 
                 for queue_item, result in zip(batch, results):
-                    queue_item.set_output(value=result)
-
-                ran_items.extend(batch)
+                    if queue_item.set_output(value=result):
+                        completed_items.append(queue_item)
+                if self.checkpoint is not None:
+                    self.checkpoint.add_outputs(self.mr_id, sut_id, batch, results)
+
+            # A crashed or timed out call only fails the current batch, if the relation
+            # continues on errors the remaining inputs are still executed
+            except (SUTCrashError, SUTTimeoutError) as e:
+                batch_error = type(e)(
+                    f"An error occurred on metamorphic relation {self.mr_id} while "
+                    f"applying the system under test {sut_id}. {e.message}",
+                    e,
+                )
+                for queue_item in batch:
+                    queue_item.test_case.error = batch_error
+                self._exit_on_error(batch_error, e)
 
             # Check specifically for a TypeError and add informative Error Message
             except TypeError as e:
@@ -188,13 +520,13 @@ class MetamorphicRelation:
                     f"Potential Issue: The SUT expects a different input type! "
                     f"Ensure that the @gmt.system_under_test() "
                     f"arguments are correctly used, "
-                    f"and that the transformation {self.transform.__name__} "
+                    f"and that the transformation {self.transformation_name} "
                     f"returns the correct type! "
                     f"Original error message: {e}"
                 )
                 for queue_item in batch:
                     queue_item.test_case.error = sut_error
-                raise SystemExit(sut_error) from e
+                self._exit_on_error(sut_error, e)
 
             except Exception as e:
                 sut_error = SUTExecutionError(
@@ -207,13 +539,39 @@ class MetamorphicRelation:
 
                 for queue_item in batch:
                     queue_item.test_case.error = sut_error
-                raise SystemExit(sut_error) from e
+                self._exit_on_error(sut_error, e)
 
-        for queue_item in ran_items:
-            if queue_item.test_case.missing_source_outputs > 0:
-                continue
-            self.check_valid_input(queue_item.test_case)
-            self.apply_transformation(queue_item.test_case, sut_id)
+        for queue_item in completed_items:
+            self.on_outputs_completed(queue_item.test_case, sut_id, queue_item.is_source)
+
+    def _reuse_checkpoint_outputs(self, batch: List[InputQueueItem], sut_id: str,
+                                  completed_items: List[InputQueueItem]) \
+            -> List[InputQueueItem]:
+        """
+        Sets the outputs of the inputs of a batch that are cached in the checkpoint and
+        returns the inputs that still have to be executed.
+        """
+        remaining = []
+        for queue_item in batch:
+            found, output = self.checkpoint.cached_output(self.mr_id, sut_id, queue_item)
+            if not found:
+                remaining.append(queue_item)
+            elif queue_item.set_output(value=output):
+                completed_items.append(queue_item)
+        return remaining
+
+    def on_outputs_completed(self, test_case: MetamorphicTestCase, sut_id: str,
+                             is_source: bool):
+        """
+        Called once all source or all follow-up outputs of the metamorphic test case are
+        set. Completed source outputs are validated and transformed, which queues the
+        follow-up inputs, then the completion callbacks are notified.
+        """
+        if is_source:
+            self.check_valid_input(test_case)
+            self.apply_transformation(test_case, sut_id)
+        for callback in self.completion_callbacks:
+            callback(test_case, sut_id, is_source)
 
     def create_source_outputs(self, test_case: MetamorphicTestCase, sut_id: str):
         """
@@ -234,7 +592,7 @@ class MetamorphicRelation:
                 e,
             )
             test_case.error = sut_error
-            raise SystemExit(sut_error) from e
+            self._exit_on_error(sut_error, e)
 
     def create_followup_outputs(self, test_case: MetamorphicTestCase, sut_id: str):
         """
@@ -255,7 +613,7 @@ class MetamorphicRelation:
                 e,
             )
             test_case.error = sut_error
-            raise SystemExit(sut_error) from e
+            self._exit_on_error(sut_error, e)
 
     @staticmethod
     def is_wrapped_result(result):
@@ -344,18 +702,23 @@ class MetamorphicRelation:
             raise ValueError(f"Can't add parameters for SUT when using @transformation "
                              f"on MR: {self.mr_id}")
 
+        # randomized parameters of a checkpointed run are drawn per test case, so they
+        # are the same when the run is resumed
+        rng = self.checkpoint.rng(self.mr_id, sut_id, test_case) if self.checkpoint else None
         try:
-            if self.transform:
-                result = self.transform(test_case.source_input)  # noqa
-                self._update_transformation_results(test_case, result)
+            with use_rng(rng):
+                if self.transform:
+                    result = self.transform(test_case.source_input)  # noqa
+                    self._update_transformation_results(test_case, result)
 
-            if self.general_transform:
-                result = self.general_transform(test_case)  # noqa
-                self._update_transformation_results(test_case, result)
+                if self.general_transform:
+                    result = self.general_transform(test_case)  # noqa
+                    self._update_transformation_results(test_case, result)
 
             if sut_id:
+                queue = self.ready_queue(sut_id)
                 for i, _ in enumerate(test_case.followup_inputs):
-                    self.q_ready[sut_id].append(InputQueueItem(test_case, i, is_source=False))
+                    queue.append(InputQueueItem(test_case, i, is_source=False))
         except SkippedMTC as e:
             test_case.error = e
         except Exception as e:
@@ -363,11 +726,11 @@ class MetamorphicRelation:
                 f"An error occurred on metamorphic "
                 f"relation {self.mr_id} while applying "
                 f"the transformation "
-                f"{self.transform.__name__}. "
+                f"{self.transformation_name}. "
                 f"Original error message: {e}",
                 e,
             )
-            raise SystemExit(test_case.error) from e
+            self._exit_on_error(test_case.error, e)
 
     def _update_relation_result(self, test_case: MetamorphicTestCase, result):
         """
@@ -421,19 +784,30 @@ class MetamorphicRelation:
         except Exception as e:
             relation_error = RelationError(f'An error occurred on metamorphic relation'
                                            f' {self.mr_id} while applying the relation. '
-                                           f'Original error message: {e}')
+                                           f'Original error message: {e}', e)
             test_case.error = relation_error
-            raise SystemExit(relation_error) from e
+            self._exit_on_error(relation_error, e)
 
-    def create_execution_report(self, test_case: MetamorphicTestCase) \
-            -> GeneralMTCExecutionReport:
+    def create_execution_report(self, test_case: MetamorphicTestCase,
+                                sut_id: Optional[str] = None) -> GeneralMTCExecutionReport:
         """
         Creates an execution report that contains the information for a string or html
-        report.
+        report. The report is identified by the identity of the test case.
         """
+        execution_report = GeneralMTCExecutionReport()
+        execution_report.identity = test_case.identity
+        execution_report.mr_name = self.display_name
+        if sut_id is not None:
+            execution_report.sut_name = sut_id
+        if test_case.identity is not None:
+            execution_report.mtc_name = test_case.identity.mtc_name
         try:
-            execution_report = GeneralMTCExecutionReport()
-            execution_report.source_inputs = test_case.source_inputs
+            source_input_paths = test_case.source_input_paths
+            if source_input_paths is not None:
+                execution_report.set_lazy_source_inputs(source_input_paths,
+                                                        test_case.data_loader)
+            else:
+                execution_report.source_inputs = test_case.source_inputs
             execution_report.followup_inputs = test_case.followup_inputs
             execution_report.source_outputs = test_case.source_outputs
             execution_report.followup_outputs = test_case.followup_outputs
@@ -443,22 +817,32 @@ class MetamorphicRelation:
             execution_report.relation_name = self.relation.__name__ if self.relation \
                 else self.general_relation.__name__
             execution_report.parameters = test_case.parameters
+            execution_report.error_type = type(test_case.error).__name__ if test_case.error \
+                else ""
         except Exception as e:
             execution_report_error = SUTExecutionError(
                 f"An error occurred while creating the execution report. "
-                f"Original Error Message: {e}"
+                f"Original Error Message: {e}", e
             )
-            raise SystemExit(execution_report_error) from e
+            if test_case.error is None:
+                test_case.error = execution_report_error
+            execution_report.error_type = type(test_case.error).__name__
+            self._exit_on_error(execution_report_error, e)
         return execution_report
 
     def execute_test_case(self, mtc: MetamorphicTestCase, sut_id: str):
         """
-        Executes a metamorphic test case.
+        Executes a metamorphic test case. Test cases restored from the checkpoint are
+        not executed again. pytest.skip is prohibited in the user code of the test case.
         """
+        if self.checkpoint is not None and self.checkpoint.is_restored(self.mr_id, sut_id,
+                                                                       mtc):
+            return
         try:
-            self.create_source_outputs(mtc, sut_id)
-            self.create_followup_outputs(mtc, sut_id)
-            self.apply_relation(mtc)
+            with prohibit_pytest_skip():
+                self.create_source_outputs(mtc, sut_id)
+                self.create_followup_outputs(mtc, sut_id)
+                self.apply_relation(mtc)
 
             if mtc.error:
                 raise mtc.error from mtc.error.original_exception
@@ -467,7 +851,9 @@ class MetamorphicRelation:
         except MetamorphicRelationError as e:
             logger.error(e)
         finally:
-            mtc.report = self.create_execution_report(mtc)
+            mtc.report = self.create_execution_report(mtc, sut_id)
+            if self.checkpoint is not None:
+                self.checkpoint.add_result(self, sut_id, mtc)
 
     @property
     def system_under_test(self):
@@ -483,7 +869,12 @@ class MetamorphicRelation:
         self._system_under_test[sut_id] = sut_function
 
         # create a copy of the mtc_templates for the newly added sut
-        self.test_cases[sut_id] = copy.deepcopy(self.mtc_templates)
+        self.test_cases[sut_id] = self._copy_mtc_templates(sut_id)
+
+    @property
+    def transformation_name(self) -> str:
+        transform = self.transform or self.general_transform
+        return transform.__name__ if transform else ""
 
     @property
     def transform(self):
@@ -1,10 +1,11 @@
 import copy
 import os
-from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Dict, Optional, Tuple, Callable, Any, TYPE_CHECKING
+from typing import List, Dict, Optional, Tuple, Callable, Any, NamedTuple, TYPE_CHECKING
 
+from .data.reference import resolve_references
 from .metamorphic_error import MetamorphicRelationError
+from .utils.resource_cache import get_resource_cache
 
 if TYPE_CHECKING:
     from .report.execution_report import GeneralMTCExecutionReport
@@ -17,87 +18,158 @@ class UninitializedValueClass(Enum):
 UninitializedValue = UninitializedValueClass.token
 
 
-@dataclass
-class MetamorphicTestCase:
+# shared placeholder of empty input and output lists, replaced by a list on first write
+_EMPTY: Tuple = ()
+
+_MISSING_COUNTERS = {
+    "_source_outputs": "_missing_source_outputs",
+    "_followup_outputs": "_missing_followup_outputs",
+}
+
+
+class MTCIdentity(NamedTuple):
     """
-    Holds one concrete metamorphic test case of a metamorphic relation. PyTests are executed on
-    instances of this class.
+    Identifies a metamorphic test case by the index of its metamorphic relation in the
+    suite, the index of its system under test in the metamorphic relation and its index
+    in the test cases of the metamorphic relation and system under test.
+    """
+    mr_index: int
+    sut_index: int
+    mtc_index: int
 
-    Parameters
-    ----------
-    data_loader : Callable
-        A function that takes a file path as input and returns the loaded resource.
+    @property
+    def mtc_name(self) -> str:
+        return f"mtc_{self.mtc_index + 1}"
+
+
+def _count_uninitialized(values) -> int:
+    return sum(1 for value in values if value is UninitializedValue)
+
+
+class BaseMetamorphicTestCase:
     """
-    _source_inputs: List = field(default_factory=list)
-    _followup_inputs: List = field(default_factory=list)
-    _source_outputs: List = field(default_factory=list)
-    _followup_outputs: List = field(default_factory=list)
-    _parameters: Dict = field(default_factory=dict)
-    _relation_result: bool = False
-    _report: Optional["GeneralMTCExecutionReport"] = None
-    _error: Optional[MetamorphicRelationError] = None
-    data_loader: Optional[Callable] = None
-    validated = False
-
-    def process_source_inputs(self):
-        """
-        Processes the source inputs by loading the specified image files and replacing the
-        file paths with the loaded image data. This function iterates over the source
-        inputs, checks if each input is a valid file, and if so, loads the resource using
-        the data_loader. The loaded resources are stored in the `source_inputs`
-        attribute of the object.
+    The behaviour shared by metamorphic test cases and the row views of a columnar test
+    case store. Subclasses provide the storage attributes read by the properties, i.e.
+    _source_inputs, _followup_inputs, _source_outputs, _followup_outputs, _parameters,
+    _relation_result, _report, _error, data_loader, validated, _source_inputs_checked and
+    identity, and implement _extend, _set_at and _missing.
+    """
+    __slots__ = ()
+
+    def _extend(self, name: str, values) -> None:
+        """
+        Appends the values to the input or output list stored as name.
+        """
+        raise NotImplementedError
+
+    def _set_at(self, name: str, index: int, value: Any) -> bool:
+        """
+        Replaces the value at index of the output list stored as name. Returns True if
+        this sets the last missing output of the list.
+        """
+        raise NotImplementedError
+
+    def _missing(self, name: str) -> int:
+        """
+        Returns the number of uninitialized values of the output list stored as name.
+        """
+        raise NotImplementedError
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None  # type: ignore
+
+    def _fields(self) -> Tuple:
+        return (list(self._source_inputs), list(self._followup_inputs),
+                list(self._source_outputs), list(self._followup_outputs),
+                self._parameters or {}, self._relation_result, self._report, self._error,
+                self.data_loader)
+
+    def __repr__(self):
+        return (f"{type(self).__name__}(_source_inputs={list(self._source_inputs)!r}, "
+                f"_followup_inputs={list(self._followup_inputs)!r}, "
+                f"_source_outputs={list(self._source_outputs)!r}, "
+                f"_followup_outputs={list(self._followup_outputs)!r}, "
+                f"_parameters={self._parameters or {}!r}, "
+                f"_relation_result={self._relation_result!r}, _report={self._report!r}, "
+                f"_error={self._error!r}, data_loader={self.data_loader!r})")
+
+    def process_source_inputs(self) -> List:
+        """
+        Returns the source inputs with file paths replaced by the resources loaded by the
+        data_loader. If any source input is not a path to an existing file, the source
+        inputs are returned unchanged and the data_loader is dropped. Loaded resources are
+        taken from the process-wide resource cache, so each file is only loaded once and
+        the memory used by loaded resources stays bounded.
+        """
+        if self.source_input_paths is None:
+            return self._source_inputs
+
+        cache = get_resource_cache()
+        return [cache.get(source_input, self.data_loader)
+                for source_input in self._source_inputs]
+
+    @property
+    def source_input_paths(self) -> Optional[List[str]]:
+        """
+        The file paths of the source inputs, if they are loaded lazily by the data_loader.
         """
         if not self.data_loader:
-            return
+            return None
 
-        loaded_source_inputs = []
-        for source_input in self._source_inputs:
-            if not isinstance(source_input, str):
-                return
-            if not os.path.isfile(source_input):
-                return
+        if not self._source_inputs_checked:
+            self._source_inputs_checked = True
+            if not all(isinstance(source_input, str) and os.path.isfile(source_input)
+                       for source_input in self._source_inputs):
+                self.data_loader = None
+                return None
 
-            loaded_resource = self.data_loader(source_input)
-            loaded_source_inputs.append(loaded_resource)
+        return list(self._source_inputs)
 
-        self.source_inputs = loaded_source_inputs
-        self.data_loader = None
+    @property
+    def number_of_source_inputs(self) -> int:
+        return len(self._source_inputs)
 
     @property
-    def missing_source_outputs(self):
-        return sum(1 for out in self._source_outputs if out is UninitializedValue)
+    def missing_source_outputs(self) -> int:
+        return self._missing("_source_outputs")
 
     @property
-    def missing_followup_outputs(self):
-        return sum(1 for out in self._followup_outputs if out is UninitializedValue)
+    def missing_followup_outputs(self) -> int:
+        return self._missing("_followup_outputs")
 
     @property
     def source_inputs(self):
-        self.process_source_inputs()
-        return copy.deepcopy(self._source_inputs)
+        if not self._source_inputs:
+            return []
+        return resolve_references(copy.deepcopy(self.process_source_inputs()))
 
     @source_inputs.setter
     def source_inputs(self, value):
+        self._source_inputs_checked = False
         if isinstance(value, List):
             self._source_inputs = value
             self._source_outputs = [UninitializedValue for _ in value]
         elif isinstance(value, Tuple):
-            self._source_inputs.extend(value)
-            self._source_outputs.extend(UninitializedValue for _ in value)
+            self._extend("_source_inputs", value)
+            self._extend("_source_outputs", [UninitializedValue for _ in value])
         else:
-            self._source_inputs.append(value)
-            self._source_outputs.append(UninitializedValue)
+            self._extend("_source_inputs", (value,))
+            self._extend("_source_outputs", (UninitializedValue,))
 
     @property
     def source_input(self):
         if len(self._source_inputs) == 1:
-            return copy.deepcopy(self._source_inputs[0])
+            return resolve_references(copy.deepcopy(self.process_source_inputs()))[0]
         raise ValueError('This Metamorphic Test Case has multiple source inputs use '
                          'MetamorphicTestCase.source_inputs to access them.')
 
     @property
     def followup_inputs(self):
-        return copy.deepcopy(self._followup_inputs)
+        return copy.deepcopy(self._followup_inputs) if self._followup_inputs else []
 
     @followup_inputs.setter
     def followup_inputs(self, value):
@@ -105,11 +177,11 @@ class MetamorphicTestCase:
             self._followup_inputs = value
             self._followup_outputs = [UninitializedValue for _ in value]
         elif isinstance(value, Tuple):
-            self._followup_inputs.extend(value)
-            self._followup_outputs.extend(UninitializedValue for _ in value)
+            self._extend("_followup_inputs", value)
+            self._extend("_followup_outputs", [UninitializedValue for _ in value])
         else:
-            self._followup_inputs.append(value)
-            self._followup_outputs.append(UninitializedValue)
+            self._extend("_followup_inputs", (value,))
+            self._extend("_followup_outputs", (UninitializedValue,))
 
     @property
     def followup_input(self):
@@ -120,19 +192,23 @@ class MetamorphicTestCase:
 
     @property
     def source_outputs(self):
-        return copy.deepcopy(self._source_outputs)
+        return copy.deepcopy(self._source_outputs) if self._source_outputs else []
 
     @source_outputs.setter
     def source_outputs(self, value):
         if isinstance(value, List):
             self._source_outputs = value
         elif isinstance(value, Tuple):
-            self._source_outputs.extend(value)
+            self._extend("_source_outputs", value)
         else:
-            self._source_outputs.append(value)
+            self._extend("_source_outputs", (value,))
 
-    def source_outputs_set_at(self, index: int, value: Any):
-        self._source_outputs[index] = value
+    def source_outputs_set_at(self, index: int, value: Any) -> bool:
+        """
+        Sets the source output at index. Returns True if this completes the source outputs,
+        i.e. the MTC is ready for transformation.
+        """
+        return self._set_at("_source_outputs", index, value)
 
     @property
     def source_output(self):
@@ -143,19 +219,23 @@ class MetamorphicTestCase:
 
     @property
     def followup_outputs(self):
-        return copy.deepcopy(self._followup_outputs)
+        return copy.deepcopy(self._followup_outputs) if self._followup_outputs else []
 
     @followup_outputs.setter
     def followup_outputs(self, value):
         if isinstance(value, List):
             self._followup_outputs = value
         elif isinstance(value, Tuple):
-            self._followup_outputs.extend(value)
+            self._extend("_followup_outputs", value)
         else:
-            self._followup_outputs.append(value)
+            self._extend("_followup_outputs", (value,))
 
-    def followup_outputs_set_at(self, index: int, value: Any):
-        self._followup_outputs[index] = value
+    def followup_outputs_set_at(self, index: int, value: Any) -> bool:
+        """
+        Sets the followup output at index. Returns True if this completes the followup
+        outputs, i.e. the MTC is ready for the relation.
+        """
+        return self._set_at("_followup_outputs", index, value)
 
     @property
     def followup_output(self):
@@ -177,12 +257,12 @@ class MetamorphicTestCase:
 
     @property
     def parameters(self):
-        return self._parameters.copy()
+        return self._parameters.copy() if self._parameters else {}
 
     @parameters.setter
     def parameters(self, value):
         if isinstance(value, dict):
-            self._parameters = value
+            self._parameters = value or None
         else:
             raise ValueError("parameters must be a dictionary")
 
@@ -201,3 +281,120 @@ class MetamorphicTestCase:
     @error.setter
     def error(self, value):
         self._error = value
+
+
+class MetamorphicTestCase(BaseMetamorphicTestCase):
+    """
+    Holds one concrete metamorphic test case of a metamorphic relation. PyTests are executed on
+    instances of this class.
+
+    Metamorphic test cases are created in large numbers, so they use __slots__ instead of
+    an instance dict and only allocate their input, output and parameter containers when
+    they are written.
+
+    Parameters
+    ----------
+    data_loader : Callable
+        A function that takes a file path as input and returns the loaded resource.
+        Source inputs that are file paths are loaded lazily through the process-wide
+        resource cache, so the metamorphic test case only holds the paths.
+
+    Source inputs that are data references, e.g. the rows of a memory-mapped dataset
+    created with gmt.data.from_npy, are resolved whenever the source inputs are accessed.
+
+    The identity of a test case is set when the test cases of a system under test are
+    created from the templates, templates have no identity.
+    """
+    __slots__ = (
+        "_source_inputs",
+        "_followup_inputs",
+        "_source_output_list",
+        "_followup_output_list",
+        "_missing_source_outputs",
+        "_missing_followup_outputs",
+        "_parameters",
+        "_relation_result",
+        "_report",
+        "_error",
+        "data_loader",
+        "validated",
+        "_source_inputs_checked",
+        "identity",
+    )
+
+    def __init__(self, _source_inputs: Optional[List] = None,  # noqa - too many arguments
+                 _followup_inputs: Optional[List] = None,
+                 _source_outputs: Optional[List] = None,
+                 _followup_outputs: Optional[List] = None,
+                 _parameters: Optional[Dict] = None,
+                 _relation_result: bool = False,
+                 _report: Optional["GeneralMTCExecutionReport"] = None,
+                 _error: Optional[MetamorphicRelationError] = None,
+                 data_loader: Optional[Callable] = None):
+        self._source_inputs: List = _source_inputs if _source_inputs is not None else _EMPTY
+        self._followup_inputs: List = _followup_inputs \
+            if _followup_inputs is not None else _EMPTY
+        self._source_outputs: List = _source_outputs if _source_outputs is not None else _EMPTY
+        self._followup_outputs: List = _followup_outputs \
+            if _followup_outputs is not None else _EMPTY
+        self._parameters: Optional[Dict] = _parameters
+        self._relation_result = _relation_result
+        self._report = _report
+        self._error = _error
+        self.data_loader = data_loader
+        self.validated = False
+        self._source_inputs_checked = False
+        self.identity: Optional[MTCIdentity] = None
+
+    def _writable(self, name: str) -> List:
+        """
+        Returns the list stored in the slot name, allocating it if it is still empty.
+        """
+        value = getattr(self, name)
+        if value is _EMPTY:
+            value = []
+            setattr(self, name, value)
+        return value
+
+    # The outputs are stored with the number of their uninitialized values, which is kept
+    # up to date by all writes, so that checking for missing outputs is O(1).
+
+    @property
+    def _source_outputs(self) -> List:
+        return self._source_output_list
+
+    @_source_outputs.setter
+    def _source_outputs(self, value: List):
+        self._source_output_list = value
+        self._missing_source_outputs = _count_uninitialized(value)
+
+    @property
+    def _followup_outputs(self) -> List:
+        return self._followup_output_list
+
+    @_followup_outputs.setter
+    def _followup_outputs(self, value: List):
+        self._followup_output_list = value
+        self._missing_followup_outputs = _count_uninitialized(value)
+
+    def _extend(self, name: str, values) -> None:
+        writable = self._writable(name)
+        if name in _MISSING_COUNTERS:
+            values = list(values)
+            counter = _MISSING_COUNTERS[name]
+            setattr(self, counter, getattr(self, counter) + _count_uninitialized(values))
+        writable.extend(values)
+
+    def _set_at(self, name: str, index: int, value: Any) -> bool:
+        values = self._writable(name)
+        change = (values[index] is UninitializedValue) - (value is UninitializedValue)
+        values[index] = value
+        if not change:
+            return False
+        counter = _MISSING_COUNTERS[name]
+        missing = getattr(self, counter) - change
+        setattr(self, counter, missing)
+        return missing == 0 and change > 0
+
+    def _missing(self, name: str) -> int:
+        return getattr(self, _MISSING_COUNTERS[name])
@@ -1,7 +1,8 @@
-import inspect
+import sys
+import threading
 from functools import wraps
 from pathlib import Path
-from typing import Dict, Union, TypeVar, Sequence
+from typing import Dict, List, Union, TypeVar, Iterable, Optional
 
 from .generator import MetamorphicGenerator
 from .metamorphic_relation import MetamorphicRelation
@@ -10,13 +11,30 @@ from .types import Transform, GeneralTransform, MR_ID
 A = TypeVar('A')
 METAMORPHIC_TEST_PACKAGE_PATH = Path(__file__).parent
 
+# maps the file names of code objects to whether they belong to the gemtest package
+_package_files: Dict[str, bool] = {}
+
+
+def _is_package_file(filename: str) -> bool:
+    is_package_file = _package_files.get(filename)
+    if is_package_file is None:
+        is_package_file = METAMORPHIC_TEST_PACKAGE_PATH in Path(filename).parents
+        _package_files[filename] = is_package_file
+    return is_package_file
+
 
 class MetamorphicTestSuite:
     """
-    A singleton class that holds all created metamorphic relations.
+    A singleton class that holds all created metamorphic relations. Creating the
+    singleton and adding metamorphic relations are thread-safe.
     """
 
+    _instance_lock = threading.Lock()
+
     _metamorphic_relations: Dict[MR_ID, MetamorphicRelation]
+    _module_index: Dict[str, Dict[MR_ID, None]]
+    _relation_ids: List[MR_ID]
+    _lock: threading.Lock
 
     def __new__(cls):
         """
@@ -26,10 +44,23 @@ class MetamorphicTestSuite:
         metamorphic_relations : Dict[MR_ID, MetamorphicRelation]
             A dictionary with keys as MR_ID and values as metamorphic relation
             to hold all the metamorphic relations within a single data structure.
+        module_index : Dict[str, Dict[MR_ID, None]]
+            The ids of the metamorphic relations of each module, in the order they were
+            added.
+        relation_ids : List[MR_ID]
+            The ids of all metamorphic relations ever added, the position of an id is the
+            index of the metamorphic relation in the MTC identities.
         """
         if not hasattr(cls, 'instance'):
-            cls.instance = super(MetamorphicTestSuite, cls).__new__(cls)
-            cls.instance._metamorphic_relations: Dict[MR_ID, MetamorphicRelation] = {}
+            with cls._instance_lock:
+                if not hasattr(cls, 'instance'):
+                    instance = super(MetamorphicTestSuite, cls).__new__(cls)
+                    instance._metamorphic_relations = {}
+                    instance._module_index = {}
+                    instance._relation_ids = []
+                    instance._lock = threading.Lock()
+                    # only publish the instance once it is initialized
+                    cls.instance = instance
         return cls.instance
 
     def get_metamorphic_relations(self) -> Dict[MR_ID, MetamorphicRelation]:
@@ -64,32 +95,80 @@ class MetamorphicTestSuite:
         """
         return self._metamorphic_relations[mr_id]
 
+    def get_metamorphic_relation_by_index(self, index: int) -> MetamorphicRelation:
+        """
+        Returns the metamorphic relation with the given index, e.g. the mr_index of an
+        MTC identity.
+
+        Parameters
+        ----------
+        index : int
+            The index of the metamorphic relation, in the order relations were added.
+
+        Returns
+        -------
+        metamorphic_relation : MetamorphicRelation
+            The metamorphic relation.
+        """
+        return self._metamorphic_relations[self._relation_ids[index]]
+
+    def get_module_metamorphic_relation_ids(self, module: str) -> List[MR_ID]:
+        """
+        Returns the ids of the metamorphic relations created in a module, without
+        looking at the metamorphic relations of other modules.
+
+        Parameters
+        ----------
+        module : str
+            The name of the module, e.g. as returned by get_caller_module.
+
+        Returns
+        -------
+        mr_ids : List[MR_ID]
+            The ids of the metamorphic relations of the module, in the order they were
+            added.
+        """
+        # the relations might have been removed from the suite since they were indexed
+        return [mr_id for mr_id in self._module_index.get(module, ())
+                if mr_id in self._metamorphic_relations]
+
     @staticmethod
-    def get_caller_module() -> str:
+    def get_caller_module(module: Optional[str] = None) -> str:
         """
-        A static method for getting the name of a test module.
+        A static method for getting the name of a test module, i.e. the module of the
+        innermost calling frame outside the gemtest package.
+
+        Parameters
+        ----------
+        module : Optional[str]
+            An explicit module name, e.g. for metamorphic relations created by a
+            generated test suite. It is returned as is.
 
         Returns
         -------
         module.__name__ : str
             the module name where the test is created.
         """
-        # inspect.stack() returns a list of frame records for the caller's stack.
-        # The first entry in the returned list represents the caller.
-        for frame in inspect.stack():
-            test_module_path = Path(frame[1])
-            if METAMORPHIC_TEST_PACKAGE_PATH not in test_module_path.parents:
-                module = inspect.getmodule(frame[0])
-                if module is not None:
-                    return module.__name__
+        if module is not None:
+            return module
+        # walk the raw frames instead of inspect.stack(), which creates frame records
+        # and reads the source context of every frame on the stack
+        frame = sys._getframe(1)  # noqa
+        while frame is not None:
+            if not _is_package_file(frame.f_code.co_filename):
+                module_name = frame.f_globals.get("__name__")
+                if module_name is not None:
+                    return module_name
+            frame = frame.f_back
         raise ValueError('Internal Error: no calling module found.')
 
     def add_metamorphic_relation(self,  # noqa - to many arguments
                                  name: str,
-                                 data: Sequence,
+                                 data: Iterable,
                                  testing_strategy: str,
                                  number_of_test_cases: int,
-                                 number_of_sources: int
+                                 number_of_sources: int,
+                                 module: Optional[str] = None
                                  ) -> MR_ID:
         """
         A method to create a new metamorphic relation and add it to the test suite.
@@ -98,7 +177,7 @@ class MetamorphicTestSuite:
         ----------
         name : str
             The name of the metamorphic relation.
-        data : Sequence
+        data : Iterable
             The datasource from which sample source are sampled for metamorphic test cases
             of the metamorphic relation.
         testing_strategy: str
@@ -108,6 +187,8 @@ class MetamorphicTestSuite:
             this metamorphic relation.
         number_of_sources : int
             The number of source inputs used for the general transformation.
+        module : Optional[str]
+            The module the metamorphic relation belongs to, defaults to the calling module.
 
         Returns
         -------
@@ -119,20 +200,25 @@ class MetamorphicTestSuite:
         --------
         MetamorphicRelation : Object that holds a metamorphic relation.
         """
-        module = self.get_caller_module()
+        module = self.get_caller_module(module)
         metamorphic_relation_id = f"{module}.{name}"
-        if metamorphic_relation_id in self.get_metamorphic_relations():
-            raise ValueError(f"Metamorphic Relation with with ID: {metamorphic_relation_id} "
-                             f"already exists.")
-
-        # create the metamorphic relation and add it to the suite
-        self._metamorphic_relations[metamorphic_relation_id] = MetamorphicRelation(
-            mr_id=metamorphic_relation_id,
-            data=data,
-            testing_strategy=testing_strategy,
-            number_of_test_cases=number_of_test_cases,
-            number_of_sources=number_of_sources
-        )
+        with self._lock:
+            if metamorphic_relation_id in self.get_metamorphic_relations():
+                raise ValueError(f"Metamorphic Relation with with ID: "
+                                 f"{metamorphic_relation_id} already exists.")
+
+            # create the metamorphic relation and add it to the suite
+            self._metamorphic_relations[metamorphic_relation_id] = MetamorphicRelation(
+                mr_id=metamorphic_relation_id,
+                data=data,
+                testing_strategy=testing_strategy,
+                number_of_test_cases=number_of_test_cases,
+                number_of_sources=number_of_sources,
+                name=name,
+                index=len(self._relation_ids),
+            )
+            self._relation_ids.append(metamorphic_relation_id)
+            self._module_index.setdefault(module, {})[metamorphic_relation_id] = None
 
         return metamorphic_relation_id
 
@@ -1,5 +1,8 @@
-from typing import Sequence, Optional, Dict
+from typing import Iterable, Optional, Dict
 
+from .checkpoint import get_checkpoint
+from .conftest import get_conftest_config
+from .data.lazy import LazyData
 from .metamorphic_test_suite import MetamorphicTestSuite
 from .testing_strategy import TestingStrategy
 from .types import System, Transform, GeneralTransform, Relation, GeneralRelation, \
@@ -8,7 +11,7 @@ from .types import System, Transform, GeneralTransform, Relation, GeneralRelatio
 
 def create_metamorphic_relation(  # noqa - too many arguments
         name: str,
-        data: Sequence,
+        data: Iterable,
         testing_strategy: str = TestingStrategy.EXHAUSTIVE,
         number_of_test_cases: int = 1,
         number_of_sources: int = 1,
@@ -18,7 +21,9 @@ def create_metamorphic_relation(  # noqa - too many arguments
         general_transform: Optional[GeneralTransform] = None,
         relation: Optional[Relation] = None,
         general_relation: Optional[GeneralRelation] = None,
-        valid_input: Optional[Input] = None
+        valid_input: Optional[Input] = None,
+        columnar: bool = False,
+        module: Optional[str] = None
 ) -> MR_ID:
     """
     Registers a new metamorphic relation.
@@ -30,8 +35,14 @@ def create_metamorphic_relation(  # noqa - too many arguments
     ----------
     name : str
         Name of the metamorphic test.
-    data : Sequence
+    data : Iterable
         Dataset from which the source inputs to the metamorphic test cases is selected.
+        Large array datasets can be memory-mapped with gmt.data.from_npy, from_npz or
+        from_raw, so the metamorphic test cases only hold row indices. Large file
+        collections can be streamed with gmt.data.from_glob or from_directory.
+        A zero-argument callable or gmt.lazy(factory) defers creating the data and the
+        test cases until the first test of the metamorphic relation runs. All test cases
+        of a lazy metamorphic relation and system under test are executed by one pytest.
     testing_strategy : TestingStrategy
         Strategy for metamorphic test case creation.
     number_of_test_cases : int
@@ -54,6 +65,16 @@ def create_metamorphic_relation(  # noqa - too many arguments
         Optional general relation function. Defaults to None.
     valid_input : Optional[Input]
         Optional valid input function. Defaults to None.
+    columnar : bool
+        Stores the metamorphic test cases in a gmt.ColumnarStore, which keeps inputs,
+        outputs and relation results of numeric scalars or fixed-shape arrays in NumPy
+        columns instead of one object per test case. Requires data that supports
+        indexing. Defaults to False.
+    module : Optional[str]
+        The module name used in the id of the metamorphic relation. Defaults to the
+        module calling create_metamorphic_relation. Test suites that create metamorphic
+        relations from a shared helper module can pass the name of the test module, so
+        that decorators without explicit ids find them.
 
     Returns
     -------
@@ -62,9 +83,11 @@ def create_metamorphic_relation(  # noqa - too many arguments
         decorated functions to the specified metamorphic relation.
     """
 
+    if callable(data) and not isinstance(data, (Iterable, LazyData)):
+        data = LazyData(data)
     mr_id = MetamorphicTestSuite().add_metamorphic_relation(name, data, testing_strategy,
                                                             number_of_test_cases,
-                                                            number_of_sources)
+                                                            number_of_sources, module)
 
     if parameters is not None:
         MetamorphicTestSuite().get_metamorphic_relation(mr_id).sut_parameters = parameters
@@ -85,7 +108,17 @@ def create_metamorphic_relation(  # noqa - too many arguments
         MetamorphicTestSuite().get_metamorphic_relation(mr_id).valid_input.append(
             valid_input)
 
-    # generate the metamorphic test cases for the metamorphic relation
-    MetamorphicTestSuite().get_metamorphic_relation(mr_id).generate_test_cases()
+    MetamorphicTestSuite().get_metamorphic_relation(mr_id).columnar = columnar
+    MetamorphicTestSuite().get_metamorphic_relation(mr_id).checkpoint = get_checkpoint()
+    collection_cache_dir = get_conftest_config().get("collection_cache")
+    if collection_cache_dir is not None:
+        from .collection_cache import CollectionCache
+
+        MetamorphicTestSuite().get_metamorphic_relation(mr_id).collection_cache = \
+            CollectionCache(collection_cache_dir)
+    # generate the metamorphic test cases for the metamorphic relation, lazy metamorphic
+    # relations generate them when their first test runs
+    if not MetamorphicTestSuite().get_metamorphic_relation(mr_id).is_lazy:
+        MetamorphicTestSuite().get_metamorphic_relation(mr_id).generate_test_cases()
 
     return mr_id
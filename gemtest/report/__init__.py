@@ -1,5 +1,13 @@
+from typing import TYPE_CHECKING
+
 from .execution_report import GeneralMTCExecutionReport
-from .visualizer import Visualizer
+from ..utils.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .visualizer import Visualizer
+
+# matplotlib is only imported when the Visualizer is used
+__getattr__, __dir__ = lazy_attributes(__name__, {'Visualizer': '.visualizer'})
 
 __all__ = [
     'Visualizer',
@@ -55,7 +55,11 @@ class DatabaseHandler:
                         parameters TEXT NOT NULL,
                         stdout TEXT NOT NULL,
                         stderr TEXT NOT NULL,
-                        duration REAL NOT NULL
+                        duration REAL NOT NULL,
+                        error_type TEXT NOT NULL,
+                        mr_index INTEGER,
+                        sut_index INTEGER,
+                        mtc_index INTEGER
                     )
                 """
 
@@ -117,9 +121,13 @@ class DatabaseHandler:
                     parameters,
                     stdout,
                     stderr,
-                    duration
+                    duration,
+                    error_type,
+                    mr_index,
+                    sut_index,
+                    mtc_index
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     result.date,
@@ -137,7 +145,9 @@ class DatabaseHandler:
                     json.dumps(result.parameters),
                     result.stdout,
                     result.stderr,
-                    result.duration
+                    result.duration,
+                    result.error_type,
+                    *(result.identity or (None, None, None))
                 ),
             )
 
@@ -1,6 +1,8 @@
 import datetime
+from typing import Callable, List, Optional
 
-from gemtest.metamorphic_test_case import UninitializedValue
+from gemtest.metamorphic_test_case import MTCIdentity, UninitializedValue
+from gemtest.utils.resource_cache import get_resource_cache
 
 
 class GeneralMTCExecutionReport:
@@ -14,6 +16,7 @@ class GeneralMTCExecutionReport:
         self.mtc_name: str = ""
         self.mr_name: str = ""
         self.sut_name: str = ""
+        self.identity: Optional[MTCIdentity] = None
         self._source_inputs = []
         self._source_outputs = []
         self._followup_inputs = []
@@ -26,26 +29,44 @@ class GeneralMTCExecutionReport:
         self.stdout: str = ""
         self.stderr: str = ""
         self.duration: int = 0
+        self.error_type: str = ""
+        self._data_loader: Optional[Callable] = None
 
-    def populate(self, report):
-        names = report.nodeid.replace("]", "")
-        names = names.split("[")[1]
-        names = names.split(", ")
-        self.sut_name = names[0].split("=")[1]
-        self.mr_name = names[1].split(".")[1]
-        self.mtc_name = names[2].split("=")[1]
-        self.test_result = report.outcome
+    def populate(self, report, mtc_name: Optional[str] = None,
+                 test_result: Optional[str] = None):
+        """
+        Fills the report with the results of the pytest report. The names of the
+        metamorphic test case, relation and system under test are set from the identity
+        of the test case when the report is created. If the pytest executed multiple
+        metamorphic test cases, the result of the metamorphic test case is passed
+        explicitly.
+        """
+        if mtc_name is not None:
+            self.mtc_name = mtc_name
+        self.test_result = test_result if test_result is not None else report.outcome
         self.stdout = report.capstdout
         self.stderr = report.capstderr
         self.duration = report.duration
 
     @property
     def source_inputs(self):
+        if self._data_loader:
+            cache = get_resource_cache()
+            return [cache.get(path, self._data_loader) for path in self._source_inputs]
         return self._source_inputs
 
     @source_inputs.setter
     def source_inputs(self, value):
         self._source_inputs = value
+        self._data_loader = None
+
+    def set_lazy_source_inputs(self, paths: List[str], data_loader: Callable):
+        """
+        Stores only the file paths of source inputs loaded by a data loader. The resources
+        are loaded through the resource cache whenever the source inputs are accessed.
+        """
+        self._source_inputs = paths
+        self._data_loader = data_loader
 
     @property
     def source_outputs(self):
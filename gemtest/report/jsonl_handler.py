@@ -0,0 +1,70 @@
+import json
+from pathlib import Path
+from typing import List
+
+from .execution_report import GeneralMTCExecutionReport
+
+
+class JSONLHandler:
+    """
+    Writes execution reports to a JSON Lines file, one object per metamorphic test case
+    with the columns of the 'mtc_results' table of the DatabaseHandler. Inputs and outputs
+    are written as lists of their string representations.
+
+    Attributes
+    ----------
+    path : Path
+        The path of the JSON Lines file, an existing file is overwritten unless append is
+        set.
+    """
+
+    def __init__(self, path, append: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, "a" if append else "w",  # noqa - closed by close()
+                         encoding="utf-8")
+
+    @staticmethod
+    def to_dict(result: GeneralMTCExecutionReport) -> dict:
+        mr_index, sut_index, mtc_index = result.identity or (None, None, None)
+        return {
+            "date": result.date,
+            "mtc_name": result.mtc_name,
+            "mr_name": result.mr_name,
+            "sut_name": result.sut_name,
+            "mr_index": mr_index,
+            "sut_index": sut_index,
+            "mtc_index": mtc_index,
+            "source_inputs": [str(value) for value in result.source_inputs],
+            "source_outputs": [str(value) for value in result.source_outputs],
+            "followup_inputs": [str(value) for value in result.followup_inputs],
+            "followup_outputs": [str(value) for value in result.followup_outputs],
+            "transformation_name": result.transformation_name,
+            "relation_name": result.relation_name,
+            "test_result": result.test_result,
+            "relation_result": bool(result.relation_result),
+            "parameters": result.parameters,
+            "stdout": result.stdout,
+            "stderr": result.stderr,
+            "duration": result.duration,
+            "error_type": result.error_type,
+        }
+
+    def insert(self, results: List[GeneralMTCExecutionReport]):
+        """
+        Appends results to the file.
+
+        Parameters
+        ----------
+        results : list
+            List of result objects to be written.
+        """
+        self.file.writelines(json.dumps(self.to_dict(result), default=str) + "\n"
+                             for result in results)
+        self.file.flush()
+
+    def close(self):
+        """
+        Closes the JSON Lines file.
+        """
+        self.file.close()
@@ -0,0 +1,496 @@
+import argparse
+import importlib
+import sys
+import time
+import traceback
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, \
+    Sequence, Tuple, Union
+
+from pytest import ExitCode
+
+from . import conftest
+from .checkpoint import FLUSH_INTERVAL, close_checkpoint, open_checkpoint
+from .decorator import MAX_LISTED_FAILURES, execute_test_cases, register_system_under_test
+from .metamorphic_error import ErrorMode, InvalidInputError, SkippedMTC
+from .metamorphic_relation import MetamorphicRelation
+from .metamorphic_test_case import MetamorphicTestCase, MTCIdentity
+from .metamorphic_test_suite import MetamorphicTestSuite
+from .report.database_handler import DatabaseHandler
+from .report.jsonl_handler import JSONLHandler
+from .report.report_handler import generate_run_id
+from .testcase_chunk import WHOLE_RELATION, MetamorphicTestCaseChunk
+from .types import MR_ID, System
+
+DEFAULT_CHUNK_SIZE = 1000
+""" The number of metamorphic test cases executed before their results are written """
+
+
+class MTCResult(NamedTuple):
+    """
+    The result of an executed metamorphic test case, yielded by execute. The outcome is
+    "passed", "failed", "error" for errors in user code or "skipped" for invalid inputs and
+    test cases skipped by gmt.skip(), the message describes failures and errors.
+    """
+    identity: MTCIdentity
+    mr_id: MR_ID
+    mr_name: str
+    sut_id: str
+    outcome: str
+    message: str
+    duration: float
+    test_case: MetamorphicTestCase
+
+    @property
+    def name(self) -> str:
+        return f"{self.mr_name}[{self.sut_id}] {self.identity.mtc_name}"
+
+
+@dataclass
+class RunSummary:
+    """
+    The outcome of a run of metamorphic test cases without pytest. Test cases failing
+    because of an error in user code are counted as errors, test cases with invalid inputs
+    or skipped by gmt.skip() as skipped.
+    """
+    passed: int = 0
+    failed: int = 0
+    errors: int = 0
+    skipped: int = 0
+    duration: float = 0.0
+    interrupted: Optional[str] = None
+    """ The message of the error that stopped the run with --on-error=exit """
+    failures: List[str] = field(default_factory=list)
+    """ The first MAX_LISTED_FAILURES failing or erroneous test cases """
+
+    @property
+    def total(self) -> int:
+        return self.passed + self.failed + self.errors + self.skipped
+
+    @property
+    def exit_code(self) -> int:
+        """
+        The exit code of the run, using the exit codes of pytest.
+        """
+        if self.interrupted is not None:
+            return ExitCode.INTERRUPTED
+        if self.total == 0:
+            return ExitCode.NO_TESTS_COLLECTED
+        if self.failed or self.errors:
+            return ExitCode.TESTS_FAILED
+        return ExitCode.OK
+
+    def add(self, result: MTCResult):
+        counter = "errors" if result.outcome == "error" else result.outcome
+        setattr(self, counter, getattr(self, counter) + 1)
+        if result.message and len(self.failures) < MAX_LISTED_FAILURES:
+            self.failures.append(f"{result.name}: {result.message}")
+
+    def format(self) -> str:
+        lines = list(self.failures)
+        number_of_failures = self.failed + self.errors
+        if number_of_failures > len(self.failures):
+            lines.append(f"... and {number_of_failures - len(self.failures)} more")
+        if self.interrupted is not None:
+            lines.append(f"Interrupted: {self.interrupted}")
+        throughput = self.total / self.duration if self.duration else 0.0
+        lines.append(f"{self.passed} passed, {self.failed} failed, {self.errors} errors, "
+                     f"{self.skipped} skipped in {self.duration:.2f}s "
+                     f"({throughput:.0f} MTCs/s)")
+        return "\n".join(lines)
+
+
+def _create_config(threads: Optional[int], batch_size: Optional[int], on_error: str,
+                   sut_timeout: Optional[float], isolate: bool,
+                   prefetch_depth: Optional[int], prefetch_workers: Optional[int],
+                   collection_cache: Optional[str]) -> Dict:
+    """
+    Creates the configuration the decorators read while the test modules are imported,
+    with the keys pytest_sessionstart sets from the command line options.
+    """
+    return {
+        'string_report': False,
+        'html_report': False,
+        'batch_size': batch_size,
+        'export_data': False,
+        'sut_timeout': sut_timeout,
+        'isolate': isolate,
+        'max_batches_per_worker': None,
+        'max_worker_rss': None,
+        'on_error': on_error,
+        'resource_cache_size': None,
+        'prefetch_depth': prefetch_depth,
+        'prefetch_workers': prefetch_workers,
+        'collection_cache': collection_cache,
+        # one pytest param per metamorphic relation, the runner does not use them
+        'granularity': WHOLE_RELATION,
+        'ids': 'full',
+        'threads': threads,
+        'sut_filepath': None,
+        'sut_class': None,
+        'sut_endpoint': None,
+        'is_sut_dynamic_active': False,
+    }
+
+
+@contextmanager
+def _configured(config: Dict) -> Iterator[Mapping]:
+    """
+    Replaces the configuration of the gemtest plugin, e.g. the one of a running pytest
+    session, and its read-only snapshot, which the executors read while the test cases are
+    executed.
+    """
+    previous, previous_snapshot = conftest.CONFIG, conftest.config_snapshot
+    conftest.CONFIG = config
+    try:
+        yield conftest.freeze_config(config)
+    finally:
+        conftest.CONFIG = previous
+        conftest.config_snapshot = previous_snapshot
+
+
+def _module_name(path: Path) -> str:
+    """
+    Returns the name of the module of a file, like the prepend import mode of pytest: the
+    first directory above the file that is not a package is inserted into sys.path.
+    """
+    path = path.resolve()
+    parts = [path.stem]
+    root = path.parent
+    while (root / "__init__.py").exists():
+        parts.insert(0, root.name)
+        root = root.parent
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+    return ".".join(parts)
+
+
+def resolve_module_names(target: str) -> List[str]:
+    """
+    Returns the names of the test modules of a target, which is a module name, the path of
+    a module or a directory searched for test_*.py and *_test.py files.
+    """
+    path = Path(target)
+    if path.is_dir():
+        files = sorted(file for file in path.rglob("*.py")
+                       if file.name.startswith("test_") or file.stem.endswith("_test"))
+        return [_module_name(file) for file in files]
+    if path.suffix == ".py":
+        return [_module_name(path)]
+    return [target]
+
+
+def _relations_under_test(module_names: Sequence[str]) \
+        -> List[Tuple[MetamorphicRelation, str]]:
+    """
+    Returns the metamorphic relations and systems under test whose system under test is
+    defined in one of the modules, i.e. the pairs pytest would collect from them.
+    """
+    modules = set(module_names)
+    return [(mr, sut_id)
+            for mr in MetamorphicTestSuite().get_metamorphic_relations().values()
+            for sut_id, sut in mr.system_under_test.items()
+            if getattr(sut, "__module__", None) in modules]
+
+
+def _outcome(mtc: MetamorphicTestCase) -> Tuple[str, str]:
+    """
+    Returns the outcome of an executed metamorphic test case, with the semantics of
+    evaluate_test_case, and a message for failing test cases.
+    """
+    if isinstance(mtc.error, (InvalidInputError, SkippedMTC)):
+        return "skipped", ""
+    if mtc.error is not None:
+        return "error", f"{type(mtc.error).__name__}: {mtc.error.message}"
+    if not mtc.relation_result:
+        return "failed", "The Metamorphic Relation does not hold for this " \
+                         "Metamorphic Test Case"
+    return "passed", ""
+
+
+def _results(mr: MetamorphicRelation, sut_id: str, test_cases: Sequence[MetamorphicTestCase],
+             duration: float) -> Iterator[MTCResult]:
+    for mtc in test_cases:
+        if mtc.report is None:
+            if mr.checkpoint is None or not mr.checkpoint.is_restored(mr.mr_id, sut_id, mtc):
+                # not executed, the execution was interrupted by an error
+                continue
+            # restored from the checkpoint, without a report
+            outcome, message = _outcome(mtc)
+            yield MTCResult(mtc.identity, mr.mr_id, mr.display_name, sut_id, outcome,
+                            message, 0.0, mtc)
+            continue
+        outcome, message = _outcome(mtc)
+        # the report is complete without a pytest report, e.g. for a DatabaseHandler
+        mtc.report.test_result = "failed" if outcome == "error" else outcome
+        mtc.report.duration = duration
+        yield MTCResult(mtc.identity, mr.mr_id, mr.display_name, sut_id, outcome, message,
+                        duration, mtc)
+
+
+def _systems_under_test(mr: MetamorphicRelation,
+                        sut: Union[None, str, System, Iterable[Union[str, System]]],
+                        **kwargs) -> List[str]:
+    """
+    Returns the ids of the systems under test of a metamorphic relation to execute.
+    Functions that are not registered on the metamorphic relation yet are registered, with
+    the keyword arguments of system_under_test.
+    """
+    if sut is None:
+        return list(mr.system_under_test)
+    suts = [sut] if isinstance(sut, str) or callable(sut) else list(sut)
+    sut_ids = []
+    for system in suts:
+        if callable(system):
+            if mr.system_under_test.get(system.__name__) is not system:
+                register_system_under_test(system, [mr.mr_id], **kwargs)
+            system = system.__name__
+        if system not in mr.system_under_test:
+            raise ValueError(f"System under test {system} is not registered for "
+                             f"metamorphic relation {mr.mr_id}.")
+        sut_ids.append(system)
+    return sut_ids
+
+
+def execute(mr_ids: Union[None, MR_ID, Iterable[MR_ID]] = None,
+            sut: Union[None, str, System, Iterable[Union[str, System]]] = None,
+            chunk_size: int = 1, **kwargs) -> Iterator[MTCResult]:
+    """
+    Executes metamorphic test cases and yields their results as they complete, e.g. for
+    dashboards or test drivers that react to results during the run. Execution is driven
+    by the consumer: the next chunk of test cases is only executed when the results of the
+    previous chunk were consumed, and closing the generator stops the execution.
+
+    Batching, prefetching and the threads of a system under test apply within and across
+    chunks as under pytest, threads only execute test cases of the same chunk in parallel.
+    With ErrorMode.EXIT, the results of the interrupted chunk are yielded before the
+    SystemExit of the error is raised.
+
+    Parameters
+    ----------
+    mr_ids : Union[None, MR_ID, Iterable[MR_ID]]
+        The metamorphic relations, as returned by create_metamorphic_relation. None for
+        all metamorphic relations of the suite.
+    sut : Union[None, str, System, Iterable[Union[str, System]]]
+        The systems under test, as functions or names. None for all systems under test of
+        each metamorphic relation. Functions that are not registered on a metamorphic
+        relation yet are registered, e.g. to test a SUT without the decorators.
+    chunk_size : int
+        The number of test cases executed at once, before their results are yielded.
+    **kwargs
+        The keyword arguments of system_under_test for registering functions, e.g.
+        batch_size or threads.
+
+    Yields
+    ------
+    MTCResult
+        The result of each test case, in the order of the test cases.
+    """
+    suite = MetamorphicTestSuite()
+    if mr_ids is None:
+        mr_ids = list(suite.get_metamorphic_relations())
+    elif isinstance(mr_ids, str):
+        mr_ids = [mr_ids]
+    relations = ((mr, sut_id) for mr in map(suite.get_metamorphic_relation, mr_ids)
+                 for sut_id in _systems_under_test(mr, sut, **kwargs))
+    yield from _execute(relations, chunk_size)
+
+
+def _execute(relations: Iterable[Tuple[MetamorphicRelation, str]],
+             chunk_size: int) -> Iterator[MTCResult]:
+    """
+    Executes the test cases of pairs of metamorphic relations and systems under test, see
+    execute. The executors of the systems under test are closed once all pairs are
+    executed, they are shared by the metamorphic relations of a system under test, e.g.
+    the worker process of an isolated SUT keeps its state from one relation to the next.
+    """
+    executors = {}
+    try:
+        for mr, sut_id in relations:
+            for executor in (mr.test_case_executors.get(sut_id), mr.sut_executors.get(sut_id)):
+                if hasattr(executor, "close"):
+                    executors[id(executor)] = executor
+            mr.materialize()
+            for chunk in MetamorphicTestCaseChunk.split(mr, sut_id, chunk_size):
+                test_cases = chunk.test_cases
+                start = time.perf_counter()
+                try:
+                    execute_test_cases(mr, sut_id, test_cases)
+                except SystemExit:
+                    duration = (time.perf_counter() - start) / len(test_cases)
+                    yield from _results(mr, sut_id, test_cases, duration)
+                    raise
+                duration = (time.perf_counter() - start) / max(len(test_cases), 1)
+                yield from _results(mr, sut_id, test_cases, duration)
+    finally:
+        for executor in executors.values():
+            executor.close()
+
+
+def run(*targets: str, threads: Optional[int] = None, batch_size: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE, on_error: str = ErrorMode.EXIT,
+        sut_timeout: Optional[float] = None, isolate: bool = False,
+        prefetch_depth: Optional[int] = None, prefetch_workers: Optional[int] = None,
+        collection_cache: Optional[str] = None, database: bool = False,
+        jsonl: Optional[str] = None, checkpoint: Optional[str] = None, resume: bool = False,
+        checkpoint_interval: float = FLUSH_INTERVAL) -> RunSummary:
+    """
+    Executes the metamorphic test cases of test modules without pytest. The modules are
+    imported, so their metamorphic relations, transformations, relations and systems under
+    test are registered exactly as under pytest, and all test cases of each system under
+    test are executed in chunks of chunk_size, batched, prefetched and on threads as
+    configured. The results of each chunk are written before the next chunk runs.
+
+    Marks of the test functions (e.g. xfail), visualizers and data exporters only apply
+    under pytest, dynamic systems under test are not supported. Modules that were already
+    imported keep the configuration they were imported with.
+
+    Parameters
+    ----------
+    *targets : str
+        Module names, paths of modules or directories with test_*.py modules.
+    threads, batch_size, on_error, sut_timeout, isolate, prefetch_depth, prefetch_workers,
+    collection_cache:
+        Like the --gmt-threads, --batch_size, --gmt-on-error, --gmt-sut-timeout,
+        --gmt-isolate, --gmt-prefetch-depth, --gmt-prefetch-workers and
+        --gmt-collection-cache options of pytest. Arguments of the decorators take
+        precedence, as under pytest.
+    chunk_size : int
+        The number of metamorphic test cases executed before their results are written.
+    database : bool
+        Writes the results to a new SQLite database in gemtest_results, like --html-report.
+    jsonl : Optional[str]
+        Writes the results to this JSON Lines file, which is appended to when resuming.
+    checkpoint, resume, checkpoint_interval:
+        Like the --gmt-checkpoint, --gmt-resume and --gmt-checkpoint-interval options of
+        pytest. Test cases restored from the checkpoint are counted in the summary, but
+        their results are not written again.
+
+    Returns
+    -------
+    RunSummary
+        The number of passed, failed, erroneous and skipped test cases, the exit code.
+    """
+    if resume and checkpoint is None:
+        raise ValueError("Resuming a run requires a checkpoint directory")
+    config = _create_config(threads, batch_size, on_error, sut_timeout, isolate,
+                            prefetch_depth, prefetch_workers, collection_cache)
+    module_names = [name for target in targets for name in resolve_module_names(target)]
+    if checkpoint is not None:
+        # before the test modules are imported, which generates the test cases
+        open_checkpoint(checkpoint, resume, checkpoint_interval)
+    try:
+        with _configured(config):
+            for module_name in module_names:
+                importlib.import_module(module_name)
+            return _run_relations(_relations_under_test(module_names), chunk_size,
+                                  database, jsonl, append=resume)
+    finally:
+        if checkpoint is not None:
+            close_checkpoint()
+
+
+def _run_relations(relations: List[Tuple[MetamorphicRelation, str]], chunk_size: int,
+                   database: bool, jsonl: Optional[str], append: bool) -> RunSummary:
+    handlers = []
+    if database:
+        handlers.append(DatabaseHandler(generate_run_id()))
+    if jsonl is not None:
+        handlers.append(JSONLHandler(jsonl, append))
+
+    summary = RunSummary()
+    reports = []
+    start = time.perf_counter()
+    try:
+        for result in _execute(relations, chunk_size):
+            summary.add(result)
+            if result.test_case.report is not None:
+                reports.append(result.test_case.report)
+            if len(reports) >= chunk_size:
+                _insert(handlers, reports)
+    except SystemExit as e:
+        # the error of user code that stopped the run with --on-error=exit
+        summary.interrupted = str(getattr(e.code, "message", e.code))
+    finally:
+        summary.duration = time.perf_counter() - start
+        _insert(handlers, reports)
+        for handler in handlers:
+            handler.close()
+    return summary
+
+
+def _insert(handlers: List, reports: List):
+    for handler in handlers:
+        handler.insert(reports)
+    reports.clear()
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """
+    The gemtest command line interface, e.g. gemtest run tests/ --threads 8 --jsonl out.jsonl
+    """
+    parser = argparse.ArgumentParser(prog="gemtest")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser(
+        "run", help="Execute the metamorphic test cases of test modules without pytest")
+    run_parser.add_argument("targets", nargs="+",
+                            help="Module names, paths of modules or directories")
+    run_parser.add_argument("--threads", type=int, default=None,
+                            help="Number of threads executing the test cases of each "
+                                 "system under test")
+    run_parser.add_argument("--batch-size", type=int, default=None, help="Set batch size")
+    run_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                            help="Number of test cases executed before their results are "
+                                 "written")
+    run_parser.add_argument("--on-error", default=ErrorMode.EXIT,
+                            choices=[ErrorMode.EXIT, ErrorMode.CONTINUE],
+                            help="Stop the run on the first error in user code (exit) or "
+                                 "only fail the affected test cases (continue)")
+    run_parser.add_argument("--sut-timeout", type=float, default=None,
+                            help="Cancel SUT calls (or batches) that take longer than this "
+                                 "number of seconds")
+    run_parser.add_argument("--isolate", action="store_true", default=False,
+                            help="Run systems under test in supervised worker processes")
+    run_parser.add_argument("--prefetch-depth", type=int, default=None,
+                            help="Load the inputs of this number of upcoming batches in the "
+                                 "background")
+    run_parser.add_argument("--prefetch-workers", type=int, default=None,
+                            help="Number of threads loading inputs in the background")
+    run_parser.add_argument("--collection-cache", default=None,
+                            help="Directory in which the test case templates of exhaustive "
+                                 "metamorphic relations are cached across runs")
+    run_parser.add_argument("--db", action="store_true", default=False,
+                            help="Write the results to a SQLite database in gemtest_results")
+    run_parser.add_argument("--jsonl", default=None,
+                            help="Write the results to this JSON Lines file")
+    run_parser.add_argument("--checkpoint", default=None,
+                            help="Directory in which the progress of the run is "
+                                 "checkpointed")
+    run_parser.add_argument("--resume", action="store_true", default=False,
+                            help="Resume the run from the checkpoint in --checkpoint")
+    run_parser.add_argument("--checkpoint-interval", type=float, default=FLUSH_INTERVAL,
+                            help="Minimum number of seconds between two writes of the "
+                                 "checkpoint")
+    arguments = parser.parse_args(args)
+
+    try:
+        summary = run(*arguments.targets, threads=arguments.threads,
+                      batch_size=arguments.batch_size, chunk_size=arguments.chunk_size,
+                      on_error=arguments.on_error, sut_timeout=arguments.sut_timeout,
+                      isolate=arguments.isolate, prefetch_depth=arguments.prefetch_depth,
+                      prefetch_workers=arguments.prefetch_workers,
+                      collection_cache=arguments.collection_cache, database=arguments.db,
+                      jsonl=arguments.jsonl, checkpoint=arguments.checkpoint,
+                      resume=arguments.resume,
+                      checkpoint_interval=arguments.checkpoint_interval)
+    except Exception:  # noqa - errors while importing the test modules
+        traceback.print_exc()
+        return ExitCode.INTERRUPTED
+    print(summary.format())
+    return summary.exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
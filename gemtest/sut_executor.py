@@ -0,0 +1,393 @@
+import ctypes
+import importlib
+import multiprocessing
+import os
+import pickle  # nosec
+import queue
+import sys
+import threading
+from typing import Any, Callable, Dict, Mapping, Optional, Union
+
+from .conftest import get_config_snapshot, use_config
+from .metamorphic_error import SUTCrashError, SUTTimeoutError
+from .types import System
+
+
+def _current_rss() -> int:
+    """
+    Returns the resident set size of the current process in bytes, or 0 if it can not be
+    determined on this platform.
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource  # noqa
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+    except ImportError:
+        return 0
+
+
+def _picklable_exception(exception: BaseException) -> BaseException:
+    try:
+        pickle.dumps(exception)
+        return exception
+    except Exception:  # noqa
+        return RuntimeError(f"{type(exception).__name__}: {exception}")
+
+
+class _SUTReference:
+    """
+    A picklable reference to a system under test that can not be pickled itself, e.g. a
+    SUT decorated with @gmt.system_under_test, whose module attribute is the pytest test
+    function. The worker imports the module and takes the SUT from the test function.
+    """
+
+    def __init__(self, sut_function: System):
+        self.module = sut_function.__module__
+        self.qualname = sut_function.__qualname__
+
+    def resolve(self) -> Any:
+        target: Any = importlib.import_module(self.module)
+        for name in self.qualname.split("."):
+            target = getattr(target, name)
+        return getattr(target, "gemtest_sut", target)
+
+
+def _picklable_sut(sut_function: System) -> Union[System, _SUTReference]:
+    try:
+        pickle.dumps(sut_function)
+        return sut_function
+    except Exception:  # noqa
+        return _SUTReference(sut_function)
+
+
+def _worker_main(connection, sut_function: Union[System, _SUTReference], sut_kwargs: Dict,
+                 initializer: Optional[Callable]):
+    if isinstance(sut_function, _SUTReference):
+        sut_function = sut_function.resolve()
+    if initializer is not None:
+        initializer()
+    while True:
+        try:
+            inputs = connection.recv()
+        except EOFError:
+            return
+        if inputs is None:
+            return
+        try:
+            connection.send((True, sut_function(inputs, **sut_kwargs), _current_rss()))
+        except Exception as e:  # noqa
+            connection.send((False, _picklable_exception(e), _current_rss()))
+
+
+class _SUTInterrupt(BaseException):
+    """
+    Raised asynchronously in the thread of a system under test that exceeded its timeout.
+    Derives from BaseException, so it is not swallowed by `except Exception` in the SUT.
+    """
+
+
+def _interrupt_thread(thread: threading.Thread):
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread.ident),  # type: ignore
+                                               ctypes.py_object(_SUTInterrupt))
+
+
+class _SUTCall:
+    """
+    A call of a system under test, executed by a _SUTThread.
+    """
+
+    def __init__(self, inputs: Any, sut_kwargs: Dict):
+        self.inputs = inputs
+        self.sut_kwargs = sut_kwargs
+        self.value: Any = None
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+
+
+class _SUTThread:
+    """
+    A long-lived thread that executes the calls of a system under test one after another.
+    A call is put into its queue and the thread exits once it takes None from the queue,
+    or when it is interrupted.
+    """
+
+    def __init__(self, sut_function: System, config: Optional[Mapping]):
+        self.sut_function = sut_function
+        self.config = config
+        self.calls: "queue.SimpleQueue[Optional[_SUTCall]]" = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._run, daemon=True,
+                                       name=f"gemtest-sut-{sut_function.__name__}")
+        self.thread.start()
+
+    def _run(self):
+        try:
+            with use_config(self.config):
+                self._execute_calls()
+        except _SUTInterrupt:
+            # the call timed out, the caller already replaced this thread
+            pass
+
+    def _execute_calls(self):
+        while True:
+            call = self.calls.get()
+            if call is None:
+                return
+            try:
+                call.value = self.sut_function(call.inputs, **call.sut_kwargs)
+            except Exception as e:  # noqa
+                call.error = e
+            call.done.set()
+
+    def stop(self):
+        """
+        Lets the thread exit after the call it is executing, if any.
+        """
+        self.calls.put(None)
+
+
+class ThreadedSUTExecutor:
+    """
+    Executes a system under test in a separate thread and gives up on a call after
+    `timeout` seconds. Each thread calling the executor has a long-lived SUT thread of its
+    own. The SUT thread of a timed out call is interrupted the next time it executes
+    Python code and replaced for the next call, SUTs blocked in native code keep running
+    in the background.
+
+    Parameters
+    ----------
+    sut_function : System
+        The system under test.
+    timeout : float
+        The maximum number of seconds a single call (or batch) may take.
+    config : Optional[Mapping]
+        The read-only configuration the SUT threads read, defaults to the snapshot of the
+        session.
+    """
+
+    def __init__(self, sut_function: System, timeout: float,
+                 config: Optional[Mapping] = None):
+        self.sut_function = sut_function
+        self.timeout = timeout
+        self.config = config if config is not None else get_config_snapshot()
+        self.timeouts = 0
+        # the SUT thread of each calling thread, by the ident of the calling thread
+        self._threads: Dict[int, _SUTThread] = {}
+        self._lock = threading.Lock()
+
+    def _sut_thread(self) -> _SUTThread:
+        caller = threading.get_ident()
+        with self._lock:
+            if caller not in self._threads:
+                self._threads[caller] = _SUTThread(self.sut_function, self.config)
+            return self._threads[caller]
+
+    def __call__(self, inputs: Any, **sut_kwargs) -> Any:
+        sut_thread = self._sut_thread()
+        call = _SUTCall(inputs, sut_kwargs)
+        sut_thread.calls.put(call)
+
+        if not call.done.wait(self.timeout):
+            # the SUT thread is alive until it takes None from its queue
+            _interrupt_thread(sut_thread.thread)
+            sut_thread.stop()
+            with self._lock:
+                del self._threads[threading.get_ident()]
+                self.timeouts += 1
+            raise SUTTimeoutError(
+                f"The system under test {self.sut_function.__name__} did not finish "
+                f"within the timeout of {self.timeout} seconds."
+            )
+        if call.error is not None:
+            raise call.error
+        return call.value
+
+    def close(self):
+        """
+        Stops the SUT threads once their current calls finished.
+        """
+        with self._lock:
+            sut_threads = list(self._threads.values())
+            self._threads.clear()
+        for sut_thread in sut_threads:
+            sut_thread.stop()
+
+
+class IsolatedSUTExecutor:
+    """
+    Executes a system under test in a supervised worker process. A crash of the worker,
+    e.g. a segfault in native code of the SUT, only fails the batch that was executed and
+    the worker is restarted for the next batch.
+
+    Parameters
+    ----------
+    sut_function : System
+        The system under test executed in the worker.
+    initializer : Optional[Callable]
+        Called in every new worker before the first batch, e.g. to load a model. The
+        initializer is run again whenever a worker is restarted.
+    max_batches : Optional[int]
+        Recycles the worker after it executed this number of batches.
+    max_rss : Optional[int]
+        Recycles the worker once its resident set size exceeds this number of megabytes.
+    timeout : Optional[float]
+        Kills the worker if a single call (or batch) takes longer than this number of
+        seconds.
+
+    The executor can be called from multiple threads, the calls are executed one after
+    another by the single worker. Workers are started with the forkserver method (spawn
+    where it is not available), forking the test process is not safe while it runs
+    prefetcher or test case executor threads. The worker imports the module of the SUT,
+    so the SUT must be defined at the top level of its module, and the initializer and
+    the keyword arguments of the SUT must be picklable.
+    """
+
+    def __init__(self, sut_function: System, initializer: Optional[Callable] = None,
+                 max_batches: Optional[int] = None, max_rss: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        self.sut_function = sut_function
+        self.initializer = initializer
+        self.max_batches = max_batches
+        self.max_rss = max_rss
+        self.timeout = timeout
+        self.crashes = 0
+        self.recycles = 0
+        self.timeouts = 0
+        self._process: Any = None
+        self._connection: Any = None
+        self._sut_kwargs: Dict = {}
+        self._batches = 0
+        start_methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context(
+            "forkserver" if "forkserver" in start_methods else "spawn"
+        )
+        self._sut: Optional[Union[System, _SUTReference]] = None
+        self._lock = threading.RLock()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self._process is not None else None
+
+    def _worker_sut(self) -> Union[System, _SUTReference]:
+        """
+        Returns the SUT or a reference to it that the worker can unpickle. Resolved on the
+        first start, decorated SUTs are only reachable once their module is executed.
+        """
+        if self._sut is None:
+            sut = _picklable_sut(self.sut_function)
+            try:
+                resolved = sut.resolve() if isinstance(sut, _SUTReference) else sut
+            except (ImportError, AttributeError):
+                resolved = None
+            if resolved is not self.sut_function:
+                raise ValueError(
+                    f"The system under test {self.sut_function.__name__} can not be run in "
+                    f"an isolated worker, it must be defined at the top level of its module."
+                )
+            self._sut = sut
+        return self._sut
+
+    def _start(self, sut_kwargs: Dict):
+        sut = self._worker_sut()
+        parent_connection, child_connection = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_worker_main,
+            args=(child_connection, sut, sut_kwargs, self.initializer),
+            daemon=True,
+        )
+        try:
+            self._process.start()
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            self._process = None
+            parent_connection.close()
+            child_connection.close()
+            raise ValueError(
+                f"The isolated worker of the system under test {self.sut_function.__name__} "
+                f"could not be started, its initializer and keyword arguments must be "
+                f"picklable: {e}"
+            ) from e
+        child_connection.close()
+        self._connection = parent_connection
+        self._sut_kwargs = dict(sut_kwargs)
+        self._batches = 0
+
+    def _needs_restart(self, sut_kwargs: Dict) -> bool:
+        if self._process is None or not self._process.is_alive():
+            return True
+        # the worker received the keyword arguments when it was started
+        return sut_kwargs.keys() != self._sut_kwargs.keys() or any(
+            sut_kwargs[key] is not self._sut_kwargs[key] for key in sut_kwargs
+        )
+
+    def _needs_recycle(self, rss: int) -> bool:
+        if self.max_batches is not None and self._batches >= self.max_batches:
+            return True
+        return self.max_rss is not None and rss > self.max_rss * 1024 * 1024
+
+    def __call__(self, inputs: Any, **sut_kwargs) -> Any:
+        with self._lock:
+            return self._call(inputs, **sut_kwargs)
+
+    def _call(self, inputs: Any, **sut_kwargs) -> Any:
+        if self._needs_restart(sut_kwargs):
+            self.close()
+            self._start(sut_kwargs)
+
+        try:
+            self._connection.send(inputs)
+            if self.timeout is not None and not self._connection.poll(self.timeout):
+                self.close(kill=True)
+                self.timeouts += 1
+                raise SUTTimeoutError(
+                    f"The system under test {self.sut_function.__name__} did not finish "
+                    f"within the timeout of {self.timeout} seconds, its isolated worker "
+                    f"was killed."
+                )
+            is_ok, value, rss = self._connection.recv()
+        except (EOFError, OSError) as e:
+            exitcode = self.close()
+            self.crashes += 1
+            raise SUTCrashError(
+                f"The isolated worker of the system under test "
+                f"{self.sut_function.__name__} crashed "
+                f"with exit code {exitcode}.", e
+            ) from e
+
+        self._batches += 1
+        if self._needs_recycle(rss):
+            self.close()
+            self.recycles += 1
+
+        if not is_ok:
+            raise value
+        return value
+
+    def close(self, kill: bool = False) -> Optional[int]:
+        """
+        Stops the worker process and returns its exit code. If kill is set, the worker is
+        killed instead of waiting for it to finish the current call.
+        """
+        with self._lock:
+            return self._close(kill)
+
+    def _close(self, kill: bool) -> Optional[int]:
+        if self._process is None:
+            return None
+        process, self._process = self._process, None
+        if kill:
+            process.kill()
+        try:
+            self._connection.send(None)
+        except (OSError, ValueError):
+            pass
+        self._connection.close()
+        process.join(timeout=5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        return process.exitcode
@@ -0,0 +1,101 @@
+import argparse
+from typing import List, Optional, TYPE_CHECKING
+
+from .metamorphic_test_case import MetamorphicTestCase
+
+if TYPE_CHECKING:
+    from .metamorphic_relation import MetamorphicRelation
+
+
+WHOLE_RELATION = 0
+""" The chunk size of granularity "mr", one chunk holds all test cases of a relation """
+
+
+def parse_granularity(granularity: str) -> int:
+    """
+    Parses the granularity of the pytest items, i.e. how many metamorphic test cases each
+    item executes: "mtc" for one item per test case, "chunk:N" for N test cases per item
+    or "mr" for one item per metamorphic relation and system under test.
+
+    Returns
+    -------
+    int
+        The number of test cases per item, WHOLE_RELATION for "mr".
+    """
+    if granularity == "mtc":
+        return 1
+    if granularity == "mr":
+        return WHOLE_RELATION
+    kind, _, size = granularity.partition(":")
+    if kind == "chunk" and size.isdigit() and int(size) > 0:
+        return int(size)
+    raise argparse.ArgumentTypeError(f"invalid granularity {granularity!r}, use mtc, "
+                                     f"chunk:N with N > 0 or mr")
+
+
+class MetamorphicTestCaseChunk:
+    """
+    A range of the metamorphic test cases of one metamorphic relation and system under
+    test that is executed by a single pytest item. Metamorphic relations with lazy data
+    use one chunk for all of their test cases, as the test cases are only created when
+    the first test of the metamorphic relation runs.
+
+    Parameters
+    ----------
+    metamorphic_relation : MetamorphicRelation
+        The metamorphic relation of the test cases.
+    sut_id : str
+        The system under test of the test cases.
+    start : int
+        The index of the first test case of the chunk.
+    stop : Optional[int]
+        The index after the last test case of the chunk, None for all remaining ones.
+    """
+
+    def __init__(self, metamorphic_relation: "MetamorphicRelation", sut_id: str,
+                 start: int = 0, stop: Optional[int] = None):
+        self.metamorphic_relation = metamorphic_relation
+        self.sut_id = sut_id
+        self.start = start
+        self.stop = stop
+        self.outcomes: List[str] = []
+        """ The pytest outcome of each executed test case of the chunk """
+
+    @classmethod
+    def split(cls, metamorphic_relation: "MetamorphicRelation", sut_id: str,
+              chunk_size: int) -> List["MetamorphicTestCaseChunk"]:
+        """
+        Splits the test cases of a metamorphic relation and system under test into chunks
+        of chunk_size test cases, or a single chunk for WHOLE_RELATION.
+        """
+        number_of_test_cases = len(metamorphic_relation.test_cases[sut_id])
+        if chunk_size == WHOLE_RELATION:
+            return [cls(metamorphic_relation, sut_id, 0, number_of_test_cases)]
+        return [cls(metamorphic_relation, sut_id, start,
+                    min(start + chunk_size, number_of_test_cases))
+                for start in range(0, number_of_test_cases, chunk_size)]
+
+    @property
+    def test_cases(self) -> List[MetamorphicTestCase]:
+        return self.metamorphic_relation.test_cases[self.sut_id][self.start:self.stop]
+
+    @property
+    def name(self) -> str:
+        """
+        The names of the first and last test case of the chunk, used in the pytest id.
+        """
+        if self.stop is None:
+            return "lazy"
+        return f"mtc_{self.start + 1}-{self.stop}"
+
+    def mtc_name(self, index: int) -> str:
+        """
+        The name of the test case at the given index of the chunk, matching the names of
+        test cases that are executed by their own pytest item.
+        """
+        return f"mtc_{self.start + index + 1}"
+
+    def __repr__(self):
+        stop = "" if self.stop is None else self.stop
+        return f"MetamorphicTestCaseChunk({self.metamorphic_relation.mr_id}, " \
+               f"{self.sut_id}, {self.start}:{stop})"
@@ -0,0 +1,112 @@
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Mapping, Optional, Sequence, TYPE_CHECKING
+
+from .conftest import get_config_snapshot, use_config
+from .metamorphic_test_case import MetamorphicTestCase
+from .testcase_queue import InputQueue
+from .utils.rng import seed_thread_rng
+
+if TYPE_CHECKING:
+    from .metamorphic_relation import MetamorphicRelation
+
+
+class ThreadedTestCaseExecutor:
+    """
+    Executes the metamorphic test cases of a chunk on a pool of threads. On free-threaded
+    CPython builds (e.g. 3.13t), systems under test written in Python run in parallel; with
+    the GIL, only SUTs that release it (e.g. NumPy, PyTorch, OpenCV) overlap.
+
+    The test cases are split into one contiguous part per worker, and the queued inputs of
+    each part are moved from the shared ready queue into a queue of its own. A worker
+    fills its batches only from its own queue, so every test case is read and written by a
+    single thread, and the workers only share thread-safe state: the suite, the resource
+    cache, the prefetcher, the SUT executors and the read-only configuration. Each worker
+    uses its own random number generator, seeded from the random module of the calling
+    thread, so randomized transformations are reproducible for a given seed and number of
+    workers.
+
+    Parameters
+    ----------
+    workers : int
+        The number of threads executing test cases.
+    config : Optional[Mapping]
+        The read-only configuration the workers read, defaults to the snapshot of the
+        session.
+    """
+
+    def __init__(self, workers: int, config: Optional[Mapping] = None):
+        if workers < 1:
+            raise ValueError(f"The number of workers must be at least 1, got {workers}")
+        self.workers = workers
+        self.config = config if config is not None else get_config_snapshot()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix="gemtest-execute")
+            return self._executor
+
+    def split(self, test_cases: Sequence[MetamorphicTestCase]) \
+            -> List[Sequence[MetamorphicTestCase]]:
+        """
+        Splits the test cases into at most one contiguous, non-empty part per worker.
+        """
+        number_of_parts = min(self.workers, len(test_cases))
+        return [test_cases[len(test_cases) * i // number_of_parts:
+                           len(test_cases) * (i + 1) // number_of_parts]
+                for i in range(number_of_parts)]
+
+    @staticmethod
+    def _take_inputs(shared: InputQueue, test_cases: Sequence[MetamorphicTestCase]) \
+            -> InputQueue:
+        queue = InputQueue()
+        for mtc in test_cases:
+            for is_source in (True, False):
+                for item in shared.get_all_with_testcase(mtc, is_source):
+                    queue.append(item)
+        return queue
+
+    def _run(self, metamorphic_relation: "MetamorphicRelation", sut_id: str,
+             test_cases: Sequence[MetamorphicTestCase], queue: InputQueue, seed: int):
+        seed_thread_rng(seed)
+        with use_config(self.config), metamorphic_relation.thread_queue(sut_id, queue):
+            for mtc in test_cases:
+                metamorphic_relation.execute_test_case(mtc, sut_id)
+
+    def execute(self, metamorphic_relation: "MetamorphicRelation", sut_id: str,
+                test_cases: Sequence[MetamorphicTestCase]):
+        """
+        Executes the test cases of a system under test and waits until all of them are
+        executed. The first exception raised by a worker, e.g. the SystemExit of an error
+        in user code, is raised again after all workers finished.
+        """
+        parts = self.split(test_cases)
+        if len(parts) <= 1:
+            for mtc in test_cases:
+                metamorphic_relation.execute_test_case(mtc, sut_id)
+            return
+
+        shared = metamorphic_relation.ready_queue(sut_id)
+        queues = [self._take_inputs(shared, part) for part in parts]
+        seeds = [random.getrandbits(64) for _ in parts]  # nosec
+        executor = self._get_executor()
+        futures = [executor.submit(self._run, metamorphic_relation, sut_id, part, queue, seed)
+                   for part, queue, seed in zip(parts, queues, seeds)]
+        exceptions = [future.exception() for future in futures]
+        for exception in exceptions:
+            if exception is not None:
+                raise exception
+
+    def close(self):
+        """
+        Waits for running test cases and stops the worker threads.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
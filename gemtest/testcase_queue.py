@@ -1,10 +1,14 @@
-from collections import deque
-from typing import List
+import itertools
+import threading
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Iterable, Iterator, List, Tuple
 
 from .metamorphic_test_case import MetamorphicTestCase
 
 
 class InputQueueItem:
+    __slots__ = ("test_case", "index", "is_source")
+
     def __init__(self, test_case: MetamorphicTestCase, index: int, is_source: bool):
         self.test_case = test_case
         self.index = index
@@ -15,30 +19,106 @@ class InputQueueItem:
             return self.test_case.source_inputs[self.index]
         return self.test_case.followup_inputs[self.index]
 
-    def set_output(self, value):
+    def set_output(self, value) -> bool:
+        """
+        Sets the output of the input, returns True if this completes the outputs of the
+        same kind of the test case.
+        """
         if self.is_source:
-            self.test_case.source_outputs_set_at(self.index, value)
-        else:
-            self.test_case.followup_outputs_set_at(self.index, value)
+            return self.test_case.source_outputs_set_at(self.index, value)
+        return self.test_case.followup_outputs_set_at(self.index, value)
+
+
+class InputQueue:
+    """
+    The queue of inputs waiting for the system under test, in the order they are executed.
+
+    Besides the order of all items, the queue keeps the items of each test case, so taking
+    the inputs of a test case and removing any item are O(1) instead of a scan of the
+    whole queue, which would make executing the test cases of a relation quadratic.
+
+    All operations except iteration hold a lock, so the queue can be shared by threads.
+    Threads that need upcoming items while other threads modify the queue use peek
+    instead of iterating.
+
+    Parameters
+    ----------
+    items : Iterable[InputQueueItem]
+        The initial items of the queue.
+    """
+
+    def __init__(self, items: Iterable[InputQueueItem] = ()):
+        # ordered like a deque, but with O(1) removal of any item
+        self._items: "OrderedDict[InputQueueItem, None]" = OrderedDict()
+        # the items of each test case and kind, keyed by (id(test_case), is_source)
+        self._test_case_items: Dict[Tuple[int, bool], Deque[InputQueueItem]] = {}
+        self._lock = threading.Lock()
+        for item in items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[InputQueueItem]:
+        return iter(self._items)
+
+    def __getitem__(self, index: int) -> InputQueueItem:
+        with self._lock:
+            if index < 0:
+                index += len(self._items)
+            if not 0 <= index < len(self._items):
+                raise IndexError("queue index out of range")
+            return next(itertools.islice(self._items, index, None))
 
+    def peek(self, count: int) -> List[InputQueueItem]:
+        """
+        Returns the next count items of the queue without removing them.
+        """
+        with self._lock:
+            return list(itertools.islice(self._items, count))
+
+    def __repr__(self):
+        return f"InputQueue({list(self._items)!r})"
+
+    def append(self, item: InputQueueItem):
+        key = (id(item.test_case), item.is_source)
+        with self._lock:
+            self._items[item] = None
+            self._test_case_items.setdefault(key, deque()).append(item)
+
+    def popleft(self) -> InputQueueItem:
+        with self._lock:
+            if not self._items:
+                raise IndexError("pop from an empty queue")
+            item, _ = self._items.popitem(last=False)
+            # the first item of the queue is the first item of its test case
+            self._pop_test_case_items(item.test_case, item.is_source, 1)
+            return item
+
+    def _pop_test_case_items(self, mtc: MetamorphicTestCase, is_source: bool,
+                             max_items: int) -> List[InputQueueItem]:
+        key = (id(mtc), is_source)
+        items = self._test_case_items.get(key)
+        if not items:
+            return []
+        count = len(items) if max_items < 0 else min(max_items, len(items))
+        acc = [items.popleft() for _ in range(count)]
+        if not items:
+            del self._test_case_items[key]
+        return acc
 
-class InputQueue(deque):
     def get_all_with_testcase(
             self,
             mtc: MetamorphicTestCase,
             is_source: bool,
             max_items: int = -1,
     ) -> List[InputQueueItem]:
-        acc = []
-
-        for item in self:
-            if item.test_case is mtc and item.is_source == is_source:
-                acc.append(item)
-
-            if max_items == len(acc):
-                break
-
-        for item in acc:
-            self.remove(item)
-
-        return acc
+        """
+        Removes and returns the first max_items source or follow-up inputs of the test
+        case, or all of them if max_items is negative.
+        """
+        with self._lock:
+            acc = self._pop_test_case_items(mtc, is_source, max_items)
+            for item in acc:
+                del self._items[item]
+            return acc
@@ -1,5 +1,17 @@
-from .data_loaders import load_image_resource
+from typing import TYPE_CHECKING
+
+from .lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .data_loaders import load_image_resource, load_image_resources
+
+# OpenCV and NumPy are only imported when a data loader is used
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'load_image_resource': '.data_loaders',
+    'load_image_resources': '.data_loaders',
+})
 
 __all__ = [
     'load_image_resource',
+    'load_image_resources',
 ]
@@ -1,24 +1,104 @@
+import struct
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
 
 import cv2  # type: ignore
 import numpy as np
 
 from gemtest.metamorphic_error import InvalidInputError
 
+SUPPORTED_FILE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".ppm")
 
-def load_image_resource(input_path: str):
+_REDUCED_READ_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# JPEG start of frame markers, which hold the image dimensions
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                     0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def _read_jpeg_size(file) -> Optional[Tuple[int, int]]:
+    file.seek(2)
+    while True:
+        marker = file.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        length_bytes = file.read(2)
+        if len(length_bytes) < 2:
+            return None
+        (length,) = struct.unpack(">H", length_bytes)
+        if marker[1] in _JPEG_SOF_MARKERS:
+            frame = file.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack(">xHH", frame)
+            return width, height
+        file.seek(length - 2, 1)
+
+
+def read_image_size(input_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Reads the (width, height) of a .png or .jpg image from its header without decoding
+    the image. Returns None for other formats or malformed headers.
+    """
+    with open(input_path, "rb") as file:
+        header = file.read(24)
+        if header[:8] == _PNG_SIGNATURE and header[12:16] == b"IHDR":
+            width, height = struct.unpack(">II", header[16:24])
+            return width, height
+        if header[:2] == b"\xff\xd8":
+            return _read_jpeg_size(file)
+    return None
+
+
+def _reduction_for_size(input_path: str, size: Tuple[int, int]) -> int:
+    """
+    Returns the largest reduction factor that decodes the image to at least the given
+    (width, height).
+    """
+    image_size = read_image_size(input_path)
+    if image_size is None:
+        return 1
+    width, height = image_size
+    for reduce in (8, 4, 2):
+        if -(-width // reduce) >= size[0] and -(-height // reduce) >= size[1]:
+            return reduce
+    return 1
+
+
+def load_image_resource(input_path: str, reduce: int = 1,
+                        size: Optional[Tuple[int, int]] = None,
+                        dtype: Optional[np.dtype] = None) -> np.ndarray:
     """
-    Load an image resource from a file path.
+    Load an image resource from a file path. The image is decoded and converted to RGB in
+    a single buffer, decoders that support it (e.g. JPEG) decode directly at a reduced
+    resolution.
 
     Parameters
     ----------
     input_path : str
         The path to the image file to be loaded.
+    reduce : int
+        Decodes the image at 1/reduce of its resolution, one of 1, 2, 4 or 8.
+    size : Optional[Tuple[int, int]]
+        The (width, height) of the returned image. The image is decoded at the smallest
+        reduced resolution that is at least this size and then resized.
+    dtype : Optional[np.dtype]
+        The dtype of the returned image, the values are not rescaled.
 
     Raises
     ------
     InvalidInputError
-        If the file is not a valid image file.
+        If the file extension is not supported.
+    ValueError
+        If the file can not be decoded, e.g. a corrupt image. It is handled like other
+        errors of the system under test, according to --gmt-on-error.
 
     Returns
     -------
@@ -27,10 +107,49 @@ def load_image_resource(input_path: str):
     """
     file_extension = Path(input_path).suffix.lower()
     # expand to more file formats if required
-    if file_extension not in (".png", ".jpg", ".jpeg", ".ppm"):
+    if file_extension not in SUPPORTED_FILE_EXTENSIONS:
         raise InvalidInputError(f"This data loader only supports lazy loading of .png, "
                                 f".jpg, .jpeg and .ppm files. File at {input_path} is "
                                 f"not supported.")
-    image = cv2.imread(input_path)
-    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    return np.array(image_rgb)
+    if reduce not in _REDUCED_READ_FLAGS:
+        raise ValueError(f"reduce must be one of {sorted(_REDUCED_READ_FLAGS)}, "
+                         f"got {reduce}")
+    if size is not None and reduce == 1:
+        reduce = _reduction_for_size(input_path, size)
+
+    image = cv2.imread(input_path, _REDUCED_READ_FLAGS[reduce])
+    if image is None:
+        raise ValueError(f"The image file at {input_path} could not be decoded.")
+
+    if size is not None and image.shape[1::-1] != tuple(size):
+        image = cv2.resize(image, tuple(size), interpolation=cv2.INTER_AREA)
+    cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
+
+    if dtype is not None:
+        image = image.astype(dtype, copy=False)
+    return image
+
+
+def load_image_resources(input_paths: Sequence[str], workers: Optional[int] = None,
+                         **kwargs) -> List[np.ndarray]:
+    """
+    Loads multiple image resources in parallel. OpenCV releases the GIL while decoding,
+    so the images are decoded on a thread pool.
+
+    Parameters
+    ----------
+    input_paths : Sequence[str]
+        The paths to the image files to be loaded.
+    workers : Optional[int]
+        The number of decoding threads, defaults to the ThreadPoolExecutor default.
+    **kwargs
+        Passed to load_image_resource, e.g. reduce, size or dtype.
+
+    Returns
+    -------
+    List[np.ndarray]
+        The images in the order of input_paths.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda path: load_image_resource(path, **kwargs),
+                                 input_paths))
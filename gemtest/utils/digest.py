@@ -0,0 +1,94 @@
+import hashlib
+import struct
+from pathlib import PurePath
+from typing import Any, Callable, Optional
+
+
+class NotDigestibleError(TypeError):
+    """
+    Raised for values that have no canonical encoding.
+    """
+
+
+def _encode_items(items, write: Callable[[bytes], None], tag: bytes):
+    write(tag + struct.pack("<q", len(items)))
+    for item in items:
+        _encode(item, write)
+
+
+def _encode_sorted(values, write: Callable[[bytes], None], tag: bytes):
+    # the order of sets and mappings is not stable across processes, their elements are
+    # encoded separately and sorted by their encoding
+    encodings = []
+    for value in values:
+        parts = []
+        _encode(value, parts.append)
+        encodings.append(b"".join(parts))
+    write(tag + struct.pack("<q", len(encodings)))
+    for encoding in sorted(encodings):
+        write(struct.pack("<q", len(encoding)) + encoding)
+
+
+def _encode_array(value: Any, write: Callable[[bytes], None]):
+    if value.dtype.hasobject:
+        raise NotDigestibleError("arrays of objects have no canonical encoding")
+    dtype = value.dtype.str.encode()
+    write(b"A" + struct.pack("<q", len(dtype)) + dtype
+          + struct.pack("<q", value.ndim) + struct.pack(f"<{value.ndim}q", *value.shape))
+    # tobytes returns the elements in C order for every memory layout
+    write(value.tobytes())
+
+
+def _encode_text(tag: bytes, text: str, write: Callable[[bytes], None]):
+    data = text.encode("utf-8", "surrogatepass")
+    write(tag + struct.pack("<q", len(data)) + data)
+
+
+def _encode(value: Any, write: Callable[[bytes], None]):
+    if value is None:
+        write(b"N")
+    elif isinstance(value, bool):
+        write(b"T" if value else b"F")
+    elif isinstance(value, (int, float, complex)):
+        _encode_text(type(value).__name__[:1].encode(), repr(value), write)
+    elif isinstance(value, str):
+        _encode_text(b"s", value, write)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+        write(b"b" + struct.pack("<q", len(data)) + data)
+    elif isinstance(value, range):
+        _encode_text(b"r", f"{value.start}:{value.stop}:{value.step}", write)
+    elif isinstance(value, PurePath):
+        _encode_text(b"p", value.as_posix(), write)
+    elif isinstance(value, tuple):
+        _encode_items(value, write, b"t")
+    elif isinstance(value, list):
+        _encode_items(value, write, b"l")
+    elif isinstance(value, dict):
+        _encode_sorted(value.items(), write, b"d")
+    elif isinstance(value, (set, frozenset)):
+        _encode_sorted(value, write, b"S")
+    elif type(value).__module__ == "numpy" and hasattr(value, "dtype") \
+            and hasattr(value, "tobytes"):
+        # arrays and scalars, NumPy is not imported for this check
+        _encode_array(value, write)
+    else:
+        raise NotDigestibleError(f"{type(value).__name__} has no canonical encoding")
+
+
+def canonical_digest(value: Any) -> Optional[str]:
+    """
+    Returns the SHA-256 digest of a canonical encoding of value, which is the same in
+    every process, or None if the value has no canonical encoding. Supported are None,
+    numbers, strings, bytes, ranges, paths, NumPy arrays and scalars without objects, and
+    tuples, lists, dicts, sets and frozensets of them. Mappings and sets are encoded with
+    sorted elements, arrays with their dtype, shape and elements. Values of other types,
+    e.g. functions or objects compared by identity, are not digested, since their pickle
+    bytes or representation may differ between processes.
+    """
+    digest = hashlib.sha256()
+    try:
+        _encode(value, digest.update)
+    except (NotDigestibleError, RecursionError):
+        return None
+    return digest.hexdigest()
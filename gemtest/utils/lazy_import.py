@@ -0,0 +1,37 @@
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+HEAVY_MODULES = ("numpy", "matplotlib", "cv2")
+""" The modules that must not be imported by `import gemtest`, i.e. by every pytest run """
+
+
+def lazy_attributes(package: str, attributes: Dict[str, str]) \
+        -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """
+    Creates the module __getattr__ and __dir__ functions (PEP 562) of a package whose
+    attributes are imported from their submodules on first access. gemtest is imported
+    by every pytest run as a plugin, so submodules with heavy dependencies, e.g.
+    matplotlib or OpenCV, are only imported when they are used.
+
+    Parameters
+    ----------
+    package : str
+        The name of the package, i.e. __name__ of its __init__ module.
+    attributes : Dict[str, str]
+        Maps each lazy attribute to the submodule defining it, relative to the package.
+    """
+
+    def __getattr__(name: str) -> object:
+        module_name = attributes.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        # later accesses do not go through __getattr__ anymore
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(attributes))
+
+    return __getattr__, __dir__
@@ -0,0 +1,75 @@
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Hashable, Iterable, Optional
+
+from .resource_cache import get_resource_cache
+
+
+class Prefetcher:
+    """
+    Loads the source inputs of upcoming queue items on a thread pool while the system
+    under test executes the current batch. Loaded inputs are stored in the process-wide
+    resource cache, so the following accesses of the source inputs are cache hits. Loaders
+    that release the GIL, like cv2.imread, overlap with the execution of the SUT.
+
+    Parameters
+    ----------
+    depth : int
+        The number of batches to look ahead in the ready queue.
+    workers : Optional[int]
+        The number of threads loading inputs, defaults to the ThreadPoolExecutor default.
+    """
+
+    def __init__(self, depth: int, workers: Optional[int] = None):
+        self.depth = depth
+        self.workers = workers
+        self.submitted = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                thread_name_prefix="gemtest-prefetch")
+        return self._executor
+
+    def prefetch(self, items: Iterable, batch_size: int = 1):
+        """
+        Submits the loading of the source inputs of the next `depth` batches of items.
+        Inputs that are already cached or being loaded are skipped.
+
+        Parameters
+        ----------
+        items : Iterable[InputQueueItem]
+            The items of the ready queue, in the order they are executed.
+        batch_size : int
+            The batch size of the system under test.
+        """
+        cache = get_resource_cache()
+        with self._lock:
+            self._pending = {key: future for key, future in self._pending.items()
+                             if not future.done()}
+            for item in itertools.islice(items, self.depth * max(batch_size, 1)):
+                if not item.is_source:
+                    continue
+                paths = item.test_case.source_input_paths
+                if paths is None:
+                    continue
+                path, loader = paths[item.index], item.test_case.data_loader
+                key = cache.key(path, loader)
+                if key in self._pending or cache.is_loaded_or_loading(key):
+                    continue
+                self._pending[key] = self._get_executor().submit(cache.get, path, loader)
+                self.submitted += 1
+
+    def close(self):
+        """
+        Waits for all submitted loads and stops the worker threads.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            self._pending.clear()
@@ -0,0 +1,133 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def _size_of(resource: Any) -> int:
+    nbytes = getattr(resource, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(resource)
+
+
+def _make_read_only(resource: Any):
+    set_flags = getattr(resource, "setflags", None)
+    if callable(set_flags):
+        set_flags(write=False)
+
+
+class ResourceCache:
+    """
+    A least recently used cache of resources loaded by a data loader, bounded by the total
+    number of bytes of the cached resources. Resources are keyed by the data loader, the
+    file path and the modification time of the file, so changed files are loaded again.
+    Cached numpy arrays are made read-only, as they are shared by all metamorphic test
+    cases using the same file.
+
+    Parameters
+    ----------
+    max_bytes : int
+        The maximum total size of the cached resources. Resources larger than this are
+        loaded but not cached.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: dict = {}
+        self._size = 0
+        self._loading: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """
+        The total number of bytes of the cached resources.
+        """
+        return self._size
+
+    @staticmethod
+    def key(path: str, loader: Callable) -> Hashable:
+        return loader, path, os.stat(path).st_mtime_ns
+
+    def lookup(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def get(self, path: str, loader: Callable) -> Any:
+        """
+        Returns the resource at path loaded by loader, loading it on a cache miss. If the
+        resource is already being loaded by another thread, e.g. by a prefetcher, waits
+        for that thread instead of loading the resource a second time.
+        """
+        key = self.key(path, loader)
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key]
+                loading = self._loading.get(key)
+                if loading is None:
+                    self._loading[key] = threading.Event()
+                    break
+            # the resource might not be cached after the wait if it exceeds the budget,
+            # in that case it is loaded by this thread
+            loading.wait()
+
+        try:
+            resource = loader(path)
+            _make_read_only(resource)
+            self.add(key, resource)
+        finally:
+            with self._lock:
+                self._loading.pop(key).set()
+        return resource
+
+    def is_loaded_or_loading(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries or key in self._loading
+
+    def add(self, key: Hashable, resource: Any):
+        size = _size_of(resource)
+        with self._lock:
+            self.misses += 1
+            if size > self.max_bytes or key in self._entries:
+                return
+            self._entries[key] = resource
+            self._sizes[key] = size
+            self._size += size
+            while self._size > self.max_bytes:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._size -= self._sizes.pop(evicted_key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+
+_resource_cache = ResourceCache()
+
+
+def get_resource_cache() -> ResourceCache:
+    """
+    Returns the process-wide cache of loaded resources.
+    """
+    return _resource_cache
@@ -0,0 +1,55 @@
+import random
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+_thread_state = threading.local()
+
+
+def get_rng() -> Any:
+    """
+    Returns the random number generator of the current thread. The main thread uses the
+    random module, so random.seed() makes it reproducible. Other threads use their own
+    random.Random instance, which is seeded from the random module on first use unless it
+    was seeded with seed_thread_rng. Threads never share a generator, so they neither
+    contend for it nor change each other's sequence of random numbers.
+
+    Returns
+    -------
+    Any
+        The random module or a random.Random instance.
+    """
+    rng = getattr(_thread_state, "rng", None)
+    if rng is not None:
+        return rng
+    if threading.current_thread() is threading.main_thread():
+        return random
+    rng = _thread_state.rng = random.Random(random.getrandbits(64))  # nosec
+    return rng
+
+
+def seed_thread_rng(seed: Any):
+    """
+    Replaces the random number generator of the current thread with one seeded with seed.
+    """
+    _thread_state.rng = random.Random(seed)  # nosec
+
+
+@contextmanager
+def use_rng(rng: Optional[random.Random]) -> Iterator[None]:
+    """
+    Makes get_rng return rng on the current thread within the context, e.g. a generator
+    seeded for a single metamorphic test case. Does nothing if rng is None.
+    """
+    if rng is None:
+        yield
+        return
+    previous = getattr(_thread_state, "rng", None)
+    _thread_state.rng = rng
+    try:
+        yield
+    finally:
+        if previous is None:
+            del _thread_state.rng
+        else:
+            _thread_state.rng = previous
@@ -1,16 +1,46 @@
 import importlib
 import importlib.util
+import queue
 import sys
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Hashable, Iterator, List, Tuple
 
 from gemtest.conftest import get_conftest_config
 
 
-def get_sut():
+def get_sut(*args, **kwargs):
+    """
+    Returns the process-wide instance of the dynamic SUT configured via --sut_filepath and
+    --sut_class. The SUT is only loaded and instantiated once per set of constructor
+    arguments, every further call returns the cached instance.
+    """
     sut_filepath = get_conftest_config().get("sut_filepath")
     sut_class = get_conftest_config().get("sut_class")
-    return load_sut_from_path(filepath=Path(sut_filepath),
-                              class_name=sut_class)
+    return SUTRegistry().get(Path(sut_filepath), sut_class, *args, **kwargs)
+
+
+def get_sut_pool(size: int, *args, **kwargs) -> "SUTPool":
+    """
+    Returns the process-wide pool of `size` instances of the dynamic SUT configured via
+    --sut_filepath and --sut_class.
+    """
+    sut_filepath = get_conftest_config().get("sut_filepath")
+    sut_class = get_conftest_config().get("sut_class")
+    return SUTRegistry().get_pool(Path(sut_filepath), sut_class, size, *args, **kwargs)
+
+
+def warmup_sut(*args, **kwargs):
+    """
+    Loads the dynamic SUT configured via --sut_filepath and --sut_class and calls its
+    `warmup()` method, if the SUT class defines one. Can be called explicitly, e.g. in a
+    session fixture, to pay the start-up costs of the SUT before the first test runs.
+    """
+    sut_filepath = get_conftest_config().get("sut_filepath")
+    sut_class = get_conftest_config().get("sut_class")
+    return SUTRegistry().warmup(Path(sut_filepath), sut_class, *args, **kwargs)
 
 
 def load_module(filepath: Path):
@@ -31,3 +61,130 @@ def load_sut_from_path(filepath: Path, class_name="SUT"):
     sut_module = load_module(filepath)
     sut_obj = getattr(sut_module, class_name)
     return sut_obj()
+
+
+class SUTPool:
+    """
+    A fixed number of instances of the same SUT class. Each instance is handed out to at
+    most one thread at a time, which allows running a SUT that is not thread-safe on
+    multiple threads.
+    """
+
+    def __init__(self, instances: List[Any]):
+        self._instances = list(instances)
+        self._available: "queue.Queue[Any]" = queue.Queue()
+        for instance in self._instances:
+            self._available.put(instance)
+
+    def __len__(self):
+        return len(self._instances)
+
+    @property
+    def instances(self) -> List[Any]:
+        return list(self._instances)
+
+    @contextmanager
+    def acquire(self) -> Iterator[Any]:
+        """
+        Blocks until an instance is available and returns it to the pool afterwards.
+        """
+        instance = self._available.get()
+        try:
+            yield instance
+        finally:
+            self._available.put(instance)
+
+
+class SUTRegistry:
+    """
+    A singleton class that holds all dynamically loaded SUT instances of the process.
+
+    SUT modules are executed once per file path and SUT instances are created once per
+    (file path, class name, constructor arguments), so heavy SUTs, e.g. SUTs loading large
+    models in their constructor, are not loaded again for every test module.
+    """
+
+    _modules: Dict[Path, ModuleType]
+    _instances: Dict[Hashable, Any]
+    _pools: Dict[Hashable, SUTPool]
+    _warm: set
+    _lock: threading.RLock
+
+    def __new__(cls):
+        if not hasattr(cls, 'instance'):
+            cls.instance = super(SUTRegistry, cls).__new__(cls)
+            cls.instance._modules = {}
+            cls.instance._instances = {}
+            cls.instance._pools = {}
+            cls.instance._warm = set()
+            cls.instance._lock = threading.RLock()
+        return cls.instance
+
+    @staticmethod
+    def _key(filepath: Path, class_name: str, args: Tuple, kwargs: Dict) -> Hashable:
+        return str(filepath.resolve()), class_name, args, tuple(sorted(kwargs.items()))
+
+    def _load_class(self, filepath: Path, class_name: str):
+        resolved = filepath.resolve()
+        if resolved not in self._modules:
+            self._modules[resolved] = load_module(filepath)
+        return getattr(self._modules[resolved], class_name)
+
+    def get(self, filepath: Path, class_name: str = "SUT", *args, **kwargs) -> Any:
+        """
+        Returns the cached SUT instance for the given file, class and constructor
+        arguments. Loads the module and instantiates the class on the first call.
+        Constructor arguments must be hashable.
+        """
+        key = self._key(filepath, class_name, args, kwargs)
+        with self._lock:
+            if key not in self._instances:
+                sut_class = self._load_class(filepath, class_name)
+                self._instances[key] = sut_class(*args, **kwargs)
+            return self._instances[key]
+
+    def get_pool(self, filepath: Path, class_name: str, size: int, *args,
+                 **kwargs) -> SUTPool:
+        """
+        Returns a cached pool of `size` SUT instances. The first instance of the pool is
+        the instance returned by `get` for the same arguments.
+        """
+        if size < 1:
+            raise ValueError(f"SUT pool size must be at least 1, got {size}")
+        key = (self._key(filepath, class_name, args, kwargs), size)
+        with self._lock:
+            if key not in self._pools:
+                sut_class = self._load_class(filepath, class_name)
+                instances = [self.get(filepath, class_name, *args, **kwargs)]
+                instances.extend(sut_class(*args, **kwargs) for _ in range(size - 1))
+                for instance in instances:
+                    self._warmup_instance(instance)
+                self._pools[key] = SUTPool(instances)
+            return self._pools[key]
+
+    def warmup(self, filepath: Path, class_name: str = "SUT", *args, **kwargs) -> Any:
+        """
+        Returns the cached SUT instance after calling its `warmup()` method once.
+        """
+        instance = self.get(filepath, class_name, *args, **kwargs)
+        with self._lock:
+            self._warmup_instance(instance)
+        return instance
+
+    def _warmup_instance(self, instance: Any):
+        if id(instance) in self._warm:
+            return
+        warmup = getattr(instance, "warmup", None)
+        if callable(warmup):
+            warmup()
+        self._warm.add(id(instance))
+
+    def clear(self):
+        """
+        Drops all cached modules, instances and pools.
+        """
+        with self._lock:
+            self._modules.clear()
+            self._instances.clear()
+            self._pools.clear()
+            self._warm.clear()
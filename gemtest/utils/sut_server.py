@@ -0,0 +1,186 @@
+import argparse
+import os
+import pickle  # nosec
+import socket
+import socketserver
+import stat
+import struct
+import threading
+from pathlib import Path
+from typing import Any, List
+
+from .sut_loader import SUTRegistry
+
+_HEADER = struct.Struct("!QI")
+_BUFFER_LENGTH = struct.Struct("!Q")
+
+
+class RemoteSUTError(Exception):
+    """
+    Raised by a RemoteSUT if the call on the SUT server raised an exception.
+    """
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytearray:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], size - received)
+        if count == 0:
+            raise ConnectionError("SUT server connection closed")
+        received += count
+    return buffer
+
+
+def send_message(sock: socket.socket, message: Any):
+    """
+    Sends a message using pickle protocol 5 with out-of-band buffers. Contiguous buffers,
+    e.g. the data of numpy arrays, are written directly to the socket without being copied
+    into the pickle stream.
+    """
+    buffers: List[pickle.PickleBuffer] = []
+    payload = pickle.dumps(message, protocol=5, buffer_callback=buffers.append)
+    raw_buffers = [buffer.raw() for buffer in buffers]
+    header = _HEADER.pack(len(payload), len(raw_buffers)) + b"".join(
+        _BUFFER_LENGTH.pack(raw.nbytes) for raw in raw_buffers
+    )
+    sock.sendall(header)
+    sock.sendall(payload)
+    for raw in raw_buffers:
+        sock.sendall(raw)
+
+
+def recv_message(sock: socket.socket) -> Any:
+    """
+    Receives a message sent by `send_message`. Out-of-band buffers are received into
+    pre-allocated memory and handed to pickle, so arrays are reconstructed without copies.
+    """
+    payload_length, buffer_count = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    buffer_lengths = [
+        _BUFFER_LENGTH.unpack(_recv_exactly(sock, _BUFFER_LENGTH.size))[0]
+        for _ in range(buffer_count)
+    ]
+    payload = _recv_exactly(sock, payload_length)
+    buffers = [_recv_exactly(sock, length) for length in buffer_lengths]
+    # Messages are only exchanged over a local unix socket owned by the current user.
+    return pickle.loads(payload, buffers=buffers)  # nosec
+
+
+class RemoteSUT:
+    """
+    Client side proxy of a SUT served by `gemtest-sut-server`. Every method call on the
+    proxy is forwarded to the SUT instance of the server, e.g. `remote_sut.execute(batch)`.
+    Each thread uses its own connection to the server.
+    """
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)  # type: ignore
+            sock.connect(self.endpoint)
+            self._local.sock = sock
+        return sock
+
+    def call(self, method: str, *args, **kwargs) -> Any:
+        sock = self._connection()
+        try:
+            send_message(sock, (method, args, kwargs))
+            is_error, value = recv_message(sock)
+        except (ConnectionError, OSError):
+            self.close()
+            raise
+        if is_error:
+            raise RemoteSUTError(value)
+        return value
+
+    def close(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+
+
+class _SUTRequestHandler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        while True:
+            try:
+                method, args, kwargs = recv_message(self.request)
+            except ConnectionError:
+                return
+            try:
+                with self.server.sut_pool.acquire() as sut:  # type: ignore
+                    value = getattr(sut, method)(*args, **kwargs)
+                send_message(self.request, (False, value))
+            except Exception as e:  # noqa
+                send_message(self.request, (True, f"{type(e).__name__}: {e}"))
+
+
+def _remove_socket(path: str):
+    """
+    Removes a stale unix socket, but never a file of another kind at the same path.
+    """
+    try:
+        if stat.S_ISSOCK(os.lstat(path).st_mode):
+            os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class SUTServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):  # type: ignore
+    """
+    Keeps a dynamic SUT resident and serves calls of `RemoteSUT` clients over a unix
+    socket. Calls are executed on a pool of SUT instances, each instance is used by at
+    most one connection at a time. The socket is only accessible to the current user.
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, sut_filepath: Path, sut_class: str,
+                 pool_size: int = 1):
+        self.sut_pool = SUTRegistry().get_pool(sut_filepath, sut_class, pool_size)
+        _remove_socket(socket_path)
+        super().__init__(socket_path, _SUTRequestHandler)
+
+    def server_bind(self):
+        # created with mode 0600, a chmod after bind leaves a window for other users
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    def server_close(self):
+        super().server_close()
+        _remove_socket(self.server_address)  # type: ignore
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="gemtest-sut-server",
+        description="Keeps a dynamic SUT resident and serves it to gemtest runs started "
+                    "with --sut_endpoint."
+    )
+    parser.add_argument("--sut_filepath", required=True, help="Set SUT filepath")
+    parser.add_argument("--sut_class", required=True, help="Set SUT classname")
+    parser.add_argument("--socket", required=True, help="Path of the unix socket")
+    parser.add_argument("--pool_size", type=int, default=1,
+                        help="Number of SUT instances serving calls in parallel")
+    args = parser.parse_args(argv)
+
+    with SUTServer(args.socket, Path(args.sut_filepath), args.sut_class,
+                   args.pool_size) as server:
+        print(f"Serving {args.sut_class} on {args.socket}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -1,2 +1,53 @@
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+_thread_state = threading.local()
+
+
 def wrong_skip_method_used(*_, **__):
     raise SystemExit("The usage of pytest.skip() is prohibited. Use gmt.skip() instead.")
+
+
+class _GuardedSkip:
+    """
+    Replaces pytest.skip and raises the SystemExit of wrong_skip_method_used while the
+    current thread executes a metamorphic test case. Otherwise, and for all attributes
+    (e.g. pytest.skip.Exception), it behaves like the original pytest.skip.
+    """
+
+    def __init__(self, skip: Any):
+        self.skip = skip
+
+    def __call__(self, *args, **kwargs):
+        if getattr(_thread_state, "prohibited", False):
+            wrong_skip_method_used()
+        return self.skip(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.skip, name)
+
+
+def install_skip_guard():
+    """
+    Replaces pytest.skip with a guard, once per process. The guard only blocks calls on
+    threads within prohibit_pytest_skip, so pytest.skip is never swapped while tests run.
+    """
+    import pytest  # noqa
+
+    if not isinstance(pytest.skip, _GuardedSkip):
+        pytest.skip = _GuardedSkip(pytest.skip)  # type: ignore
+
+
+@contextmanager
+def prohibit_pytest_skip() -> Iterator[None]:
+    """
+    Makes pytest.skip raise a SystemExit on the current thread within the context, user
+    code of metamorphic test cases must call gmt.skip instead.
+    """
+    previous = getattr(_thread_state, "prohibited", False)
+    _thread_state.prohibited = True
+    try:
+        yield
+    finally:
+        _thread_state.prohibited = previous
@@ -0,0 +1,274 @@
+import gc
+import subprocess  # nosec
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from gemtest.columnar import ColumnarStore
+from gemtest.metamorphic_relation import MetamorphicRelation
+from gemtest.metamorphic_test_case import MetamorphicTestCase, UninitializedValue
+from gemtest.testcase_executor import ThreadedTestCaseExecutor
+from gemtest.testcase_queue import InputQueueItem
+from gemtest.testing_strategy import TestingStrategy
+from gemtest.utils.lazy_import import HEAVY_MODULES
+
+NUMBER_OF_OBJECTS = 100_000
+
+
+@dataclass
+class DataclassMetamorphicTestCase:
+    """
+    The previous layout of MetamorphicTestCase: a dataclass with an instance dict and
+    eagerly allocated containers.
+    """
+    _source_inputs: List = field(default_factory=list)
+    _followup_inputs: List = field(default_factory=list)
+    _source_outputs: List = field(default_factory=list)
+    _followup_outputs: List = field(default_factory=list)
+    _parameters: Dict = field(default_factory=dict)
+    _relation_result: bool = False
+    _report: Optional[object] = None
+    _error: Optional[Exception] = None
+    data_loader: Optional[Callable] = None
+
+
+class DictInputQueueItem:
+    """
+    The previous layout of InputQueueItem with an instance dict.
+    """
+
+    def __init__(self, test_case, index: int, is_source: bool):
+        self.test_case = test_case
+        self.index = index
+        self.is_source = is_source
+
+
+def _bytes_per_object(create: Callable) -> float:
+    gc.collect()
+    tracemalloc.start()
+    objects = [create(i) for i in range(NUMBER_OF_OBJECTS)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # exclude the list holding the objects
+    return (size - objects.__sizeof__()) / NUMBER_OF_OBJECTS
+
+
+def _dataclass_template(i: int) -> DataclassMetamorphicTestCase:
+    mtc = DataclassMetamorphicTestCase()
+    mtc._source_inputs = [i]
+    mtc._source_outputs = [UninitializedValue]
+    return mtc
+
+
+def _slotted_template(i: int) -> MetamorphicTestCase:
+    mtc = MetamorphicTestCase()
+    mtc.source_inputs = [i]
+    return mtc
+
+
+def _execute(mtc):
+    mtc.source_outputs_set_at(0, float(mtc.source_input))
+    mtc.followup_inputs = [mtc.source_input + 1]
+    mtc.followup_outputs_set_at(0, float(mtc.followup_input))
+    mtc.relation_result = True
+    return mtc
+
+
+def _executed_slotted_test_case(i: int) -> MetamorphicTestCase:
+    return _execute(_slotted_template(i))
+
+
+def _bytes_per_columnar_test_case(executed: bool) -> float:
+    """
+    Measures a columnar store with one row per test case including its row views.
+    """
+    gc.collect()
+    tracemalloc.start()
+    store = ColumnarStore(range(NUMBER_OF_OBJECTS),
+                          np.arange(NUMBER_OF_OBJECTS, dtype=np.int64).reshape(-1, 1),
+                          np.zeros(NUMBER_OF_OBJECTS, dtype=np.int64), [{}])
+    for mtc in store.test_cases:
+        if executed:
+            _execute(mtc)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (size - store.test_cases.__sizeof__()) / NUMBER_OF_OBJECTS
+
+
+def memory() -> None:
+    """
+    Prints the memory used per metamorphic test case template with a single source input
+    and per queue item, for the previous and the current layouts. Executed test cases
+    additionally hold a source output, a follow-up input and a follow-up output.
+    """
+    rows = [
+        ("MetamorphicTestCase (dataclass)", _bytes_per_object(_dataclass_template)),
+        ("MetamorphicTestCase (slots)", _bytes_per_object(_slotted_template)),
+        ("MetamorphicTestCase (columnar)", _bytes_per_columnar_test_case(executed=False)),
+        ("Executed MTC (slots)", _bytes_per_object(_executed_slotted_test_case)),
+        ("Executed MTC (columnar)", _bytes_per_columnar_test_case(executed=True)),
+        ("InputQueueItem (dict)",
+         _bytes_per_object(lambda i: DictInputQueueItem(None, i, True))),
+        ("InputQueueItem (slots)",
+         _bytes_per_object(lambda i: InputQueueItem(None, i, True))),  # type: ignore
+    ]
+    print(f"Bytes per object, measured over {NUMBER_OF_OBJECTS} objects")
+    for name, size in rows:
+        print(f"{name:<35}{size:>10.1f}")
+
+
+def _import_times(module: str) -> Dict[str, int]:
+    """
+    Imports the module in a fresh interpreter and returns the cumulative import time in
+    microseconds of every imported module.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True)  # nosec
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def import_time() -> None:
+    """
+    Prints the time it takes to import gemtest and the slowest modules it imports, and
+    fails if one of the heavy optional dependencies is imported eagerly.
+    """
+    times = _import_times("gemtest")
+    print(f"import gemtest: {times['gemtest'] / 1000:.1f} ms")
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[1:11]
+    for name, cumulative in slowest:
+        print(f"{name:<45}{cumulative / 1000:>10.1f} ms")
+    eager = [module for module in HEAVY_MODULES if module in times]
+    if eager:
+        raise SystemExit(f"import gemtest eagerly imports {', '.join(eager)}")
+
+
+NUMBER_OF_ITEMS = 20_000
+
+# a metamorphic relation whose test cases do (almost) nothing, so the run time of a pytest
+# session is the overhead of collecting and running its items
+NO_OP_TEST_MODULE = f"""
+import gemtest as gmt
+
+mr = gmt.create_metamorphic_relation(name="no_op", data=range({NUMBER_OF_ITEMS}))
+
+
+@gmt.transformation(mr)
+def transform(source_input):
+    return source_input
+
+
+@gmt.relation(mr)
+def relation(source_output, followup_output):
+    return True
+
+
+@gmt.system_under_test(mr)
+def test_no_op(x):
+    return x
+"""
+
+
+def _run_pytest(test_file: Path, *options: str) -> float:
+    """
+    Runs pytest on the test file in a fresh interpreter and returns the wall time.
+    """
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider",
+                    str(test_file), *options],
+                   capture_output=True, check=True)  # nosec
+    return time.perf_counter() - start
+
+
+def _run_gemtest(test_file: Path) -> float:
+    """
+    Runs the test file with the gemtest runner in a fresh interpreter and returns the wall
+    time.
+    """
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "gemtest", "run", str(test_file)],
+                   capture_output=True, check=True)  # nosec
+    return time.perf_counter() - start
+
+
+def throughput() -> None:
+    """
+    Prints the number of no-op metamorphic test cases executed per second, i.e. the
+    per-item overhead of pytest and the gemtest hooks, with one item per test case, with
+    chunks of test cases per item and with the runner of gemtest run.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        test_file = Path(directory) / "test_no_op.py"
+        test_file.write_text(NO_OP_TEST_MODULE)
+        print(f"Executed {NUMBER_OF_ITEMS} no-op metamorphic test cases")
+        for granularity in ("mtc", "chunk:1000"):
+            option = f"--gmt-granularity={granularity}"
+            collection = _run_pytest(test_file, option, "--collect-only")
+            run = _run_pytest(test_file, option)
+            print(f"{granularity:<15}{run:>8.2f} s{NUMBER_OF_ITEMS / run:>12.0f} MTCs/s, "
+                  f"{NUMBER_OF_ITEMS / max(run - collection, 1e-3):.0f} MTCs/s "
+                  f"excluding collection")
+        run = _run_gemtest(test_file)
+        print(f"{'gemtest run':<15}{run:>8.2f} s{NUMBER_OF_ITEMS / run:>12.0f} MTCs/s")
+
+
+NUMBER_OF_THREADED_TEST_CASES = 2_000
+
+
+def _cpu_bound_sut(x: int) -> int:
+    # pure Python work, which only runs in parallel on free-threaded builds
+    total = 0
+    for i in range(2_000):
+        total += (x * i) % 7
+    return x
+
+
+def _threaded_relation() -> MetamorphicRelation:
+    mr = MetamorphicRelation(mr_id="threads",
+                             data=list(range(NUMBER_OF_THREADED_TEST_CASES)),
+                             testing_strategy=TestingStrategy.EXHAUSTIVE,
+                             number_of_test_cases=1, number_of_sources=1)
+    mr.generate_test_cases()
+    mr.transform = lambda x: x + 1
+    mr.relation = lambda source_output, followup_output: source_output + 1 == followup_output
+    mr.system_under_test = _cpu_bound_sut
+    mr.sut_batch_size["_cpu_bound_sut"] = None
+    mr.prepare_sut("_cpu_bound_sut")
+    return mr
+
+
+def threads() -> None:
+    """
+    Prints the number of metamorphic test cases with a CPU-bound pure Python SUT executed
+    per second by a ThreadedTestCaseExecutor with an increasing number of workers. The
+    throughput only scales with the workers on free-threaded builds, e.g. CPython 3.13t.
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    gil = "enabled" if is_gil_enabled else "disabled"
+    print(f"Python {sys.version.split()[0]}, GIL {gil}")
+    baseline = None
+    for workers in (1, 2, 4, 8):
+        mr = _threaded_relation()
+        executor = ThreadedTestCaseExecutor(workers)
+        start = time.perf_counter()
+        executor.execute(mr, "_cpu_bound_sut", mr.test_cases["_cpu_bound_sut"])
+        duration = time.perf_counter() - start
+        executor.close()
+        rate = NUMBER_OF_THREADED_TEST_CASES / duration
+        baseline = baseline or rate
+        print(f"{workers:>2} workers{rate:>12.0f} MTCs/s{rate / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    memory()
@@ -65,6 +65,15 @@ def test_pytest_with_valid_flags():
     assert os.path.exists(TEST_RESULT_DIR), "Test result directory not found"
     assert len(os.listdir(TEST_RESULT_DIR)) > 0, "No files generated in test result directory"
 
+def test_pytest_with_short_ids():
+    """
+    Test that short pytest ids consist of the MTC identity.
+    """
+    result = run_pytest_with_flags("--gmt-ids=short --collect-only -q")
+    assert result.returncode == 0
+    assert "test_example.py::test_dummy_sut_visualized[0.0.mtc_1]" in result.stdout
+    assert "mr_id=" not in result.stdout
+
 def test_pytest_with_spelling_error_flag():
     """
     Test pytest execution with a misspelled flag.
@@ -0,0 +1,36 @@
+import math
+
+import gemtest as gmt
+from tests.end2end.conftest import test_results, get_test_file_name
+
+A = gmt.create_metamorphic_relation(
+    name='A',
+    data=range(10),
+    columnar=True
+)
+
+
+@gmt.transformation(A)
+def add_two_pi(source: int) -> float:
+    return source + 2 * math.pi
+
+
+@gmt.relation(A)
+def approximately_equals(source_output: float, followup_output: float) -> bool:
+    return gmt.approximately(source_output, followup_output)
+
+
+@gmt.system_under_test(A)
+def test_non_batched(x: float) -> float:
+    return math.sin(x)
+
+
+@gmt.system_under_test(A, batch_size=4)
+def test_batched(batch):
+    return [math.sin(x) for x in batch]
+
+
+def test_framework_tests():
+    KEY = get_test_file_name()
+    assert test_results[KEY]['number_of_passed_tests'] == 10 * 2
+    assert test_results[KEY]['number_of_failed_tests'] == 0
@@ -49,4 +49,5 @@ def test_framework_tests():
     assert test_results[KEY]['number_of_passed_tests'] == 5 * 2
     assert test_results[KEY]['number_of_failed_tests'] == 0
 
-    assert counter == 5 * 2
+    # each file is loaded once and shared by both SUTs through the resource cache
+    assert counter == 5
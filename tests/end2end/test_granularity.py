@@ -0,0 +1,40 @@
+import pytest
+
+import gemtest as gmt
+from tests.end2end.conftest import test_results, get_test_file_name
+
+mr_1 = gmt.create_metamorphic_relation(name='mr_1', data=range(10))
+
+
+@gmt.transformation(mr_1)
+def add(source_input: int):
+    return source_input + 10
+
+
+@gmt.relation(mr_1)
+def difference(source_output: int, followup_output: int):
+    return source_output + 10 == followup_output
+
+
+@gmt.system_under_test(mr_1, granularity="chunk:4")
+def test_identity_chunks(x):
+    return x
+
+
+@gmt.system_under_test(mr_1, granularity="mr", batch_size=3)
+def test_identity_relation(batch):
+    return batch
+
+
+@pytest.mark.xfail()
+@gmt.system_under_test(mr_1, granularity="chunk:4")
+def test_wrong_on_three(x):
+    return 0 if x == 3 else x
+
+
+def test_framework_tests():
+    KEY = get_test_file_name()
+    # 3 chunks of test_identity_chunks, 1 of test_identity_relation and the 2 chunks of
+    # test_wrong_on_three without the test case of source input 3
+    assert test_results[KEY]['number_of_passed_tests'] == 6
+    assert test_results[KEY]['number_of_failed_tests'] == 1
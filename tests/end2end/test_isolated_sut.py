@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+import gemtest as gmt
+from tests.end2end.conftest import test_results, get_test_file_name
+
+mr_1 = gmt.create_metamorphic_relation(name='mr_1', data=range(10))
+
+
+@gmt.transformation(mr_1)
+def dummy_transformation(source_input: int):
+    return source_input + 10
+
+
+@gmt.relation(mr_1)
+def dummy_relation(source_output: float, followup_output: float):
+    return source_output + 10 == followup_output
+
+
+with MonkeyPatch().context() as m:
+    # the crash only fails the affected test case instead of stopping the session
+    m.setitem(gmt.conftest.CONFIG, "on_error", gmt.ErrorMode.CONTINUE)
+
+    @pytest.mark.xfail()
+    @gmt.system_under_test(mr_1, isolated=True)
+    def test_dummy_sut(input: float) -> float:
+        if input == 1 and sys.platform != "win32":
+            # simulates a crash of native code in the SUT
+            os._exit(1)
+        if input == 1:
+            return float("nan")
+        return input
+
+
+def test_framework_tests():
+    KEY = get_test_file_name()
+    assert test_results[KEY]['number_of_passed_tests'] == 9
+    assert test_results[KEY]['number_of_failed_tests'] == 1
@@ -0,0 +1,58 @@
+import pytest
+
+import gemtest as gmt
+from tests.end2end.conftest import test_results, get_test_file_name
+
+factory_calls = []
+
+
+def load_numbers():
+    factory_calls.append("numbers")
+    return range(10)
+
+
+def load_odd_numbers():
+    factory_calls.append("odd_numbers")
+    return [1, 3, 5]
+
+
+mr_1 = gmt.create_metamorphic_relation(name='mr_1', data=gmt.lazy(load_numbers))
+mr_2 = gmt.create_metamorphic_relation(name='mr_2', data=load_odd_numbers)
+
+# the data of lazy metamorphic relations is not created during collection
+assert not factory_calls
+
+
+@gmt.transformation(mr_1, mr_2)
+def add(source_input: int):
+    return source_input + 10
+
+
+@gmt.relation(mr_1, mr_2)
+def difference(source_output: int, followup_output: int):
+    return source_output + 10 == followup_output
+
+
+@gmt.system_under_test(mr_1, mr_2)
+def test_identity(x):
+    return x
+
+
+@gmt.system_under_test(mr_1, batch_size=4)
+def test_identity_batched(batch):
+    return batch
+
+
+@pytest.mark.xfail()
+@gmt.system_under_test(mr_2)
+def test_wrong_on_three(x):
+    return 0 if x == 3 else x
+
+
+def test_framework_tests():
+    KEY = get_test_file_name()
+    # one test per lazy metamorphic relation and system under test
+    assert test_results[KEY]['number_of_passed_tests'] == 3
+    assert test_results[KEY]['number_of_failed_tests'] == 1
+    # the factory of a metamorphic relation is called once for all systems under test
+    assert sorted(factory_calls) == ["numbers", "odd_numbers"]
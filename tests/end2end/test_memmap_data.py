@@ -0,0 +1,42 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+import gemtest as gmt
+from tests.end2end.conftest import test_results, get_test_file_name
+
+data_path = Path(tempfile.mkdtemp()) / "dataset.npy"
+np.save(data_path, np.arange(10, dtype=np.int64).reshape(5, 2))
+
+A = gmt.create_metamorphic_relation(
+    name='A',
+    data=gmt.data.from_npy(data_path)
+)
+
+
+@gmt.transformation(A)
+def add(row: np.ndarray):
+    return row + 10
+
+
+@gmt.relation(A)
+def greater(source: np.ndarray, follow_up: np.ndarray) -> bool:
+    return bool(np.all(source < follow_up))
+
+
+@gmt.system_under_test(A)
+def test_non_batched(row: np.ndarray) -> np.ndarray:
+    assert row.shape == (2,)
+    return row
+
+
+@gmt.system_under_test(A, batch_size=2)
+def test_batched(batch):
+    return [row.sum() for row in batch]
+
+
+def test_framework_tests():
+    KEY = get_test_file_name()
+    assert test_results[KEY]['number_of_passed_tests'] == 5 * 2
+    assert test_results[KEY]['number_of_failed_tests'] == 0
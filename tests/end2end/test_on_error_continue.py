@@ -0,0 +1,38 @@
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+import gemtest as gmt
+from tests.end2end.conftest import test_results, get_test_file_name
+
+mr_1 = gmt.create_metamorphic_relation(name='mr_1', data=range(10))
+
+
+@gmt.transformation(mr_1)
+def dummy_transformation(source_input: int):
+    if source_input == 2:
+        raise ValueError("test transformation error")
+    return source_input + 10
+
+
+@gmt.relation(mr_1)
+def dummy_relation(source_output: float, followup_output: float):
+    if source_output == 3:
+        raise ValueError("test relation error")
+    return source_output + 10 == followup_output
+
+
+with MonkeyPatch().context() as m:
+    m.setitem(gmt.conftest.CONFIG, "on_error", gmt.ErrorMode.CONTINUE)
+
+    @pytest.mark.xfail()
+    @gmt.system_under_test(mr_1, batch_size=1)
+    def test_dummy_sut(batch):
+        if batch == [1]:
+            raise ValueError("test sut error")
+        return batch
+
+
+def test_framework_tests():
+    KEY = get_test_file_name()
+    assert test_results[KEY]['number_of_passed_tests'] == 7
+    assert test_results[KEY]['number_of_failed_tests'] == 3
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import gemtest as gmt
+from tests.end2end.conftest import test_results, get_test_file_name
+
+data_path = Path(__file__).parent / 'test_data'
+
+A = gmt.create_metamorphic_relation(
+    name='A',
+    data=gmt.data.from_glob(f"{data_path}/*.txt")
+)
+
+B = gmt.create_metamorphic_relation(
+    name='B',
+    data=gmt.data.from_directory(data_path, extensions=(".txt",)),
+    testing_strategy=gmt.TestingStrategy.SAMPLE,
+    number_of_test_cases=3
+)
+
+
+def data_loader(filepath: str) -> int:
+    return int(Path(filepath).read_text())
+
+
+@gmt.transformation(A, B)
+def add(x: int):
+    return x + 10
+
+
+@gmt.relation(A, B)
+def greater(source: int, follow_up: int) -> bool:
+    return source < follow_up
+
+
+@gmt.system_under_test(A, B, data_loader=data_loader)
+def test_identity(x: int) -> int:
+    assert isinstance(x, int)
+    return x
+
+
+def test_framework_tests():
+    KEY = get_test_file_name()
+    number_of_files = len(list(data_path.glob("*.txt")))
+    assert test_results[KEY]['number_of_passed_tests'] == number_of_files + 3
+    assert test_results[KEY]['number_of_failed_tests'] == 0
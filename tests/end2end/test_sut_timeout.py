@@ -0,0 +1,38 @@
+import time
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+import gemtest as gmt
+from tests.end2end.conftest import test_results, get_test_file_name
+
+mr_1 = gmt.create_metamorphic_relation(name='mr_1', data=range(10))
+
+
+@gmt.transformation(mr_1)
+def dummy_transformation(source_input: int):
+    return source_input + 10
+
+
+@gmt.relation(mr_1)
+def dummy_relation(source_output: float, followup_output: float):
+    return source_output + 10 == followup_output
+
+
+with MonkeyPatch().context() as m:
+    # the timeout only fails the affected test case instead of stopping the session
+    m.setitem(gmt.conftest.CONFIG, "on_error", gmt.ErrorMode.CONTINUE)
+
+    @pytest.mark.xfail()
+    @gmt.system_under_test(mr_1, timeout=0.5)
+    def test_dummy_sut(input: float) -> float:
+        while input == 1:
+            # a pathological input, the SUT never terminates
+            time.sleep(0.01)
+        return input
+
+
+def test_framework_tests():
+    KEY = get_test_file_name()
+    assert test_results[KEY]['number_of_passed_tests'] == 9
+    assert test_results[KEY]['number_of_failed_tests'] == 1
@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+
+import gemtest as gmt
+from tests.end2end.conftest import test_results, get_test_file_name
+
+mr_1 = gmt.create_metamorphic_relation(name='mr_1', data=range(40))
+
+sut_threads = set()
+
+
+@gmt.transformation(mr_1)
+@gmt.randomized('offset', gmt.RandInt(1, 10))
+def add(source_input: int, offset: int):
+    return source_input + offset
+
+
+@gmt.relation(mr_1)
+def greater(source_output: int, followup_output: int):
+    return source_output < followup_output
+
+
+@gmt.system_under_test(mr_1, granularity="chunk:20", threads=4)
+def test_identity_threaded(x):
+    sut_threads.add(threading.current_thread().name)
+    return x
+
+
+@gmt.system_under_test(mr_1, granularity="mr", threads=8)
+def test_identity_threaded_relation(x):
+    return x
+
+
+@pytest.mark.xfail()
+@gmt.system_under_test(mr_1, granularity="chunk:20", threads=4)
+def test_wrong_on_three(x):
+    return 1000 if x == 3 else x
+
+
+def test_framework_tests():
+    KEY = get_test_file_name()
+    # 2 chunks of test_identity_threaded, 1 of test_identity_threaded_relation and the
+    # chunk of test_wrong_on_three without the test case of source input 3
+    assert test_results[KEY]['number_of_passed_tests'] == 4
+    assert test_results[KEY]['number_of_failed_tests'] == 1
+    assert len(sut_threads) > 1
+    assert all(name.startswith("gemtest-execute") for name in sut_threads)
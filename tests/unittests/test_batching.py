@@ -1,4 +1,4 @@
-from gemtest.metamorphic_error import SUTExecutionError
+from gemtest.metamorphic_error import SUTExecutionError, ErrorMode
 from gemtest.metamorphic_relation import MetamorphicRelation, InvalidInputError
 from gemtest.metamorphic_test_case import MetamorphicTestCase, UninitializedValue
 from gemtest.testcase_queue import InputQueueItem, InputQueue
@@ -58,6 +58,27 @@ def test_input_queue_max_len():
     assert len(r) == 3
 
 
+def test_input_queue_keeps_order_after_removing_test_cases():
+    mtc1, mtc2, mtc3 = MetamorphicTestCase(), MetamorphicTestCase(), MetamorphicTestCase()
+    q = InputQueue(InputQueueItem(mtc, i, is_source=True)
+                   for mtc in (mtc1, mtc2, mtc3) for i in range(2))
+    q.append(InputQueueItem(mtc1, 0, is_source=False))
+
+    r = q.get_all_with_testcase(mtc2, is_source=True)
+    assert [(item.test_case, item.index) for item in r] == [(mtc2, 0), (mtc2, 1)]
+    assert q.get_all_with_testcase(mtc2, is_source=True) == []
+
+    first = q.popleft()
+    assert (first.test_case, first.index) == (mtc1, 0)
+    assert q[0].test_case is mtc1 and q[0].index == 1
+    assert q[-1].test_case is mtc1 and not q[-1].is_source
+    assert [item.test_case for item in q] == [mtc1, mtc3, mtc3, mtc1]
+
+    r = q.get_all_with_testcase(mtc1, is_source=True)
+    assert [item.index for item in r] == [1]
+    assert len(q) == 3
+
+
 def dummy_transform(x):
     return x
 
@@ -198,3 +219,66 @@ def test_sut_batching_validation():
     assert test_cases[0].error is None
     assert isinstance(test_cases[1].error, InvalidInputError)
     assert test_cases[2].error is None
+
+
+def test_sut_batching_continue_on_error():
+    def sut_function(batch):
+        if 1 in batch:
+            raise ValueError()
+        return batch
+
+    test_cases = _create_test_cases(4)
+
+    mr = MetamorphicRelation(mr_id="mr1",
+                             data=range(64),
+                             testing_strategy=TestingStrategy.EXHAUSTIVE,
+                             number_of_test_cases=1,
+                             number_of_sources=1,
+                             on_error=ErrorMode.CONTINUE)
+
+    mr.q_ready[sut_function.__name__] = InputQueue(
+        InputQueueItem(mtc, 0, is_source=True) for mtc in test_cases
+    )
+
+    mr.transform = dummy_transform
+    mr.system_under_test = sut_function
+    mr.sut_batch_size[sut_function.__name__] = 2
+
+    for mtc in test_cases:
+        mr.create_source_outputs(mtc, sut_function.__name__)
+
+    assert isinstance(test_cases[0].error, SUTExecutionError)
+    assert isinstance(test_cases[1].error, SUTExecutionError)
+    assert test_cases[2].error is None
+    assert test_cases[3].error is None
+    assert test_cases[3].source_output == 3
+
+
+def test_completion_callbacks():
+    completed = []
+
+    def sut_function(batch):
+        return batch
+
+    test_cases = _create_test_cases(4)
+    mr = MetamorphicRelation(mr_id="mr1",
+                             data=range(4),
+                             testing_strategy=TestingStrategy.EXHAUSTIVE,
+                             number_of_test_cases=1,
+                             number_of_sources=1)
+    mr.q_ready[sut_function.__name__] = InputQueue(
+        InputQueueItem(mtc, 0, is_source=True) for mtc in test_cases)
+    mr.transform = dummy_transform
+    mr.system_under_test = sut_function
+    mr.sut_batch_size[sut_function.__name__] = 2
+    mr.completion_callbacks.append(
+        lambda mtc, sut_id, is_source: completed.append((mtc, is_source)))
+
+    mr.create_source_outputs(test_cases[0], sut_function.__name__)
+    assert completed == [(test_cases[0], True), (test_cases[1], True)]
+    # the follow-up inputs of completed test cases are queued
+    assert test_cases[1].followup_inputs == [1]
+
+    mr.create_followup_outputs(test_cases[0], sut_function.__name__)
+    assert (test_cases[0], False) in completed
+    assert test_cases[0].missing_followup_outputs == 0
@@ -0,0 +1,379 @@
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import textwrap
+from collections import Counter
+
+import pytest
+
+import gemtest as gmt
+from gemtest.checkpoint import CHECKPOINT_FILE, Checkpoint, _template_digest
+from gemtest.metamorphic_error import ErrorMode, RelationError
+from gemtest.metamorphic_relation import MetamorphicRelation
+from gemtest.testing_strategy import TestingStrategy
+
+
+def create_relation(checkpoint, calls, batch_size=None, data=range(20)):
+    mr = MetamorphicRelation(mr_id="checkpoint_mr", data=list(data),
+                             testing_strategy=TestingStrategy.EXHAUSTIVE,
+                             number_of_test_cases=1, number_of_sources=1)
+    mr.generate_test_cases()
+
+    def sut(inputs):
+        if batch_size is None:
+            calls.append(inputs)
+            return inputs
+        calls.extend(inputs)
+        return list(inputs)
+
+    def relation(source_output, followup_output):
+        if source_output == 30:
+            raise ValueError("relation error")
+        return source_output < followup_output
+
+    mr.transform = lambda x: x + 1
+    mr.relation = relation
+    mr.system_under_test = sut
+    mr.sut_batch_size["sut"] = batch_size
+    mr.on_error = ErrorMode.CONTINUE
+    mr.checkpoint = checkpoint
+    mr.prepare_sut("sut")
+    return mr
+
+
+def execute(mr, test_cases):
+    for mtc in test_cases:
+        mr.execute_test_case(mtc, "sut")
+
+
+def test_resume_skips_finished_test_cases(tmp_path):
+    calls = []
+    checkpoint = Checkpoint(tmp_path, flush_interval=0)
+    mr = create_relation(checkpoint, calls, data=[*range(9), 30, *range(10, 20)])
+    execute(mr, mr.test_cases["sut"][:10])
+    checkpoint.close()
+    assert len(calls) == 20
+
+    calls.clear()
+    checkpoint = Checkpoint(tmp_path, resume=True, flush_interval=0)
+    mr = create_relation(checkpoint, calls, data=[*range(9), 30, *range(10, 20)])
+    test_cases = mr.test_cases["sut"]
+    execute(mr, test_cases)
+    checkpoint.close()
+
+    assert checkpoint.resumed and checkpoint.restored == 10
+    assert len(calls) == 20
+    assert all(mtc.report is None for mtc in test_cases[:10])
+    assert all(mtc.report is not None for mtc in test_cases[10:])
+    assert all(mtc.relation_result for mtc in test_cases[:9] + test_cases[10:])
+    # errors are finished test cases, they are restored with their type
+    assert isinstance(test_cases[9].error, RelationError)
+    assert "relation error" in test_cases[9].error.message
+
+
+def test_resume_does_not_restore_results_of_other_inputs(tmp_path):
+    checkpoint = Checkpoint(tmp_path, flush_interval=0)
+    mr = create_relation(checkpoint, [])
+    execute(mr, mr.test_cases["sut"][:10])
+    checkpoint.close()
+
+    calls = []
+    checkpoint = Checkpoint(tmp_path, resume=True, flush_interval=0)
+    mr = create_relation(checkpoint, calls, data=[*range(5), *range(105, 120)])
+    execute(mr, mr.test_cases["sut"])
+    checkpoint.close()
+
+    # only the test cases with the same source inputs are restored
+    assert checkpoint.restored == 5
+    assert len(calls) == 30
+
+
+def test_resume_reuses_outputs_of_unfinished_test_cases(tmp_path):
+    calls = []
+    checkpoint = Checkpoint(tmp_path, flush_interval=0)
+    mr = create_relation(checkpoint, calls, batch_size=8)
+    # the batches of the first test case also execute the source inputs of the next 14
+    execute(mr, mr.test_cases["sut"][:1])
+    checkpoint.close()
+
+    calls.clear()
+    checkpoint = Checkpoint(tmp_path, resume=True, flush_interval=0)
+    mr = create_relation(checkpoint, calls, batch_size=8)
+    execute(mr, mr.test_cases["sut"])
+    checkpoint.close()
+
+    assert checkpoint.reused_outputs == 14
+    assert len(calls) == 2 * 19 - 14
+    assert all(mtc.relation_result for mtc in mr.test_cases["sut"])
+
+
+def test_resume_does_not_reuse_outputs_of_other_inputs(tmp_path):
+    checkpoint = Checkpoint(tmp_path, flush_interval=0)
+    mr = create_relation(checkpoint, [], batch_size=8)
+    execute(mr, mr.test_cases["sut"][:1])
+    checkpoint.close()
+
+    checkpoint = Checkpoint(tmp_path, resume=True, flush_interval=0)
+    mr = create_relation(checkpoint, [], batch_size=8, data=range(100, 120))
+    execute(mr, mr.test_cases["sut"])
+    checkpoint.close()
+
+    assert checkpoint.reused_outputs == 0
+    assert [mtc.source_outputs[0] for mtc in mr.test_cases["sut"][1:]] == \
+        list(range(101, 120))
+
+
+def test_checkpoint_keeps_its_seed(tmp_path):
+    checkpoint = Checkpoint(tmp_path)
+    seed = checkpoint.seed
+    mtc = create_relation(None, []).test_cases["sut"][3]
+    draws = checkpoint.rng("checkpoint_mr", "sut", mtc).random()
+    checkpoint.close()
+
+    resumed = Checkpoint(tmp_path, resume=True)
+    assert resumed.resumed and resumed.seed == seed
+    assert resumed.rng("checkpoint_mr", "sut", mtc).random() == draws
+    resumed.close()
+    # without resume, an existing checkpoint is replaced
+    restarted = Checkpoint(tmp_path)
+    assert not restarted.resumed
+    restarted.close()
+
+
+def sample_relation(checkpoint):
+    mr = MetamorphicRelation(mr_id="sampled_mr", data=list(range(100)),
+                             testing_strategy=TestingStrategy.SAMPLE,
+                             number_of_test_cases=10, number_of_sources=2)
+    mr.checkpoint = checkpoint
+    mr.generate_test_cases()
+    return [mtc.source_inputs for mtc in mr.mtc_templates]
+
+
+def test_sampling_does_not_seed_the_random_module(tmp_path):
+    checkpoint = Checkpoint(tmp_path)
+    random.seed(42)
+    expected = random.random()
+    random.seed(42)
+    samples = sample_relation(checkpoint)
+    assert random.random() == expected
+    # the samples only depend on the seed of the checkpoint
+    random.seed(7)
+    assert sample_relation(checkpoint) == samples
+    checkpoint.close()
+
+
+def test_digests_use_a_canonical_encoding():
+    mr = create_relation(None, [])
+    mr.mtc_templates[0].source_inputs = [{"b": 1, "a": 2}]
+    mr.mtc_templates[1].source_inputs = [{"a": 2, "b": 1}]
+    mr.mtc_templates[2].source_inputs = [object()]
+
+    # equal mappings have the same digest whatever their order, objects are not cached
+    assert _template_digest(mr, 0) == _template_digest(mr, 1) is not None
+    assert _template_digest(mr, 2) is None
+
+
+RUNNER_MODULE = """
+import os
+
+import gemtest as gmt
+from gemtest.generators import RandInt
+
+mr_1 = gmt.create_metamorphic_relation(name="mr_1", data=range(50),
+                                       testing_strategy=gmt.TestingStrategy.SAMPLE,
+                                       number_of_test_cases=20)
+
+
+@gmt.transformation(mr_1)
+@gmt.randomized("n", RandInt(1, 100))
+def add_n(source_input, n):
+    return source_input + n
+
+
+@gmt.relation(mr_1)
+def is_greater(source_output, followup_output):
+    return source_output < followup_output
+
+
+@gmt.system_under_test(mr_1)
+def test_crashing_identity(x):
+    with open(os.environ["CHECKPOINT_CALLS"], "a+") as calls:
+        calls.seek(0)
+        if len(calls.readlines()) == int(os.environ.get("CHECKPOINT_CRASH", -1)):
+            os._exit(3)
+        calls.write(f"{x}\\n")
+    return x
+"""
+
+
+def test_resume_a_crashed_run(tmp_path):
+    test_file = tmp_path / "test_checkpoint_crash.py"
+    test_file.write_text(textwrap.dedent(RUNNER_MODULE))
+    calls = tmp_path / "calls.txt"
+    checkpoint = tmp_path / "checkpoint"
+
+    def run(*options, crash=-1):
+        command = [sys.executable, "-m", "gemtest", "run", str(test_file), "--checkpoint",
+                   str(checkpoint), "--checkpoint-interval", "0", *options]
+        environment = {**os.environ, "CHECKPOINT_CALLS": str(calls),
+                       "CHECKPOINT_CRASH": str(crash)}
+        result = subprocess.run(command, cwd=tmp_path, env=environment, capture_output=True,
+                                text=True, check=False)
+        executed = calls.read_text().splitlines()
+        calls.unlink()
+        return result, executed
+
+    result, executed = run()
+    assert "20 passed" in result.stdout
+    # forget the second half of the test cases, as if the run died after the first half
+    connection = sqlite3.connect(checkpoint / CHECKPOINT_FILE)
+    connection.execute("DELETE FROM results WHERE mtc_index >= 10")
+    connection.commit()
+    connection.close()
+
+    result, resumed = run("--resume")
+    assert "20 passed" in result.stdout
+    # the test cases and their randomized parameters are those of the first run
+    assert resumed == executed[20:]
+
+    result, crashed = run(crash=21)
+    assert result.returncode == 3
+    result, resumed = run("--resume", "--jsonl", str(tmp_path / "results.jsonl"))
+    assert "20 passed" in result.stdout
+    # the follow-up input of the crash is executed again, the output of the source input
+    # of its test case is reused
+    assert len(crashed) == 21
+    assert len(resumed) == 19
+    results = (tmp_path / "results.jsonl").read_text().splitlines()
+    assert [json.loads(result)["mtc_index"] for result in results] == list(range(10, 20))
+
+
+def test_resume_with_pytest(tmp_path):
+    test_file = tmp_path / "test_checkpoint_pytest.py"
+    test_file.write_text(textwrap.dedent(RUNNER_MODULE))
+    calls = tmp_path / "calls.txt"
+    checkpoint = tmp_path / "checkpoint"
+    command = [sys.executable, "-m", "pytest", str(test_file), "-p", "no:cacheprovider",
+               "--gmt-checkpoint", str(checkpoint), "--gmt-checkpoint-interval", "0"]
+    environment = {**os.environ, "CHECKPOINT_CALLS": str(calls)}
+
+    result = subprocess.run(command, cwd=tmp_path, env=environment, capture_output=True,
+                            text=True, check=False)
+    assert "20 passed" in result.stdout
+    executed = calls.read_text().splitlines()
+    calls.unlink()
+    connection = sqlite3.connect(checkpoint / CHECKPOINT_FILE)
+    connection.execute("DELETE FROM results WHERE mtc_index >= 5")
+    connection.commit()
+    connection.close()
+
+    result = subprocess.run(command + ["--gmt-resume"], cwd=tmp_path, env=environment,
+                            capture_output=True, text=True, check=False)
+    assert "20 passed" in result.stdout
+    assert calls.read_text().splitlines() == executed[10:]
+
+    result = subprocess.run(command[:-4] + ["--gmt-resume"], cwd=tmp_path,
+                            env=environment, capture_output=True, text=True, check=False)
+    assert result.returncode == pytest.ExitCode.USAGE_ERROR
+
+
+def test_resume_with_xdist(tmp_path):
+    test_file = tmp_path / "test_checkpoint_xdist.py"
+    test_file.write_text(textwrap.dedent(RUNNER_MODULE))
+    calls = tmp_path / "calls.txt"
+    checkpoint = tmp_path / "checkpoint"
+    command = [sys.executable, "-m", "pytest", str(test_file), "-p", "no:cacheprovider",
+               "-n", "2", "--gmt-checkpoint", str(checkpoint), "--gmt-checkpoint-interval",
+               "0"]
+    environment = {**os.environ, "CHECKPOINT_CALLS": str(calls)}
+
+    def finished():
+        connection = sqlite3.connect(checkpoint / CHECKPOINT_FILE)
+        rows = connection.execute("SELECT mtc_index FROM results").fetchall()
+        connection.close()
+        return sorted(index for index, in rows)
+
+    result = subprocess.run(command, cwd=tmp_path, env=environment, capture_output=True,
+                            text=True, check=False)
+    assert "20 passed" in result.stdout
+    # the workers write to the checkpoint created by the controller
+    assert finished() == list(range(20))
+    executed = calls.read_text().splitlines()
+    calls.unlink()
+    connection = sqlite3.connect(checkpoint / CHECKPOINT_FILE)
+    connection.execute("DELETE FROM results WHERE mtc_index >= 10")
+    connection.commit()
+    connection.close()
+
+    result = subprocess.run(command + ["--gmt-resume"], cwd=tmp_path, env=environment,
+                            capture_output=True, text=True, check=False)
+    assert "20 passed" in result.stdout
+    assert finished() == list(range(20))
+    # the workers generated the test cases of the first run
+    resumed = calls.read_text().splitlines()
+    assert len(resumed) == 20
+    assert not Counter(resumed) - Counter(executed)
+
+
+SAMPLED_MODULE = """
+import os
+
+import gemtest as gmt
+
+mr_1 = gmt.create_metamorphic_relation(name="mr_1", data=range(1000),
+                                       testing_strategy=gmt.TestingStrategy.SAMPLE,
+                                       number_of_test_cases=5)
+
+
+@gmt.transformation(mr_1)
+def add_one(source_input):
+    return source_input + 1
+
+
+@gmt.relation(mr_1)
+def is_greater(source_output, followup_output):
+    return source_output < followup_output
+
+
+@gmt.system_under_test(mr_1)
+def test_identity(x):
+    with open(os.environ["CHECKPOINT_CALLS"], "a") as calls:
+        calls.write(f"{x}\\n")
+    return x
+"""
+
+
+def test_resume_generates_the_test_cases_of_each_relation_again(tmp_path):
+    for name in ("test_sampled_a.py", "test_sampled_b.py"):
+        (tmp_path / name).write_text(textwrap.dedent(SAMPLED_MODULE))
+    calls = tmp_path / "calls.txt"
+
+    def run(*arguments):
+        command = [sys.executable, "-m", "gemtest", "run", *arguments, "--checkpoint",
+                   str(tmp_path / "checkpoint"), "--checkpoint-interval", "0"]
+        result = subprocess.run(command, cwd=tmp_path, capture_output=True, text=True,
+                                env={**os.environ, "CHECKPOINT_CALLS": str(calls)},
+                                check=False)
+        executed = calls.read_text().splitlines() if calls.exists() else []
+        calls.unlink(missing_ok=True)
+        return result, executed
+
+    result, executed = run("test_sampled_a.py", "test_sampled_b.py")
+    assert "10 passed" in result.stdout
+    connection = sqlite3.connect(tmp_path / "checkpoint" / CHECKPOINT_FILE)
+    connection.execute("DELETE FROM results WHERE mr_id LIKE 'test_sampled_b%'")
+    connection.commit()
+    connection.close()
+
+    # the samples of a relation do not depend on the relations collected before it
+    result, resumed = run("test_sampled_b.py", "--resume")
+    assert "5 passed" in result.stdout
+    assert resumed == executed[10:]
+
+
+def test_resume_requires_a_checkpoint():
+    with pytest.raises(ValueError):
+        gmt.run("tests.unittests.no_such_module", resume=True)
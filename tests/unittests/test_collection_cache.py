@@ -0,0 +1,87 @@
+from itertools import combinations
+
+from gemtest.collection_cache import CollectionCache, create_template_index
+from gemtest.metamorphic_relation import MetamorphicRelation
+from gemtest.metamorphic_test_case import MetamorphicTestCase
+from gemtest.testing_strategy import TestingStrategy
+
+
+def create_relation(cache, data=range(6), number_of_sources=2, parameters=None):
+    mr = MetamorphicRelation(mr_id="mr1", data=data,
+                             testing_strategy=TestingStrategy.EXHAUSTIVE,
+                             number_of_test_cases=1,
+                             number_of_sources=number_of_sources,
+                             collection_cache=cache)
+    mr.sut_parameters = parameters or {}
+    mr.generate_test_cases()
+    return mr
+
+
+def templates(mr):
+    return [(mtc.source_inputs, mtc.parameters) for mtc in mr.mtc_templates]
+
+
+def test_create_template_index():
+    index = create_template_index(4, 2, 3)
+    expected = [[*sources, permutation] for sources in combinations(range(4), 2)
+                for permutation in range(3)]
+    assert index.tolist() == expected
+
+
+def test_cached_templates_match_generated_templates(tmp_path):
+    parameters = {"a": [1, 2], "b": ["x", "y", "z"]}
+    uncached = create_relation(None, parameters=parameters)
+    cached = create_relation(CollectionCache(tmp_path), parameters=parameters)
+
+    assert templates(cached) == templates(uncached)
+
+
+def test_index_is_loaded_from_cache(tmp_path):
+    first_cache = CollectionCache(tmp_path)
+    first = create_relation(first_cache)
+    second_cache = CollectionCache(tmp_path)
+    second = create_relation(second_cache)
+
+    assert (first_cache.hits, first_cache.misses) == (0, 1)
+    assert (second_cache.hits, second_cache.misses) == (1, 0)
+    assert templates(first) == templates(second)
+    assert len(list(tmp_path.glob("*.npy"))) == 1
+
+
+def test_changed_counts_are_not_loaded_from_cache(tmp_path):
+    create_relation(CollectionCache(tmp_path), data=range(6))
+    cache = CollectionCache(tmp_path)
+    mr = create_relation(cache, data=range(7))
+    create_relation(cache, data=range(7), parameters={"a": [1, 2]})
+
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert len(mr.mtc_templates) == 21
+
+
+def test_changed_content_is_not_loaded_from_cache(tmp_path):
+    create_relation(CollectionCache(tmp_path), data=range(6), parameters={"a": [1, 2]})
+    cache = CollectionCache(tmp_path)
+    create_relation(cache, data=range(1, 7), parameters={"a": [1, 2]})
+    create_relation(cache, data=range(6), parameters={"a": [1, 3]})
+
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_data_without_canonical_encoding_is_not_cached(tmp_path):
+    cache = CollectionCache(tmp_path)
+    data = [object() for _ in range(6)]
+    mr = create_relation(cache, data=data)
+
+    assert (cache.hits, cache.misses) == (0, 0)
+    assert not list(tmp_path.glob("*.npy"))
+    assert len(mr.mtc_templates) == 15
+
+
+def test_cached_templates_are_objects(tmp_path):
+    create_relation(CollectionCache(tmp_path))
+    cache = CollectionCache(tmp_path)
+    mr = create_relation(cache)
+
+    assert cache.hits == 1
+    assert mr.template_store is None
+    assert all(type(mtc) is MetamorphicTestCase for mtc in mr.mtc_templates)
@@ -0,0 +1,174 @@
+import random
+
+import numpy as np
+import pytest
+
+from gemtest.columnar import ColumnarStore, ColumnarMetamorphicTestCase
+from gemtest.metamorphic_relation import MetamorphicRelation
+from gemtest.metamorphic_test_case import UninitializedValue
+from gemtest.testing_strategy import TestingStrategy
+
+
+def create_store(data=range(4), parameter_permutations=None):
+    source_index = np.arange(len(data), dtype=np.int64).reshape(-1, 1)
+    return ColumnarStore(data, source_index, np.zeros(len(data), dtype=np.int64),
+                         parameter_permutations or [{}])
+
+
+def create_relation(columnar, strategy=TestingStrategy.EXHAUSTIVE, parameters=None):
+    mr = MetamorphicRelation(mr_id="mr1", data=list(range(6)), testing_strategy=strategy,
+                             number_of_test_cases=4, number_of_sources=2,
+                             columnar=columnar)
+    mr.sut_parameters = parameters or {}
+    mr.generate_test_cases()
+    return mr
+
+
+def templates(mr):
+    return [(mtc.source_inputs, mtc.parameters) for mtc in mr.mtc_templates]
+
+
+def test_row_view_reads_source_inputs_from_data():
+    store = create_store(data=["a", "b", "c"])
+    mtc = store.test_cases[1]
+    assert isinstance(mtc, ColumnarMetamorphicTestCase)
+    assert mtc.source_input == "b"
+    assert mtc.source_outputs == [UninitializedValue]
+    assert mtc.missing_source_outputs == 1
+
+
+def test_numeric_values_are_stored_in_contiguous_columns():
+    store = create_store()
+    for mtc in store.test_cases:
+        mtc.source_outputs_set_at(0, mtc.source_input * 0.5)
+        mtc.followup_inputs = [mtc.source_input + 1, mtc.source_input + 2]
+        mtc.relation_result = True
+
+    assert store.source_outputs.values.dtype == np.float64
+    assert store.source_outputs.values[:, 0].tolist() == [0.0, 0.5, 1.0, 1.5]
+    assert store.followup_inputs.values.shape == (4, 2)
+    assert store.test_cases[2].followup_inputs == [3, 4]
+    assert store.test_cases[2].missing_followup_outputs == 2
+    assert store.relation_results.all()
+
+
+def test_fixed_shape_arrays_are_stored_in_one_array():
+    store = create_store()
+    for mtc in store.test_cases:
+        mtc.followup_inputs = np.full((2, 3), mtc.source_input, dtype=np.uint8)
+
+    assert store.followup_inputs.values.shape == (4, 1, 2, 3)
+    followup_input = store.test_cases[3].followup_input
+    assert followup_input.dtype == np.uint8
+    np.testing.assert_array_equal(followup_input, np.full((2, 3), 3))
+
+
+def test_column_falls_back_to_objects():
+    store = create_store()
+    store.test_cases[0].followup_inputs = [1]
+    store.test_cases[1].followup_inputs = [np.float32(1.5)]
+    store.test_cases[2].followup_inputs = ["text", [1, 2]]
+    store.test_cases[3].followup_inputs = [2 ** 70]
+
+    assert store.followup_inputs.values.dtype == object
+    assert [mtc.followup_inputs for mtc in store.test_cases] == \
+        [[1], [np.float32(1.5)], ["text", [1, 2]], [2 ** 70]]
+    assert type(store.test_cases[0].followup_input) is int
+    assert type(store.test_cases[1].followup_input) is np.float32
+
+
+def test_values_keep_their_type():
+    store = create_store()
+    store.test_cases[0].followup_outputs = [True, False]
+    store.test_cases[1].followup_outputs = [np.int16(3)]
+    assert store.test_cases[0].followup_outputs == [True, False]
+    assert type(store.test_cases[0].followup_outputs[0]) is bool
+    assert store.followup_outputs.values.dtype == object
+    assert type(store.test_cases[1].followup_output) is np.int16
+
+
+def test_sparse_fields_and_flags():
+    store = create_store(parameter_permutations=[{"a": 1}])
+    mtc = store.test_cases[1]
+    error = ValueError("failed")
+    mtc.error = error
+    mtc.validated = True
+    mtc.parameters = {"a": 2}
+
+    assert store.errors == {1: error}
+    assert store.failed.tolist() == [False, True, False, False]
+    assert store.validated.tolist() == [False, True, False, False]
+    assert mtc.parameters == {"a": 2}
+    assert store.test_cases[0].parameters == {"a": 1}
+
+    mtc.error = None
+    assert not store.errors
+
+
+def test_output_index_out_of_range():
+    store = create_store()
+    with pytest.raises(IndexError):
+        store.test_cases[0].source_outputs_set_at(1, 1.0)
+
+
+def test_copy_does_not_share_results():
+    store = create_store()
+    store.test_cases[0].source_outputs_set_at(0, 1.0)
+    copied = store.copy()
+    copied.test_cases[0].source_outputs_set_at(0, 2.0)
+    copied.test_cases[0].relation_result = True
+
+    assert store.test_cases[0].source_output == 1.0
+    assert not store.test_cases[0].relation_result
+    assert copied.data is store.data
+
+
+def test_row_views_compare_by_value():
+    assert create_store().test_cases[1] == create_store().test_cases[1]
+    assert create_store().test_cases[1] != create_store().test_cases[2]
+
+
+@pytest.mark.parametrize("strategy", [TestingStrategy.EXHAUSTIVE, TestingStrategy.SAMPLE])
+def test_columnar_templates_match_object_templates(strategy):
+    parameters = {"a": [1, 2], "b": ["x", "y"]}
+    random.seed(1)
+    objects = create_relation(False, strategy, parameters)
+    random.seed(1)
+    columnar = create_relation(True, strategy, parameters)
+
+    assert columnar.template_store is not None
+    assert templates(columnar) == templates(objects)
+
+
+def test_each_system_under_test_gets_its_own_store():
+    mr = create_relation(True)
+
+    def sut_a(x):
+        return x
+
+    def sut_b(x):
+        return x
+
+    mr.system_under_test = sut_a
+    mr.system_under_test = sut_b
+    store_a = mr.test_cases["sut_a"][0].store
+    store_b = mr.test_cases["sut_b"][0].store
+    assert store_a is not store_b
+    assert store_a is not mr.template_store
+    assert len(store_a) == len(mr.mtc_templates) == 15
+    assert mr.mtc_templates[0].identity is None
+    assert mr.test_cases["sut_b"][4].identity == (-1, 1, 4)
+
+
+def test_missing_outputs_are_counted_per_row():
+    store = create_store()
+    mtc = store.test_cases[0]
+    mtc.followup_inputs = [1, 2]
+    assert mtc.missing_followup_outputs == 2
+
+    assert not mtc.followup_outputs_set_at(0, 1.0)
+    assert not mtc.followup_outputs_set_at(0, 2.0)
+    assert mtc.followup_outputs_set_at(1, 3.0)
+    assert mtc.missing_followup_outputs == 0
+    assert store.followup_outputs.missing.tolist() == [0, 0, 0, 0]
+    assert store.source_outputs.missing.tolist() == [1, 1, 1, 1]
@@ -0,0 +1,24 @@
+from types import SimpleNamespace
+
+from gemtest import conftest
+
+
+def create_session():
+    config = SimpleNamespace(getoption=lambda name: None,
+                             pluginmanager=SimpleNamespace(getplugin=lambda name: None))
+    return SimpleNamespace(config=config)
+
+
+def test_sessionstart_clears_the_errors_of_the_previous_session(monkeypatch):
+    for name in ("CONFIG", "config_snapshot", "html_plugin"):
+        monkeypatch.setattr(conftest, name, getattr(conftest, name))
+    monkeypatch.setattr(conftest, "relation_marks", {})
+    monkeypatch.setattr(conftest, "mtc_errors", [])
+    conftest.pytest_runtest_logreport(SimpleNamespace(
+        when="call", nodeid="test_mr", gmt_error_type="SUTExecutionError",
+        gmt_error_message="error", gmt_error_counts={"SUTExecutionError": 1}))
+    assert len(conftest.mtc_errors) == 1
+
+    # e.g. a second pytest.main call in the same process
+    conftest.pytest_sessionstart(create_session())
+    assert conftest.mtc_errors == []
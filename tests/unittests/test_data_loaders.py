@@ -4,8 +4,11 @@ import cv2
 import numpy as np
 import pytest
 
-from gemtest import load_image_resource
-from gemtest.metamorphic_error import InvalidInputError
+from gemtest import load_image_resource, load_image_resources
+from gemtest.utils.data_loaders import read_image_size
+from gemtest.metamorphic_error import ErrorMode, InvalidInputError, SUTExecutionError
+from gemtest.metamorphic_relation import MetamorphicRelation
+from gemtest.testing_strategy import TestingStrategy
 
 img_path = "img_test_data_loader.png"
 img_data = np.ones((32, 32, 3), dtype=np.uint8)
@@ -26,3 +29,84 @@ def test_load_image_resource(setup_config):
 def test_load_missing_image_resource():
     with pytest.raises(InvalidInputError):
         load_image_resource("img.txt")
+
+
+@pytest.fixture
+def jpeg_path(tmp_path):
+    path = str(tmp_path / "image.jpg")
+    image = np.zeros((64, 96, 3), dtype=np.uint8)
+    image[..., 2] = 255  # red in BGR order
+    cv2.imwrite(path, image)
+    return path
+
+
+def test_load_image_resource_is_rgb(jpeg_path):
+    res = load_image_resource(jpeg_path)
+    assert res.shape == (64, 96, 3)
+    assert res[..., 0].mean() > 240
+    assert res[..., 2].mean() < 15
+
+
+def test_load_image_resource_reduced(jpeg_path):
+    res = load_image_resource(jpeg_path, reduce=4)
+    assert res.shape == (16, 24, 3)
+
+
+def test_load_image_resource_invalid_reduce(jpeg_path):
+    with pytest.raises(ValueError):
+        load_image_resource(jpeg_path, reduce=3)
+
+
+def test_load_image_resource_size(jpeg_path):
+    res = load_image_resource(jpeg_path, size=(20, 10))
+    assert res.shape == (10, 20, 3)
+    assert res[..., 0].mean() > 240
+
+
+def test_read_image_size(jpeg_path, setup_config):
+    assert read_image_size(jpeg_path) == (96, 64)
+    assert read_image_size(img_path) == (32, 32)
+
+
+def test_load_image_resource_dtype(setup_config):
+    res = load_image_resource(img_path, dtype=np.float32)
+    assert res.dtype == np.float32
+    assert np.array_equal(res, img_data)
+
+
+def test_load_corrupt_image_resource(tmp_path):
+    path = tmp_path / "corrupt.png"
+    path.write_bytes(b"not an image")
+    with pytest.raises(ValueError):
+        load_image_resource(str(path))
+
+
+def test_corrupt_image_is_an_error_of_the_test_case(tmp_path):
+    path = tmp_path / "corrupt.png"
+    path.write_bytes(b"not an image")
+    mr = MetamorphicRelation(mr_id="corrupt_mr", data=[str(path)],
+                             testing_strategy=TestingStrategy.EXHAUSTIVE,
+                             number_of_test_cases=1, number_of_sources=1)
+    mr.generate_test_cases()
+    mr.transform = lambda image: image
+    mr.relation = lambda source_output, followup_output: True
+
+    def sut(image):
+        return image
+
+    mr.system_under_test = sut
+    mr.sut_batch_size["sut"] = None
+    mr.on_error = ErrorMode.CONTINUE
+    mr.prepare_sut("sut", load_image_resource)
+    mtc = mr.test_cases["sut"][0]
+    mr.execute_test_case(mtc, "sut")
+
+    # the test case fails instead of being skipped as an invalid input
+    assert isinstance(mtc.error, SUTExecutionError)
+    assert type(mtc.error.original_exception) is ValueError
+    assert "could not be decoded" in mtc.error.message
+
+
+def test_load_image_resources(jpeg_path, setup_config):
+    images = load_image_resources([img_path, jpeg_path, img_path], workers=2)
+    assert [image.shape for image in images] == [(32, 32, 3), (64, 96, 3), (32, 32, 3)]
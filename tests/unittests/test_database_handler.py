@@ -3,6 +3,7 @@ import shutil
 
 import pytest
 
+from gemtest.metamorphic_test_case import MTCIdentity
 from gemtest.report.database_handler import DatabaseHandler, _join_values  # noqa
 from gemtest.report.execution_report import GeneralMTCExecutionReport
 
@@ -64,6 +65,33 @@ def test_database_handler_insert_and_retrieve(setup_teardown_db):
     assert row[3] == result.mr_name
 
 
+def test_database_handler_error_type(setup_teardown_db):
+    database_handler = setup_teardown_db
+
+    result = GeneralMTCExecutionReport()
+    result.mtc_name = "Timed out MTC"
+    result.error_type = "SUTTimeoutError"
+    database_handler.insert([result])
+
+    cursor = database_handler.conn.cursor()
+    cursor.execute("SELECT mtc_name FROM mtc_results WHERE error_type = 'SUTTimeoutError'")
+    assert cursor.fetchall() == [("Timed out MTC",)]
+
+
+def test_database_handler_identity(setup_teardown_db):
+    database_handler = setup_teardown_db
+
+    result = GeneralMTCExecutionReport()
+    result.mtc_name = "Identified MTC"
+    result.identity = MTCIdentity(2, 0, 41)
+    database_handler.insert([result])
+
+    cursor = database_handler.conn.cursor()
+    cursor.execute("SELECT mr_index, sut_index, mtc_index FROM mtc_results "
+                   "WHERE mtc_name = 'Identified MTC'")
+    assert cursor.fetchall() == [(2, 0, 41)]
+
+
 def test_shorten_join():
     values = ["This is a very long string value", "this not"]
     result = _join_values(values)
@@ -337,3 +337,23 @@ def test_add_multiple_general_relations_to_metamorphic_relation(mts):
 
     with pytest.raises(ValueError):
         result(dummy_general_relation_2)
+
+
+def test_pytest_skip_is_only_prohibited_on_threads_executing_test_cases():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from gemtest.utils.wrong_skip_method_used import prohibit_pytest_skip
+
+    skip = pytest.skip
+
+    def skip_in_test_case():
+        with prohibit_pytest_skip():
+            with pytest.raises(SystemExit):
+                pytest.skip("prohibited")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for future in [executor.submit(skip_in_test_case) for _ in range(8)]:
+            future.result()
+    with pytest.raises(pytest.skip.Exception):
+        pytest.skip("allowed")
+    assert pytest.skip is skip
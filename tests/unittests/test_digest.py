@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from gemtest.utils.digest import canonical_digest
+
+
+def test_digest_of_equal_values_is_equal():
+    assert canonical_digest({"b": 1, "a": [1.5, "x"]}) == \
+        canonical_digest({"a": [1.5, "x"], "b": 1})
+    assert canonical_digest({"x", "y", "z"}) == canonical_digest({"z", "y", "x"})
+    array = np.arange(6, dtype=np.int32).reshape(2, 3)
+    assert canonical_digest(array) == canonical_digest(np.asfortranarray(array))
+
+
+def test_digest_distinguishes_types_dtypes_and_shapes():
+    array = np.arange(6, dtype=np.int32)
+    digests = {canonical_digest(value) for value in (
+        array, array.astype(np.int64), array.reshape(2, 3), [0, 1, 2, 3, 4, 5],
+        (0, 1, 2, 3, 4, 5), range(6), "1", 1, 1.0, True, None)}
+    assert len(digests) == 11
+
+
+def test_digest_is_stable_across_processes():
+    value = "{'x', 'y', frozenset({'z', 'w'})}"
+    command = [sys.executable, "-c",
+               f"from gemtest.utils.digest import canonical_digest; "
+               f"print(canonical_digest({value}))"]
+    digests = {subprocess.run(command, capture_output=True, text=True, check=True,
+                              env={**os.environ, "PYTHONHASHSEED": str(seed)}).stdout
+               for seed in (1, 2)}
+    assert len(digests) == 1
+
+
+def test_values_without_canonical_encoding_are_not_digested():
+    assert canonical_digest(object()) is None
+    assert canonical_digest([1, lambda x: x]) is None
+    assert canonical_digest(np.array([object()])) is None
+    recursive = []
+    recursive.append(recursive)
+    assert canonical_digest(recursive) is None
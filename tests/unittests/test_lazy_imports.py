@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+import pytest
+
+import gemtest as gmt
+from gemtest.utils.lazy_import import HEAVY_MODULES
+
+
+def test_import_does_not_load_heavy_dependencies():
+    code = ("import sys, gemtest; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_lazy_attributes_are_resolved_on_access():
+    from gemtest.report.visualizer import Visualizer
+    from gemtest.utils.data_loaders import load_image_resource
+
+    assert gmt.Visualizer is Visualizer
+    assert gmt.report.Visualizer is Visualizer
+    assert gmt.load_image_resource is load_image_resource
+    assert gmt.utils.load_image_resource is load_image_resource
+    assert gmt.data.from_npy.__module__ == "gemtest.data.memmap"
+    assert {"Visualizer", "ColumnarStore", "load_image_resources"} <= set(dir(gmt))
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError, match="no_such_attribute"):
+        gmt.no_such_attribute  # noqa
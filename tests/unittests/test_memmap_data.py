@@ -0,0 +1,109 @@
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+from gemtest import data
+from gemtest.metamorphic_test_case import MetamorphicTestCase
+
+array = np.arange(24, dtype=np.float32).reshape(6, 4)
+
+
+def test_from_npy(tmp_path):
+    path = tmp_path / "array.npy"
+    np.save(path, array)
+    dataset = data.from_npy(path)
+
+    assert len(dataset) == 6
+    assert dataset.shape == (6, 4)
+    assert np.array_equal(dataset[2].resolve(), array[2])
+    assert np.array_equal(dataset[-1].resolve(), array[-1])
+    assert [reference.index for reference in dataset] == list(range(6))
+
+
+def test_from_npy_fortran_order(tmp_path):
+    path = tmp_path / "array.npy"
+    np.save(path, np.asfortranarray(array))
+    dataset = data.from_npy(path)
+
+    assert np.array_equal(dataset[3].resolve(), array[3])
+
+
+def test_rows_are_read_only_views(tmp_path):
+    path = tmp_path / "array.npy"
+    np.save(path, array)
+    row = data.from_npy(path)[1].resolve()
+
+    assert isinstance(row.base, np.ndarray)
+    with pytest.raises(ValueError):
+        row[0] = 0
+
+
+def test_index_out_of_range(tmp_path):
+    path = tmp_path / "array.npy"
+    np.save(path, array)
+    with pytest.raises(IndexError):
+        data.from_npy(path)[6]  # noqa
+
+
+def test_from_npz(tmp_path):
+    path = tmp_path / "arrays.npz"
+    np.savez(path, first=array, second=array * 2)
+    dataset = data.from_npz(path, "second")
+
+    assert len(dataset) == 6
+    assert np.array_equal(dataset[4].resolve(), array[4] * 2)
+
+
+def test_from_npz_compressed(tmp_path):
+    path = tmp_path / "arrays.npz"
+    np.savez_compressed(path, first=array)
+    with pytest.raises(ValueError):
+        data.from_npz(path, "first")
+
+
+def test_from_npz_missing_key(tmp_path):
+    path = tmp_path / "arrays.npz"
+    np.savez(path, first=array)
+    with pytest.raises(KeyError):
+        data.from_npz(path, "second")
+
+
+def test_from_raw(tmp_path):
+    path = tmp_path / "array.bin"
+    array.tofile(path)
+    dataset = data.from_raw(path, np.float32, (4,))
+
+    assert len(dataset) == 6
+    assert np.array_equal(dataset[5].resolve(), array[5])
+
+
+def test_from_raw_wrong_row_size(tmp_path):
+    path = tmp_path / "array.bin"
+    array.tofile(path)
+    with pytest.raises(ValueError):
+        data.from_raw(path, np.float32, (5,))
+
+
+def test_pickled_dataset_reopens_file(tmp_path):
+    path = tmp_path / "array.npy"
+    np.save(path, array)
+    dataset = data.from_npy(path)
+    dataset[0].resolve()
+    reference = pickle.loads(pickle.dumps(dataset[3]))
+
+    assert np.array_equal(reference.resolve(), array[3])
+
+
+def test_test_case_resolves_references(tmp_path):
+    path = tmp_path / "array.npy"
+    np.save(path, array)
+    dataset = data.from_npy(path)
+    mtc = MetamorphicTestCase()
+    mtc.source_inputs = [dataset[1]]
+
+    assert np.array_equal(mtc.source_input, array[1])
+    assert np.array_equal(mtc.source_inputs[0], array[1])
+    # copies of the test case share the reference instead of copying the row
+    assert copy.deepcopy(mtc._source_inputs)[0] is mtc._source_inputs[0]
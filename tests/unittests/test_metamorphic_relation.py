@@ -3,7 +3,7 @@ import math
 
 from gemtest.metamorphic_error import SUTExecutionError
 from gemtest.metamorphic_relation import MetamorphicRelation
-from gemtest.metamorphic_test_case import MetamorphicTestCase
+from gemtest.metamorphic_test_case import MetamorphicTestCase, MTCIdentity
 from gemtest.testing_strategy import TestingStrategy
 
 DATA = range(100)
@@ -436,3 +436,31 @@ def test_calculate_possible_sources_with_more_sources_than_elements():
     # Value Error appears with r > n in math.factorial(n - r). Negative Factorial not defined. 
     with pytest.raises(ValueError):
         mr._calculate_possible_sources()
+
+
+def other_system(system_input):
+    return system_input
+
+
+def test_test_cases_carry_their_identity():
+    mr = MetamorphicRelation(mr_id="pkg.test_module.mr.with, odd]name", data=range(3),
+                             testing_strategy=TestingStrategy.EXHAUSTIVE,
+                             number_of_test_cases=1, number_of_sources=1,
+                             name="mr.with, odd]name", index=7)
+    mr.generate_test_cases()
+    mr.system_under_test = dummy_system
+    mr.system_under_test = other_system
+
+    assert all(mtc.identity is None for mtc in mr.mtc_templates)
+    assert [mtc.identity for mtc in mr.test_cases["other_system"]] == \
+        [MTCIdentity(7, 1, index) for index in range(3)]
+
+    mr.transform = dummy_transformation
+    mr.relation = dummy_relation
+    mr.sut_batch_size["other_system"] = None
+    mr.prepare_sut("other_system")
+    mtc = mr.test_cases["other_system"][2]
+    mr.execute_test_case(mtc, "other_system")
+    assert mtc.report.identity == MTCIdentity(7, 1, 2)
+    assert (mtc.report.mr_name, mtc.report.sut_name, mtc.report.mtc_name) == \
+        ("mr.with, odd]name", "other_system", "mtc_3")
@@ -1,6 +1,8 @@
+import copy
+
 import pytest
 
-from gemtest.metamorphic_test_case import MetamorphicTestCase
+from gemtest.metamorphic_test_case import MetamorphicTestCase, UninitializedValue
 
 
 def test_source_input_getter_setter():
@@ -118,3 +120,52 @@ def test_error_getter_setter():
 
     metamorphic_test_case.error = "Updated error"
     assert metamorphic_test_case.error == "Updated error"
+
+
+def test_empty_containers_are_allocated_on_first_write():
+    first = MetamorphicTestCase()
+    second = MetamorphicTestCase()
+
+    assert not hasattr(first, "__dict__")
+    assert first._followup_inputs is second._followup_inputs
+    assert first.followup_inputs == []
+    assert first.parameters == {}
+
+    first.followup_inputs = 1
+    assert first.followup_inputs == [1]
+    assert second.followup_inputs == []
+
+
+def test_copied_test_case_is_equal():
+    metamorphic_test_case = MetamorphicTestCase()
+    metamorphic_test_case.source_inputs = [1, 2]
+    metamorphic_test_case.parameters = {"a": 1}
+    copied = copy.deepcopy(metamorphic_test_case)
+
+    assert copied == metamorphic_test_case
+    assert copied is not metamorphic_test_case
+
+    copied.source_outputs_set_at(0, 3)
+    assert copied != metamorphic_test_case
+
+
+def test_missing_outputs_are_counted_on_write():
+    metamorphic_test_case = MetamorphicTestCase()
+    metamorphic_test_case.source_inputs = [1, 2]
+    metamorphic_test_case.followup_inputs = (3, 4)
+    metamorphic_test_case.followup_inputs = 5
+    assert metamorphic_test_case.missing_source_outputs == 2
+    assert metamorphic_test_case.missing_followup_outputs == 3
+
+    assert not metamorphic_test_case.source_outputs_set_at(0, "a")
+    assert not metamorphic_test_case.source_outputs_set_at(0, "b")
+    assert metamorphic_test_case.missing_source_outputs == 1
+    assert metamorphic_test_case.source_outputs_set_at(1, "c")
+    assert metamorphic_test_case.missing_source_outputs == 0
+
+    metamorphic_test_case.source_outputs_set_at(1, UninitializedValue)
+    assert metamorphic_test_case.missing_source_outputs == 1
+
+    metamorphic_test_case.followup_outputs = ["x", UninitializedValue, "z"]
+    assert metamorphic_test_case.missing_followup_outputs == 1
+    assert copy.deepcopy(metamorphic_test_case).missing_followup_outputs == 1
@@ -0,0 +1,62 @@
+import threading
+
+import numpy as np
+
+from gemtest.metamorphic_test_case import MetamorphicTestCase
+from gemtest.testcase_queue import InputQueue, InputQueueItem
+from gemtest.utils.prefetcher import Prefetcher
+from gemtest.utils.resource_cache import get_resource_cache
+
+
+def create_queue(tmp_path, count, loader):
+    queue = InputQueue()
+    for i in range(count):
+        path = tmp_path / f"array_{i}.npy"
+        np.save(path, np.full(4, i))
+        mtc = MetamorphicTestCase()
+        mtc.source_inputs = [str(path)]
+        mtc.data_loader = loader
+        queue.append(InputQueueItem(mtc, 0, is_source=True))
+    return queue
+
+
+def test_prefetch_loads_the_next_batches(tmp_path):
+    thread_names = []
+
+    def loader(path):
+        thread_names.append(threading.current_thread().name)
+        return np.load(path)
+
+    queue = create_queue(tmp_path, 6, loader)
+    prefetcher = Prefetcher(depth=2, workers=2)
+    prefetcher.prefetch(queue, batch_size=2)
+    prefetcher.close()
+
+    assert prefetcher.submitted == 4
+    assert len(thread_names) == 4
+    assert all(name.startswith("gemtest-prefetch") for name in thread_names)
+
+    # prefetched inputs are taken from the cache
+    assert queue[0].get_input()[0] == 0
+    assert len(thread_names) == 4
+    get_resource_cache().clear()
+
+
+def test_prefetch_skips_cached_inputs(tmp_path):
+    queue = create_queue(tmp_path, 2, np.load)
+    queue[0].get_input()
+    prefetcher = Prefetcher(depth=2)
+    prefetcher.prefetch(queue)
+    prefetcher.close()
+
+    assert prefetcher.submitted == 1
+    get_resource_cache().clear()
+
+
+def test_prefetch_skips_inputs_without_data_loader():
+    mtc = MetamorphicTestCase()
+    mtc.source_inputs = [1]
+    prefetcher = Prefetcher(depth=1)
+    prefetcher.prefetch(InputQueue([InputQueueItem(mtc, 0, is_source=True)]))
+
+    assert prefetcher.submitted == 0
@@ -0,0 +1,104 @@
+import threading
+
+import numpy as np
+import pytest
+
+from gemtest.utils.resource_cache import ResourceCache
+
+
+def write_arrays(tmp_path, count, size=10):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"array_{i}.npy"
+        np.save(path, np.full(size, i, dtype=np.uint8))
+        paths.append(str(path))
+    return paths
+
+
+def test_resource_is_loaded_once(tmp_path):
+    calls = []
+
+    def loader(path):
+        calls.append(path)
+        return np.load(path)
+
+    cache = ResourceCache()
+    path = write_arrays(tmp_path, 1)[0]
+    first = cache.get(path, loader)
+    second = cache.get(path, loader)
+
+    assert first is second
+    assert calls == [path]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cached_arrays_are_read_only(tmp_path):
+    cache = ResourceCache()
+    path = write_arrays(tmp_path, 1)[0]
+    array = cache.get(path, np.load)
+
+    with pytest.raises(ValueError):
+        array[0] = 1
+
+
+def test_least_recently_used_resource_is_evicted(tmp_path):
+    cache = ResourceCache(max_bytes=20)
+    first, second, third = write_arrays(tmp_path, 3)
+    cache.get(first, np.load)
+    cache.get(second, np.load)
+    cache.get(first, np.load)
+    cache.get(third, np.load)
+
+    assert len(cache) == 2
+    assert cache.size == 20
+    assert cache.lookup(cache.key(second, np.load)) is None
+    assert cache.lookup(cache.key(first, np.load)) is not None
+
+
+def test_resources_larger_than_the_cache_are_not_cached(tmp_path):
+    cache = ResourceCache(max_bytes=5)
+    path = write_arrays(tmp_path, 1)[0]
+    cache.get(path, np.load)
+
+    assert len(cache) == 0
+
+
+def test_different_loaders_are_cached_separately(tmp_path):
+    cache = ResourceCache()
+    path = write_arrays(tmp_path, 1)[0]
+    array = cache.get(path, np.load)
+    doubled = cache.get(path, lambda p: np.load(p) * 2)
+
+    assert array is not doubled
+    assert len(cache) == 2
+
+
+def test_concurrent_loads_of_the_same_file_are_deduplicated(tmp_path):
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_loader(path):
+        calls.append(path)
+        started.set()
+        release.wait(5)
+        return np.load(path)
+
+    cache = ResourceCache()
+    path = write_arrays(tmp_path, 1)[0]
+    results = []
+
+    def load():
+        results.append(cache.get(path, slow_loader))
+
+    loader_thread = threading.Thread(target=load)
+    loader_thread.start()
+    started.wait(5)
+    waiting_thread = threading.Thread(target=load)
+    waiting_thread.start()
+    release.set()
+    loader_thread.join(5)
+    waiting_thread.join(5)
+
+    assert calls == [path]
+    assert results[0] is results[1]
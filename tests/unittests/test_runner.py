@@ -0,0 +1,279 @@
+import json
+import sqlite3
+import textwrap
+
+import pytest
+from pytest import ExitCode
+
+import gemtest as gmt
+from gemtest.runner import main, resolve_module_names
+
+TEST_MODULE = """
+import threading
+
+import gemtest as gmt
+
+mr_1 = gmt.create_metamorphic_relation(name="mr_1", data=range(30))
+sut_threads = set()
+
+
+@gmt.transformation(mr_1)
+def add_one(source_input):
+    return source_input + 1
+
+
+@gmt.relation(mr_1)
+def is_greater(source_output, followup_output):
+    return source_output < followup_output
+
+
+@gmt.system_under_test(mr_1)
+def test_identity(x):
+    sut_threads.add(threading.current_thread().name)
+    return x
+
+
+@gmt.system_under_test(mr_1)
+def test_wrong_on_three(x):
+    if x == 4:
+        raise ValueError("sut error")
+    return -1 if x == 3 else x
+"""
+
+BATCHED_TEST_MODULE = """
+import threading
+import time
+
+import gemtest as gmt
+
+mr_1 = gmt.create_metamorphic_relation(name="mr_1", data=range(30))
+sut_threads = set()
+batch_sizes = set()
+
+
+@gmt.transformation(mr_1)
+def add_one(source_input):
+    return source_input + 1
+
+
+@gmt.relation(mr_1)
+def is_greater(source_output, followup_output):
+    return source_output < followup_output
+
+
+@gmt.system_under_test(mr_1)
+def test_batched_identity(xs):
+    sut_threads.add(threading.current_thread().name)
+    batch_sizes.add(len(xs))
+    # keeps the first thread busy, an idle thread would execute the other parts, too
+    time.sleep(0.01)
+    return list(xs)
+"""
+
+
+ISOLATED_TEST_MODULE = """
+import os
+
+import gemtest as gmt
+
+mr_1 = gmt.create_metamorphic_relation(name="mr_1", data=range(5))
+mr_2 = gmt.create_metamorphic_relation(name="mr_2", data=range(5))
+
+
+def count_worker_start():
+    with open(os.path.join(os.path.dirname(__file__), "starts.txt"), "a") as starts:
+        starts.write(f"{os.getpid()}\\n")
+
+
+@gmt.transformation(mr_1, mr_2)
+def add_one(source_input):
+    return source_input + 1
+
+
+@gmt.relation(mr_1, mr_2)
+def is_greater(source_output, followup_output):
+    return source_output < followup_output
+
+
+@gmt.system_under_test(mr_1, mr_2, isolated=True, worker_initializer=count_worker_start)
+def test_isolated_identity(x):
+    return x
+"""
+
+
+@pytest.fixture
+def test_module(tmp_path):
+    """
+    Writes a test module with a unique name, the metamorphic test suite is shared by all
+    tests.
+    """
+
+    def create(name, source=TEST_MODULE):
+        path = tmp_path / f"test_{name}.py"
+        path.write_text(textwrap.dedent(source))
+        return path
+
+    return create
+
+
+def test_run_module(test_module, tmp_path):
+    jsonl = tmp_path / "results.jsonl"
+
+    summary = gmt.run(str(test_module("runner_module")), on_error=gmt.ErrorMode.CONTINUE,
+                      chunk_size=7, jsonl=str(jsonl))
+
+    # source input 3 fails, its follow-up input 4 and source input 4 raise
+    assert (summary.passed, summary.failed, summary.errors, summary.skipped) == (57, 1, 2, 0)
+    assert summary.exit_code == ExitCode.TESTS_FAILED
+    assert [failure.split(":")[0] for failure in summary.failures] == [
+        "mr_1[test_wrong_on_three] mtc_3", "mr_1[test_wrong_on_three] mtc_4",
+        "mr_1[test_wrong_on_three] mtc_5"]
+    assert "SUTExecutionError" in summary.failures[1]
+    results = [json.loads(line) for line in jsonl.read_text().splitlines()]
+    assert len(results) == 60
+    assert [result["mtc_index"] for result in results[:30]] == list(range(30))
+    assert {result["sut_name"] for result in results} == {"test_identity",
+                                                          "test_wrong_on_three"}
+    assert [result["test_result"] for result in results].count("failed") == 3
+    assert summary.format().splitlines()[-1].startswith("57 passed, 1 failed, 2 errors")
+
+
+def test_run_with_threads_and_batches(test_module):
+    path = test_module("runner_threads", BATCHED_TEST_MODULE)
+
+    summary = gmt.run(str(path), threads=4, batch_size=4)
+
+    module = __import__(resolve_module_names(str(path))[0])
+    assert (summary.passed, summary.failed) == (30, 0)
+    # batches are only filled within the part of the test cases of a thread
+    assert max(module.batch_sizes) == 4
+    assert all(name.startswith("gemtest-execute") for name in module.sut_threads)
+    assert len(module.sut_threads) > 1
+
+
+def test_run_stops_on_error(test_module, tmp_path):
+    jsonl = tmp_path / "results.jsonl"
+
+    summary = gmt.run(str(test_module("runner_exit")), chunk_size=2, jsonl=str(jsonl))
+
+    assert summary.exit_code == ExitCode.INTERRUPTED
+    assert "sut error" in summary.interrupted
+    # test_identity and the chunks of test_wrong_on_three before the error
+    assert summary.passed == 30 + 2
+    assert len(jsonl.read_text().splitlines()) == summary.total
+
+
+def test_run_writes_database(test_module, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    summary = gmt.run(str(test_module("runner_database")),
+                      on_error=gmt.ErrorMode.CONTINUE, database=True)
+
+    databases = list((tmp_path / "gemtest_results").glob("*.db"))
+    assert len(databases) == 1
+    connection = sqlite3.connect(databases[0])
+    rows = connection.execute("SELECT test_result, COUNT(*) FROM mtc_results "
+                              "GROUP BY test_result ORDER BY test_result").fetchall()
+    connection.close()
+    assert rows == [("failed", 3), ("passed", summary.passed)]
+
+
+def test_run_keeps_the_isolated_worker_across_relations(test_module, tmp_path):
+    summary = gmt.run(str(test_module("runner_isolated", ISOLATED_TEST_MODULE)))
+
+    assert summary.passed == 10
+    assert len((tmp_path / "starts.txt").read_text().splitlines()) == 1
+
+
+def test_main(test_module, capsys):
+    path = test_module("runner_main")
+
+    assert main(["run", str(path), "--on-error", "continue", "--threads", "2"]) == \
+        ExitCode.TESTS_FAILED
+    assert "57 passed, 1 failed, 2 errors, 0 skipped" in capsys.readouterr().out
+    assert main(["run", "tests.unittests.no_such_module"]) == ExitCode.INTERRUPTED
+
+
+def test_run_without_test_cases(test_module):
+    path = test_module("runner_empty", "import gemtest\n")
+    assert gmt.run(str(path)).exit_code == ExitCode.NO_TESTS_COLLECTED
+
+
+def test_resolve_module_names(tmp_path):
+    package = tmp_path / "runner_package"
+    (package / "sub").mkdir(parents=True)
+    for file in ("__init__.py", "sub/__init__.py", "sub/test_a.py", "b_test.py",
+                 "helpers.py"):
+        (package / file).write_text("")
+
+    assert resolve_module_names(str(package)) == ["runner_package.b_test",
+                                                  "runner_package.sub.test_a"]
+    assert resolve_module_names("tests.unittests.test_runner") == \
+        ["tests.unittests.test_runner"]
+
+
+def create_relation(name, size=20):
+    return gmt.create_metamorphic_relation(
+        name=name, data=range(size), transform=lambda x: x + 1,
+        relation=lambda source_output, followup_output: source_output < followup_output)
+
+
+def test_execute_is_driven_by_the_consumer():
+    mr_id = create_relation("execute_lazily")
+    calls = []
+
+    def execute_sut(x):
+        calls.append(x)
+        return x
+
+    results = gmt.execute(mr_id, sut=execute_sut)
+    first = [next(results) for _ in range(3)]
+    # source and follow-up input of the first three test cases only
+    assert len(calls) == 6
+    assert [result.identity.mtc_index for result in first] == [0, 1, 2]
+    assert first[0].outcome == "passed"
+    assert first[0].name == "execute_lazily[execute_sut] mtc_1"
+    assert first[0].test_case.report.test_result == "passed"
+
+    assert [result.outcome for result in results] == ["passed"] * 17
+    assert len(calls) == 40
+
+
+def test_execute_with_registered_suts_and_threads():
+    mr_id = create_relation("execute_suts", size=40)
+
+    def execute_identity(x):
+        return x
+
+    def execute_negate(xs):
+        return [-x for x in xs]
+
+    assert len(list(gmt.execute(mr_id, sut=execute_identity))) == 40
+    results = list(gmt.execute([mr_id], sut=[execute_negate, "execute_identity"],
+                               chunk_size=10, threads=4, batch_size=2))
+
+    assert [result.sut_id for result in results] == \
+        ["execute_negate"] * 40 + ["execute_identity"] * 40
+    assert {result.outcome for result in results[:40]} == {"failed"}
+    assert {result.outcome for result in results[40:]} == {"passed"}
+    assert results[0].message.startswith("The Metamorphic Relation does not hold")
+    with pytest.raises(ValueError):
+        next(gmt.execute(mr_id, sut="execute_unknown"))
+
+
+def test_execute_yields_the_results_before_an_error():
+    mr_id = create_relation("execute_error")
+
+    def execute_failing_sut(x):
+        if x == 4:
+            raise ValueError("sut error")
+        return x
+
+    results = []
+    with pytest.raises(SystemExit):
+        for result in gmt.execute(mr_id, sut=execute_failing_sut, chunk_size=3):
+            results.append(result)
+
+    # the chunk of the follow-up input 4 is interrupted by the error
+    assert [result.outcome for result in results] == ["passed"] * 3 + ["error"]
+    assert results[-1].identity.mtc_index == 3
@@ -0,0 +1,156 @@
+import random
+
+import pytest
+
+from gemtest import data
+from gemtest.data.sampling import reservoir_sample, reservoir_samples
+from gemtest.metamorphic_relation import MetamorphicRelation
+from gemtest.testing_strategy import TestingStrategy
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    for path in ("a.png", "b.jpg", "c.txt", "sub/d.png", "sub/deeper/e.PNG", "sub/f.png"):
+        file = tmp_path / path
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text(path)
+    return tmp_path
+
+
+def relative(paths, root):
+    return [str(path)[len(str(root)) + 1:].replace("\\", "/") for path in paths]
+
+
+def test_from_glob_recursive(corpus):
+    paths = list(data.from_glob(f"{corpus}/**/*.png"))
+    assert relative(paths, corpus) == ["a.png", "sub/d.png", "sub/f.png"]
+
+
+def test_from_glob_not_recursive(corpus):
+    paths = list(data.from_glob(f"{corpus}/*.png"))
+    assert relative(paths, corpus) == ["a.png"]
+
+
+def test_from_glob_single_directory_level(corpus):
+    paths = list(data.from_glob(f"{corpus}/*/?.png"))
+    assert relative(paths, corpus) == ["sub/d.png", "sub/f.png"]
+
+
+def test_from_glob_character_class(corpus):
+    paths = list(data.from_glob(f"{corpus}/[!a]*"))
+    assert relative(paths, corpus) == ["b.jpg", "c.txt"]
+
+
+def test_from_directory(corpus):
+    paths = list(data.from_directory(corpus, extensions=(".png",)))
+    assert relative(paths, corpus) == ["a.png", "sub/d.png", "sub/deeper/e.PNG", "sub/f.png"]
+
+
+def test_from_directory_sorts_bounded_chunks(corpus, monkeypatch):
+    monkeypatch.setattr(data.stream, "SORT_CHUNK_SIZE", 2)
+    paths = list(data.from_directory(corpus, extensions=(".png",)))
+    assert sorted(relative(paths, corpus)) == ["a.png", "sub/d.png", "sub/deeper/e.PNG",
+                                               "sub/f.png"]
+
+
+def test_from_directory_does_not_follow_directory_links(corpus):
+    try:
+        (corpus / "sub" / "loop").symlink_to(corpus, target_is_directory=True)
+    except OSError:
+        pytest.skip("symbolic links are not supported")
+    paths = list(data.from_directory(corpus, extensions=(".png",)))
+    assert relative(paths, corpus) == ["a.png", "sub/d.png", "sub/deeper/e.PNG", "sub/f.png"]
+
+
+def test_from_missing_directory(tmp_path):
+    assert list(data.from_directory(tmp_path / "missing")) == []
+
+
+def test_file_stream_has_no_length(corpus):
+    with pytest.raises(TypeError):
+        len(data.from_directory(corpus))  # noqa
+
+
+def test_reservoir_sample():
+    sample, count = reservoir_sample(iter(range(1000)), 10, random.Random(0))
+    assert count == 1000
+    assert len(set(sample)) == 10
+
+
+def test_reservoir_sample_smaller_iterable():
+    assert reservoir_sample(iter(range(3)), 10) == ([0, 1, 2], 3)
+
+
+def test_reservoir_samples():
+    samples, count = reservoir_samples(iter(range(100)), 5, 3, random.Random(0))
+    assert count == 100
+    assert len(samples) == 5
+    assert all(len(set(sample)) == 3 for sample in samples)
+
+
+def test_reservoir_samples_are_uniform():
+    rng = random.Random(0)
+    counts = [0] * 10
+    for _ in range(500):
+        samples, _ = reservoir_samples(iter(range(10)), 4, 2, rng)
+        for sample in samples:
+            for element in sample:
+                counts[element] += 1
+    assert all(300 < count < 500 for count in counts)
+
+
+def test_reservoir_samples_smaller_iterable():
+    assert reservoir_samples(iter(range(2)), 2, 3) == ([[0, 1], [0, 1]], 2)
+
+
+def create_relation(source, testing_strategy, number_of_test_cases=1, number_of_sources=1):
+    return MetamorphicRelation(mr_id="mr1", data=source,
+                               testing_strategy=testing_strategy,
+                               number_of_test_cases=number_of_test_cases,
+                               number_of_sources=number_of_sources)
+
+
+def test_generate_test_cases_sample_from_stream(corpus):
+    mr = create_relation(data.from_directory(corpus), TestingStrategy.SAMPLE, 4)
+    mr.generate_test_cases()
+    sources = [mtc.source_input for mtc in mr.mtc_templates]
+    assert len(sources) == 4
+    assert len(set(sources)) == 4
+
+
+def test_generate_test_cases_sample_multiple_sources_from_stream(corpus):
+    mr = create_relation(data.from_directory(corpus), TestingStrategy.SAMPLE, 3, 2)
+    mr.generate_test_cases()
+    assert len(mr.mtc_templates) == 3
+    assert all(len(set(mtc.source_inputs)) == 2 for mtc in mr.mtc_templates)
+
+
+def test_generate_test_cases_exhaustive_from_stream(corpus):
+    mr = create_relation(data.from_directory(corpus), TestingStrategy.EXHAUSTIVE)
+    mr.generate_test_cases()
+    assert len(mr.mtc_templates) == 6
+
+
+def test_generate_test_cases_exhaustive_multiple_sources_from_stream(corpus):
+    mr = create_relation(data.from_directory(corpus), TestingStrategy.EXHAUSTIVE,
+                         number_of_sources=2)
+    mr.generate_test_cases()
+    assert len(mr.mtc_templates) == 15
+
+
+def test_generate_test_cases_empty_stream(tmp_path):
+    mr = create_relation(data.from_directory(tmp_path), TestingStrategy.SAMPLE)
+    with pytest.raises(ValueError):
+        mr.generate_test_cases()
+
+
+def test_generate_test_cases_more_test_cases_than_stream(corpus):
+    mr = create_relation(data.from_directory(corpus), TestingStrategy.SAMPLE, 7)
+    with pytest.raises(ValueError):
+        mr.generate_test_cases()
+
+
+def test_generate_test_cases_more_sources_than_stream(corpus):
+    mr = create_relation(data.from_directory(corpus), TestingStrategy.SAMPLE, 1, 7)
+    with pytest.raises(ValueError):
+        mr.generate_test_cases()
@@ -46,4 +46,51 @@ def test_randomized_generator():
 
     assert result == 10
     assert kwargs['arg2'] == 7
-    assert is_parameterized == True
\ No newline at end of file
+    assert is_parameterized == True
+
+def test_get_caller_module():
+    assert MetamorphicTestSuite.get_caller_module() == __name__
+    assert MetamorphicTestSuite.get_caller_module("generated.suite") == "generated.suite"
+
+
+def test_get_caller_module_skips_gemtest_frames():
+    mr_id = MetamorphicTestSuite().add_metamorphic_relation(
+        name="caller_module_mr", data=[1], testing_strategy=TestingStrategy.SAMPLE,
+        number_of_test_cases=1, number_of_sources=1)
+    assert mr_id == f"{__name__}.caller_module_mr"
+
+
+def test_add_metamorphic_relation_with_explicit_module():
+    mr_id = MetamorphicTestSuite().add_metamorphic_relation(
+        name="explicit_module_mr", data=[1], testing_strategy=TestingStrategy.SAMPLE,
+        number_of_test_cases=1, number_of_sources=1, module="generated.suite")
+    assert mr_id == "generated.suite.explicit_module_mr"
+
+
+def test_module_index_does_not_match_other_modules():
+    suite = MetamorphicTestSuite()
+    ids = [suite.add_metamorphic_relation(name="indexed_mr", data=[1],
+                                          testing_strategy=TestingStrategy.SAMPLE,
+                                          number_of_test_cases=1, number_of_sources=1,
+                                          module=module)
+           for module in ("pkg.test_a", "pkg.test_a_extended", "pkg.test_a.nested")]
+
+    assert suite.get_module_metamorphic_relation_ids("pkg.test_a") == [ids[0]]
+    assert suite.get_module_metamorphic_relation_ids("pkg.test_a.nested") == [ids[2]]
+    assert suite.get_module_metamorphic_relation_ids("pkg") == []
+
+    del suite.get_metamorphic_relations()[ids[0]]
+    assert suite.get_module_metamorphic_relation_ids("pkg.test_a") == []
+
+
+def test_metamorphic_relations_are_indexed_in_the_order_they_are_added():
+    suite = MetamorphicTestSuite()
+    ids = [suite.add_metamorphic_relation(name=f"numbered_mr_{i}", data=[1],
+                                          testing_strategy=TestingStrategy.SAMPLE,
+                                          number_of_test_cases=1, number_of_sources=1)
+           for i in range(2)]
+    first, second = (suite.get_metamorphic_relation(mr_id) for mr_id in ids)
+
+    assert second.index == first.index + 1
+    assert suite.get_metamorphic_relation_by_index(first.index) is first
+    assert first.name == "numbered_mr_0"
@@ -0,0 +1,240 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from gemtest.metamorphic_error import ErrorMode, SUTCrashError, SUTExecutionError, \
+    SUTTimeoutError
+from gemtest.metamorphic_relation import MetamorphicRelation
+from gemtest.metamorphic_test_case import MetamorphicTestCase
+from gemtest.sut_executor import IsolatedSUTExecutor, ThreadedSUTExecutor
+from gemtest.testcase_queue import InputQueue, InputQueueItem
+from gemtest.testing_strategy import TestingStrategy
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32",
+                                reason="the tests rely on os.kill semantics")
+
+
+def double(batch):
+    return [x * 2 for x in batch]
+
+
+def crash_on_three(batch):
+    if 3 in batch:
+        os._exit(13)
+    return batch
+
+
+def raise_error(_):
+    raise ValueError("sut error")
+
+
+def worker_pid(_):
+    return os.getpid()
+
+
+def current_thread(batch):
+    loop_on_three(batch)
+    return threading.current_thread()
+
+
+def loop_on_three(batch):
+    while 3 in batch:
+        time.sleep(0.01)
+    return batch
+
+
+def replace_with_test_function(sut):
+    """
+    Replaces a SUT in its module like @gmt.system_under_test does.
+    """
+
+    def test_function():
+        pass
+
+    test_function.gemtest_sut = sut
+    return test_function
+
+
+@replace_with_test_function
+def replaced_sut(batch):
+    return [x + 1 for x in batch]
+
+
+def test_isolated_call():
+    executor = IsolatedSUTExecutor(double)
+    assert executor([1, 2]) == [2, 4]
+    assert executor.pid != os.getpid()
+    executor.close()
+
+
+def test_isolated_replaced_sut():
+    executor = IsolatedSUTExecutor(replaced_sut.gemtest_sut)
+    assert executor([1, 2]) == [2, 3]
+    executor.close()
+
+
+def test_isolated_local_sut_is_rejected():
+    def local_sut(batch):
+        return batch
+
+    executor = IsolatedSUTExecutor(local_sut)
+    with pytest.raises(ValueError, match="top level of its module"):
+        executor([1])
+    with pytest.raises(ValueError, match="picklable"):
+        IsolatedSUTExecutor(double, initializer=lambda: None)([1])
+
+
+def test_isolated_exception():
+    executor = IsolatedSUTExecutor(raise_error)
+    with pytest.raises(ValueError, match="sut error"):
+        executor([1])
+    assert executor.crashes == 0
+    executor.close()
+
+
+def test_isolated_crash_restarts_worker():
+    executor = IsolatedSUTExecutor(crash_on_three)
+    with pytest.raises(SUTCrashError, match="exit code 13"):
+        executor([3])
+    assert executor.crashes == 1
+    assert executor([1]) == [1]
+    executor.close()
+
+
+def test_isolated_recycle_after_batches():
+    executor = IsolatedSUTExecutor(worker_pid, max_batches=2)
+    first = executor(0)
+    assert executor(0) == first
+    assert executor(0) != first
+    assert executor.recycles == 1
+    executor.close()
+
+
+def test_isolated_recycle_rss():
+    executor = IsolatedSUTExecutor(worker_pid, max_rss=1)
+    first = executor(0)
+    assert executor(0) != first
+    executor.close()
+
+
+def test_crash_only_fails_batch():
+    test_cases = [MetamorphicTestCase() for _ in range(6)]
+    for i, mtc in enumerate(test_cases):
+        mtc.source_inputs = i
+
+    mr = MetamorphicRelation(mr_id="mr1",
+                             data=range(6),
+                             testing_strategy=TestingStrategy.EXHAUSTIVE,
+                             number_of_test_cases=1,
+                             number_of_sources=1)
+    mr.q_ready[crash_on_three.__name__] = InputQueue(
+        InputQueueItem(mtc, 0, is_source=True) for mtc in test_cases
+    )
+    mr.transform = lambda x: x
+    mr.system_under_test = crash_on_three
+    mr.sut_executors[crash_on_three.__name__] = IsolatedSUTExecutor(crash_on_three)
+    mr.sut_batch_size[crash_on_three.__name__] = 2
+    mr.on_error = ErrorMode.CONTINUE
+
+    for mtc in test_cases:
+        mr.create_source_outputs(mtc, crash_on_three.__name__)
+
+    assert isinstance(test_cases[2].error, SUTExecutionError)
+    assert isinstance(test_cases[3].error, SUTCrashError)
+    assert all(test_cases[i].error is None for i in (0, 1, 4, 5))
+    assert test_cases[5].source_output == 5
+    mr.sut_executors[crash_on_three.__name__].close()
+
+
+def test_threaded_timeout():
+    executor = ThreadedSUTExecutor(loop_on_three, timeout=0.2)
+    assert executor([1]) == [1]
+    with pytest.raises(SUTTimeoutError):
+        executor([3])
+    assert executor.timeouts == 1
+
+
+def test_threaded_keeps_its_thread_until_a_timeout():
+    executor = ThreadedSUTExecutor(current_thread, timeout=0.2)
+    first = executor([1])
+    assert first is not threading.current_thread()
+    assert executor([2]) is first
+
+    with pytest.raises(SUTTimeoutError):
+        executor([3])
+    assert executor([4]) not in (first, threading.current_thread())
+    executor.close()
+
+
+def test_timeout_stops_the_session_on_exit():
+    test_cases = [MetamorphicTestCase() for _ in range(5)]
+    for i, mtc in enumerate(test_cases):
+        mtc.source_inputs = i
+
+    mr = MetamorphicRelation(mr_id="mr1",
+                             data=range(5),
+                             testing_strategy=TestingStrategy.EXHAUSTIVE,
+                             number_of_test_cases=1,
+                             number_of_sources=1)
+    mr.q_ready[loop_on_three.__name__] = InputQueue(
+        InputQueueItem(mtc, 0, is_source=True) for mtc in test_cases
+    )
+    mr.transform = lambda x: x
+    mr.system_under_test = loop_on_three
+    mr.sut_executors[loop_on_three.__name__] = ThreadedSUTExecutor(loop_on_three, 0.2)
+    mr.sut_batch_size[loop_on_three.__name__] = 1
+
+    with pytest.raises(SystemExit):
+        for mtc in test_cases:
+            mr.create_source_outputs(mtc, loop_on_three.__name__)
+    assert isinstance(test_cases[3].error, SUTTimeoutError)
+
+
+def test_threaded_error():
+    executor = ThreadedSUTExecutor(raise_error, timeout=1)
+    with pytest.raises(ValueError, match="sut error"):
+        executor([1])
+
+
+def test_isolated_timeout_kills_worker():
+    executor = IsolatedSUTExecutor(loop_on_three, timeout=0.5)
+    assert executor([1]) == [1]
+    pid = executor.pid
+    with pytest.raises(SUTTimeoutError):
+        executor([3])
+    assert executor.pid is None
+    assert executor([2]) == [2]
+    assert executor.pid != pid
+    executor.close()
+
+
+def test_timeout_only_fails_batch():
+    test_cases = [MetamorphicTestCase() for _ in range(5)]
+    for i, mtc in enumerate(test_cases):
+        mtc.source_inputs = i
+
+    mr = MetamorphicRelation(mr_id="mr1",
+                             data=range(5),
+                             testing_strategy=TestingStrategy.EXHAUSTIVE,
+                             number_of_test_cases=1,
+                             number_of_sources=1)
+    mr.q_ready[loop_on_three.__name__] = InputQueue(
+        InputQueueItem(mtc, 0, is_source=True) for mtc in test_cases
+    )
+    mr.transform = lambda x: x
+    mr.relation = lambda x, y: x == y
+    mr.system_under_test = loop_on_three
+    mr.sut_executors[loop_on_three.__name__] = ThreadedSUTExecutor(loop_on_three, 0.2)
+    mr.sut_batch_size[loop_on_three.__name__] = 1
+    mr.on_error = ErrorMode.CONTINUE
+
+    for mtc in test_cases:
+        mr.create_source_outputs(mtc, loop_on_three.__name__)
+
+    assert isinstance(test_cases[3].error, SUTTimeoutError)
+    assert all(test_cases[i].error is None for i in (0, 1, 2, 4))
+    assert mr.create_execution_report(test_cases[3]).error_type == "SUTTimeoutError"
+    assert mr.create_execution_report(test_cases[4]).error_type == ""
@@ -3,7 +3,7 @@ from pathlib import Path
 import pytest
 
 import gemtest
-from gemtest.utils.sut_loader import load_sut_from_path, get_sut
+from gemtest.utils.sut_loader import load_sut_from_path, get_sut, get_sut_pool, SUTRegistry
 
 
 class TestSUT:
@@ -44,3 +44,68 @@ def setup_config(monkeypatch):
 def test_get_sut(setup_config):
     sut = get_sut()
     assert 1 == sut.execute()
+
+
+class CountingSUT:
+    instances = 0
+    warmups = 0
+
+    def __init__(self, scale=1):
+        CountingSUT.instances += 1
+        self.scale = scale
+
+    def warmup(self):
+        CountingSUT.warmups += 1
+
+    def execute(self, value):
+        return value * self.scale
+
+
+@pytest.fixture
+def registry():
+    SUTRegistry().clear()
+    yield SUTRegistry()
+    SUTRegistry().clear()
+
+
+def test_registry_loads_once(registry):
+    first = registry.get(Path(__file__), "CountingSUT")
+    second = registry.get(Path(__file__), "CountingSUT")
+    assert first is second
+    # the registry executes the module itself, so the counters live on the loaded class
+    assert type(first).instances == 1
+
+
+def test_registry_keyed_by_constructor_args(registry):
+    default = registry.get(Path(__file__), "CountingSUT")
+    scaled = registry.get(Path(__file__), "CountingSUT", scale=2)
+    assert default is not scaled
+    assert scaled.execute(3) == 6
+    assert registry.get(Path(__file__), "CountingSUT", scale=2) is scaled
+
+
+def test_registry_warmup_once(registry):
+    sut = registry.warmup(Path(__file__), "CountingSUT")
+    assert registry.warmup(Path(__file__), "CountingSUT") is sut
+    assert type(sut).warmups == 1
+
+
+def test_registry_pool(registry):
+    pool = registry.get_pool(Path(__file__), "CountingSUT", 3)
+    assert len(pool) == 3
+    assert registry.get(Path(__file__), "CountingSUT") in pool.instances
+    assert type(pool.instances[0]).warmups == 3
+    assert registry.get_pool(Path(__file__), "CountingSUT", 3) is pool
+
+    with pool.acquire() as first, pool.acquire() as second:
+        assert first is not second
+
+
+def test_registry_pool_size(registry):
+    with pytest.raises(ValueError):
+        registry.get_pool(Path(__file__), "CountingSUT", 0)
+
+
+def test_get_sut_cached(setup_config, registry):
+    assert get_sut() is get_sut()
+    assert get_sut_pool(2).instances[0] is get_sut()
@@ -0,0 +1,103 @@
+import os
+import socket
+import stat
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+if not hasattr(socket, "AF_UNIX"):
+    pytest.skip("unix sockets are not available", allow_module_level=True)
+
+import gemtest as gmt  # noqa
+from gemtest.logger import logger  # noqa
+from gemtest.utils.sut_loader import SUTRegistry  # noqa
+from gemtest.utils.sut_server import SUTServer, RemoteSUT, RemoteSUTError, \
+    send_message, recv_message  # noqa
+
+
+class ArraySUT:
+
+    @staticmethod
+    def execute(batch):
+        return [x * 2 for x in batch]
+
+    @staticmethod
+    def fail(_):
+        raise ValueError("sut failure")
+
+
+@pytest.fixture
+def server():
+    SUTRegistry().clear()
+    socket_path = os.path.join(tempfile.mkdtemp(), "sut.sock")
+    sut_server = SUTServer(socket_path, Path(__file__), "ArraySUT")
+    thread = threading.Thread(target=sut_server.serve_forever, daemon=True)
+    thread.start()
+    yield socket_path
+    sut_server.shutdown()
+    sut_server.server_close()
+    SUTRegistry().clear()
+
+
+def test_message_framing():
+    left, right = socket.socketpair()
+    array = np.arange(12, dtype=np.float32).reshape(3, 4)
+    send_message(left, {"array": array, "value": 1})
+    message = recv_message(right)
+    assert message["value"] == 1
+    assert np.array_equal(message["array"], array)
+    left.close()
+    right.close()
+
+
+def test_remote_sut_batch(server):
+    remote_sut = RemoteSUT(server)
+    batch = [np.ones((4, 4), dtype=np.uint8), np.zeros((2, 2), dtype=np.uint8)]
+    result = remote_sut.execute(batch)
+    assert np.array_equal(result[0], batch[0] * 2)
+    assert np.array_equal(result[1], batch[1] * 2)
+    remote_sut.close()
+
+
+def test_remote_sut_error(server):
+    remote_sut = RemoteSUT(server)
+    with pytest.raises(RemoteSUTError, match="sut failure"):
+        remote_sut.fail(1)
+    # the connection is still usable after an error of the SUT
+    assert remote_sut.execute([1]) == [2]
+    remote_sut.close()
+
+
+def test_socket_removed_on_close():
+    socket_path = os.path.join(tempfile.mkdtemp(), "sut.sock")
+    sut_server = SUTServer(socket_path, Path(__file__), "ArraySUT")
+    assert os.path.exists(socket_path)
+    sut_server.server_close()
+    assert not os.path.exists(socket_path)
+
+
+def test_existing_file_is_not_removed():
+    socket_path = os.path.join(tempfile.mkdtemp(), "sut.sock")
+    Path(socket_path).write_text("not a socket")
+    with pytest.raises(OSError):
+        SUTServer(socket_path, Path(__file__), "ArraySUT")
+    assert Path(socket_path).read_text() == "not a socket"
+
+
+def test_socket_is_private(server):
+    assert stat.S_IMODE(os.stat(server).st_mode) == 0o600
+
+
+def test_constructor_arguments_are_ignored_with_an_endpoint(server, monkeypatch):
+    warnings = []
+    monkeypatch.setitem(gmt.conftest.CONFIG, "is_sut_dynamic_active", True)
+    monkeypatch.setitem(gmt.conftest.CONFIG, "sut_endpoint", server)
+    monkeypatch.setattr(logger, "warning", lambda *args: warnings.append(args))
+
+    gmt.systems_under_test_dynamic("endpoint_mr")
+    assert not warnings
+    gmt.systems_under_test_dynamic("endpoint_mr", sut_args=(1,))
+    assert len(warnings) == 1
@@ -0,0 +1,159 @@
+import argparse
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from gemtest.data import lazy
+from gemtest.decorator import evaluate_test_case_chunk, MAX_LISTED_FAILURES
+from gemtest.metamorphic_error import InvalidInputError
+from gemtest.metamorphic_relation import MetamorphicRelation
+from gemtest.testcase_chunk import MetamorphicTestCaseChunk, parse_granularity, WHOLE_RELATION
+from gemtest.testing_strategy import TestingStrategy
+
+
+def identity(x):
+    return x
+
+
+def create_lazy_relation(factory):
+    mr = MetamorphicRelation(mr_id="mr1", data=lazy(factory),
+                             testing_strategy=TestingStrategy.EXHAUSTIVE,
+                             number_of_test_cases=1,
+                             number_of_sources=1)
+    mr.system_under_test = identity
+    mr.prepare_sut("identity")
+    return mr
+
+
+def test_lazy_relation_is_materialized_once():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return range(4)
+
+    mr = create_lazy_relation(factory)
+    assert mr.is_lazy
+    assert mr.test_cases["identity"] == []
+    assert not calls
+
+    mr.materialize()
+    mr.materialize()
+    assert not mr.is_lazy
+    assert calls == [1]
+    assert len(mr.test_cases["identity"]) == 4
+    assert len(mr.q_ready["identity"]) == 4
+
+
+def test_chunk_test_cases_and_names():
+    mr = create_lazy_relation(lambda: range(6))
+    mr.materialize()
+    chunk = MetamorphicTestCaseChunk(mr, "identity", 2, 5)
+
+    assert chunk.test_cases == mr.test_cases["identity"][2:5]
+    assert chunk.mtc_name(0) == "mtc_3"
+
+
+@pytest.mark.parametrize("granularity, chunk_size", [
+    ("mtc", 1), ("chunk:1", 1), ("chunk:25", 25), ("mr", WHOLE_RELATION)])
+def test_parse_granularity(granularity, chunk_size):
+    assert parse_granularity(granularity) == chunk_size
+
+
+@pytest.mark.parametrize("granularity", ["chunk", "chunk:0", "chunk:-1", "chunk:x", "all"])
+def test_parse_invalid_granularity(granularity):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_granularity(granularity)
+
+
+def test_split_into_chunks():
+    mr = create_lazy_relation(lambda: range(10))
+    mr.materialize()
+
+    chunks = MetamorphicTestCaseChunk.split(mr, "identity", 4)
+    assert [(chunk.start, chunk.stop) for chunk in chunks] == [(0, 4), (4, 8), (8, 10)]
+    assert [chunk.name for chunk in chunks] == ["mtc_1-4", "mtc_5-8", "mtc_9-10"]
+    assert sum((chunk.test_cases for chunk in chunks), []) == mr.test_cases["identity"]
+
+    whole, = MetamorphicTestCaseChunk.split(mr, "identity", WHOLE_RELATION)
+    assert whole.name == "mtc_1-10"
+    assert MetamorphicTestCaseChunk(mr, "identity").name == "lazy"
+
+
+def test_evaluate_chunk_fails_if_any_test_case_fails():
+    mr = create_lazy_relation(lambda: range(3))
+    mr.materialize()
+    test_cases = mr.test_cases["identity"]
+    test_cases[0].relation_result = True
+    test_cases[1].relation_result = False
+    test_cases[2].error = InvalidInputError("invalid")
+    chunk = MetamorphicTestCaseChunk(mr, "identity")
+
+    with pytest.raises(pytest.fail.Exception, match="1 of 3"):
+        evaluate_test_case_chunk(chunk)
+    assert chunk.outcomes == ["passed", "failed", "skipped"]
+
+
+def test_evaluate_chunk_lists_a_limited_number_of_failures():
+    number_of_test_cases = MAX_LISTED_FAILURES + 5
+    mr = create_lazy_relation(lambda: range(number_of_test_cases))
+    mr.materialize()
+
+    with pytest.raises(pytest.fail.Exception) as excinfo:
+        evaluate_test_case_chunk(MetamorphicTestCaseChunk(mr, "identity"))
+    message = str(excinfo.value)
+    assert f"{number_of_test_cases} of {number_of_test_cases}" in message
+    assert f"mtc_{MAX_LISTED_FAILURES}:" in message
+    assert f"mtc_{MAX_LISTED_FAILURES + 1}:" not in message
+    assert message.endswith("... and 5 more")
+
+
+def test_evaluate_chunk_skips_if_all_test_cases_are_skipped():
+    mr = create_lazy_relation(lambda: range(2))
+    mr.materialize()
+    for mtc in mr.test_cases["identity"]:
+        mtc.error = InvalidInputError("invalid")
+
+    with pytest.raises(pytest.skip.Exception):
+        evaluate_test_case_chunk(MetamorphicTestCaseChunk(mr, "identity"))
+
+
+ERROR_MODULE = """
+import gemtest as gmt
+
+mr_1 = gmt.create_metamorphic_relation(name="mr_1", data=range(10))
+
+
+@gmt.transformation(mr_1)
+def add_one(source_input):
+    return source_input + 1
+
+
+@gmt.relation(mr_1)
+def is_greater(source_output, followup_output):
+    return source_output < followup_output
+
+
+@gmt.system_under_test(mr_1)
+def test_failing_sut(x):
+    # also the follow-up inputs of mtc_1 and mtc_3
+    if x in (2, 4):
+        raise ValueError("sut error")
+    return x
+"""
+
+
+def test_chunk_errors_are_reported_without_pytest_html(tmp_path):
+    test_file = tmp_path / "test_chunk_errors.py"
+    test_file.write_text(textwrap.dedent(ERROR_MODULE))
+    command = [sys.executable, "-m", "pytest", str(test_file), "-p", "no:cacheprovider",
+               "-p", "no:html", "--gmt-granularity", "chunk:5", "--gmt-on-error", "continue"]
+
+    result = subprocess.run(command, cwd=tmp_path, capture_output=True, text=True,
+                            check=False)
+
+    assert "1 error" in result.stdout
+    assert "SUTExecutionError: 4" in result.stdout
+    assert "(and 3 more errors)" in result.stdout
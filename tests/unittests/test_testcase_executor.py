@@ -0,0 +1,210 @@
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gemtest import conftest
+from gemtest.conftest import freeze_config, get_config_snapshot, get_conftest_config
+from gemtest.generators import RandInt
+from gemtest.metamorphic_relation import MetamorphicRelation
+from gemtest.metamorphic_test_case import MetamorphicTestCase
+from gemtest.metamorphic_test_suite import MetamorphicTestSuite
+from gemtest.testcase_executor import ThreadedTestCaseExecutor
+from gemtest.testcase_queue import InputQueue, InputQueueItem
+from gemtest.testing_strategy import TestingStrategy
+from gemtest.utils.rng import get_rng, seed_thread_rng
+from gemtest.utils.sut_loader import SUTPool
+
+THREADS = 16
+
+
+def hammer(function, count=THREADS):
+    """
+    Calls function(i) on count threads that are released at the same time.
+    """
+    barrier = threading.Barrier(count)
+
+    def run(i):
+        barrier.wait()
+        return function(i)
+
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        return list(executor.map(run, range(count)))
+
+
+def create_relation(number_of_test_cases, batch_size=None, columnar=False):
+    mr = MetamorphicRelation(mr_id="threaded_mr", data=list(range(number_of_test_cases)),
+                             testing_strategy=TestingStrategy.EXHAUSTIVE,
+                             number_of_test_cases=1, number_of_sources=1,
+                             columnar=columnar)
+    mr.generate_test_cases()
+    calls = []
+
+    def sut(inputs):
+        calls.append(threading.current_thread().name)
+        return inputs
+
+    mr.transform = lambda x: x + 1
+    mr.relation = lambda source_output, followup_output: source_output + 1 == followup_output
+    mr.system_under_test = sut
+    mr.sut_batch_size["sut"] = batch_size
+    mr.prepare_sut("sut")
+    return mr, calls
+
+
+@pytest.mark.parametrize("batch_size, columnar", [(None, False), (4, False), (4, True)])
+def test_executor_runs_every_test_case_once(batch_size, columnar):
+    mr, calls = create_relation(2000, batch_size, columnar)
+    test_cases = mr.test_cases["sut"]
+    executor = ThreadedTestCaseExecutor(THREADS)
+
+    executor.execute(mr, "sut", test_cases)
+    executor.close()
+
+    assert all(mtc.relation_result for mtc in test_cases)
+    assert all(mtc.error is None for mtc in test_cases)
+    assert len(mr.q_ready["sut"]) == 0
+    if batch_size is None:
+        assert len(calls) == 2 * len(test_cases)
+    else:
+        # batches are only filled within the part of a worker
+        full_batches = 2 * len(test_cases) // batch_size
+        assert full_batches <= len(calls) <= full_batches + 2 * THREADS
+    assert len(set(calls)) > 1
+    assert all(name.startswith("gemtest-execute") for name in calls)
+
+
+def test_executor_calls_each_pooled_sut_instance_on_one_thread_at_a_time():
+    mr, _ = create_relation(400)
+    instances = [{"calls": 0, "running": threading.Lock()} for _ in range(4)]
+    overlaps = []
+
+    def sut(inputs, dynamic_sut):
+        if not dynamic_sut["running"].acquire(blocking=False):
+            overlaps.append(inputs)
+            return inputs
+        dynamic_sut["calls"] += 1
+        dynamic_sut["running"].release()
+        return inputs
+
+    mr._system_under_test["sut"] = sut
+    mr.sut_pools["sut"] = SUTPool(instances)
+    ThreadedTestCaseExecutor(4).execute(mr, "sut", mr.test_cases["sut"])
+
+    assert all(mtc.relation_result for mtc in mr.test_cases["sut"])
+    assert not overlaps
+    assert sum(instance["calls"] for instance in instances) == 800
+
+
+def test_executor_only_takes_the_inputs_of_its_test_cases():
+    mr, _ = create_relation(100, batch_size=8)
+    test_cases = mr.test_cases["sut"]
+
+    ThreadedTestCaseExecutor(4).execute(mr, "sut", test_cases[:50])
+
+    assert all(mtc.relation_result for mtc in test_cases[:50])
+    assert not any(mtc.relation_result for mtc in test_cases[50:])
+    assert len(mr.q_ready["sut"]) == 50
+
+
+def test_executor_raises_errors_of_workers():
+    mr, _ = create_relation(40)
+
+    def failing_relation(source_output, followup_output):
+        raise ValueError("relation error")
+
+    mr._relation = failing_relation
+    with pytest.raises(SystemExit):
+        ThreadedTestCaseExecutor(4).execute(mr, "sut", mr.test_cases["sut"])
+
+
+def test_split_into_contiguous_parts():
+    executor = ThreadedTestCaseExecutor(4)
+    assert executor.split(list(range(10))) == [[0, 1], [2, 3, 4], [5, 6], [7, 8, 9]]
+    assert executor.split(list(range(2))) == [[0], [1]]
+    with pytest.raises(ValueError):
+        ThreadedTestCaseExecutor(0)
+
+
+def test_input_queue_from_many_threads():
+    test_cases = [MetamorphicTestCase() for _ in range(THREADS)]
+    queue = InputQueue()
+
+    def produce_and_consume(i):
+        for index in range(500):
+            queue.append(InputQueueItem(test_cases[i], index, is_source=True))
+        taken = []
+        while batch := queue.get_all_with_testcase(test_cases[i], True, max_items=7):
+            taken.extend(item.index for item in batch)
+        return taken
+
+    results = hammer(produce_and_consume)
+    assert all(taken == list(range(500)) for taken in results)
+    assert len(queue) == 0
+
+
+def test_suite_from_many_threads():
+    suite = MetamorphicTestSuite()
+
+    def add(i):
+        return suite.add_metamorphic_relation(
+            name=f"concurrent_mr_{i}", data=[1], testing_strategy=TestingStrategy.SAMPLE,
+            number_of_test_cases=1, number_of_sources=1, module="threads.test_module")
+
+    ids = hammer(add)
+    indices = sorted(suite.get_metamorphic_relation(mr_id).index for mr_id in ids)
+    assert indices == list(range(indices[0], indices[0] + THREADS))
+    assert suite.get_module_metamorphic_relation_ids("threads.test_module") == \
+        sorted(ids, key=lambda mr_id: suite.get_metamorphic_relation(mr_id).index)
+
+    def add_duplicate(_):
+        try:
+            add("duplicate")
+            return True
+        except ValueError:
+            return False
+
+    assert sum(hammer(add_duplicate)) == 1
+
+
+def test_each_thread_has_its_own_rng():
+    random.seed(0)
+    main_rng = get_rng()
+    assert main_rng is random
+
+    def draw(i):
+        seed_thread_rng(i)
+        generator = RandInt(0, 1000)
+        return get_rng(), [generator.generate() for _ in range(100)]
+
+    first = hammer(draw)
+    second = hammer(draw)
+    assert len({id(rng) for rng, _ in first}) == THREADS
+    assert [values for _, values in first] == [values for _, values in second]
+
+
+def test_config_snapshot_is_read_only(monkeypatch):
+    monkeypatch.setattr(conftest, "config_snapshot", conftest.config_snapshot)
+    snapshot = freeze_config({"threads": 4})
+    with pytest.raises(TypeError):
+        snapshot["threads"] = 2  # type: ignore
+
+
+def test_workers_read_the_config_snapshot_of_their_executor(monkeypatch):
+    monkeypatch.setattr(conftest, "config_snapshot", conftest.config_snapshot)
+    mr, _ = create_relation(40)
+    seen = []
+
+    def sut(inputs):
+        seen.append((get_conftest_config()["threads"], get_config_snapshot()["threads"]))
+        return inputs
+
+    mr._system_under_test["sut"] = sut
+    executor = ThreadedTestCaseExecutor(4, config=freeze_config({"threads": 4}))
+    monkeypatch.setitem(conftest.CONFIG, "threads", 1)
+    freeze_config({"threads": 2})
+    executor.execute(mr, "sut", mr.test_cases["sut"])
+    executor.close()
+
+    assert set(seen) == {(4, 4)}